@@ -1,7 +1,9 @@
 import importlib
 import json
+import time
 
-from utility import logger, log_func
+from integration_tool import integrations, slack_event_hub
+from utility import logger, log_func, job_manager, access_logger
 
 _ROUTES_CONFIG = None
 
@@ -29,6 +31,8 @@ def _load_routes_json():
 
 
 _module_cache = {}
+_startup_report = []
+
 
 def _import_module(module_path):
     """ Import module and cache it to avoid repeated imports. """
@@ -36,7 +40,17 @@ def _import_module(module_path):
         return _module_cache[module_path]
 
     try:
+        init_ms_before = integrations.total_init_ms()
+        started = time.perf_counter()
         module = importlib.import_module(module_path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # Integrations built while importing the module count as its init cost
+        init_ms = integrations.total_init_ms() - init_ms_before
+        _startup_report.append({
+            'module': module_path,
+            'import_ms': round(elapsed_ms - init_ms, 1),
+            'init_ms': round(init_ms, 1),
+        })
         _module_cache[module_path] = module
         # logger.info(f"Module {module_path} successfully imported.")
         return module
@@ -93,7 +107,51 @@ def register_blueprints(app):
                 logger.error(f"Blueprint {blueprint_name} not found in {module_path}.")
                 continue
 
+            # Opt-in async job mode, callers then choose per request (see JobManager.enable_async)
+            if route.get('async'):
+                job_manager.enable_async(blueprint)
+
+            # Per route access log sampling / body logging, e.g. {"sample_rate": 0.1, "log_body": false}
+            access_logger.configure_route(blueprint.name, route.get('access_log'))
+
+            # Slack listeners on the shared Socket Mode hub,
+            # e.g. {"type": "action", "id": "...", "handler": "...", "max_concurrency": 2}
+            _register_slack_listeners(module, module_path, route.get('slack_listeners', []))
+
             # Register blueprint
             app.register_blueprint(blueprint, url_prefix=url_prefix)
             registered_blueprints.add(blueprint_key)
-            # logger.info(f"Blueprint {blueprint_name} registered with prefix {url_prefix}.")
\ No newline at end of file
+            # logger.info(f"Blueprint {blueprint_name} registered with prefix {url_prefix}.")
+
+    _log_startup_report()
+
+
+def _register_slack_listeners(module, module_path, listeners):
+    for listener in listeners:
+        handler = getattr(module, listener.get('handler', ''), None)
+        if handler is None or not listener.get('type') or not listener.get('id'):
+            logger.error(f"Invalid Slack listener configuration in {module_path}: {listener}")
+            continue
+
+        try:
+            slack_event_hub.register(
+                kind=listener['type'],
+                key=listener['id'],
+                handler=handler,
+                name=f"{module_path}:{listener['handler']}",
+                max_concurrency=listener.get('max_concurrency')
+            )
+        except Exception as e:
+            logger.error(f"Failed to register Slack listener {listener} from {module_path}: {e}")
+
+
+def _log_startup_report():
+    """ Slowest feature modules first, with the integrations they had to initialize at import. """
+    rows = sorted(_startup_report, key=lambda row: row['import_ms'] + row['init_ms'], reverse=True)
+    total_ms = sum(row['import_ms'] + row['init_ms'] for row in rows)
+    lines = [f"{row['module']:<50} import {row['import_ms']:>8.1f}ms  init {row['init_ms']:>8.1f}ms" for row in rows]
+    pending = [name for name, stats in integrations.stats().items() if not stats['initialized']]
+    logger.info(
+        f"Startup report, {len(rows)} feature modules in {total_ms:.1f}ms\n" + "\n".join(lines) +
+        f"\nLazy integrations not initialized yet: {', '.join(pending) or 'none'}"
+    )
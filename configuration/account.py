@@ -6,18 +6,74 @@ class AtlassianConnectionConfig:
     ATLASSIAN_API_TOKEN = os.getenv('ATLASSIAN_API_TOKEN')
     ATLASSIAN_DOMAIN = "https://atlassian.net/"
 
+    # Keep-alive HTTP pool shared by every Jira / Confluence client
+    POOL_CONNECTIONS = int(os.getenv('ATLASSIAN_POOL_CONNECTIONS', '4'))
+    POOL_MAXSIZE = int(os.getenv('ATLASSIAN_POOL_MAXSIZE', '10'))
+    POOL_IDLE_TIMEOUT = float(os.getenv('ATLASSIAN_POOL_IDLE_TIMEOUT', '300'))  # seconds
+    POOL_TTL = float(os.getenv('ATLASSIAN_POOL_TTL', '3600'))  # seconds
+
+    # JQL paging, the enhanced search API pages with `nextPageToken` instead of `startAt`
+    JQL_PAGE_SIZE = int(os.getenv('ATLASSIAN_JQL_PAGE_SIZE', '100'))
+    JQL_ENHANCED_SEARCH = os.getenv('ATLASSIAN_JQL_ENHANCED_SEARCH', 'false').lower() == 'true'
+
+    # JQL result cache (stale entries are served while a background refresh runs)
+    JQL_CACHE_SIZE = int(os.getenv('ATLASSIAN_JQL_CACHE_SIZE', '128'))
+    JQL_CACHE_TTL = float(os.getenv('ATLASSIAN_JQL_CACHE_TTL', '60'))  # seconds
+    JQL_CACHE_STALE_TTL = float(os.getenv('ATLASSIAN_JQL_CACHE_STALE_TTL', '300'))  # seconds
+    JQL_CACHE_REFRESH_WORKERS = int(os.getenv('ATLASSIAN_JQL_CACHE_REFRESH_WORKERS', '2'))
+
 
 class SlackBotConfig:
     SLACK_BOT_TOKEN = os.getenv('SLACK_BOT_TOKEN')
     SLACK_SIGNING_SECRET = os.getenv('SLACK_SIGNING_SECRET')
     SLACK_APP_TOKEN = os.getenv('SLACK_APP_TOKEN')
 
+    # 'socket_mode': one websocket per deployment, or 'http': Events API requests to /api/slack/events,
+    # which any number of replicas behind the load balancer can serve
+    RECEIVER_MODE = os.getenv('SLACK_RECEIVER_MODE', 'socket_mode').lower()
+
+    # Under a pre-forking server Socket Mode is opened by one elected worker, see gunicorn.conf.py.
+    # The worker holding the lock file owns the connection; the others wait on it as standbys.
+    SOCKET_MODE_DEFERRED = os.getenv('SLACK_SOCKET_MODE_DEFERRED', 'false').lower() == 'true'
+    SOCKET_MODE_LOCK_PATH = os.getenv('SLACK_SOCKET_MODE_LOCK_PATH', 'data/slack_socket_mode.lock')
+
+    # Listener work runs off the Socket Mode thread on a bounded pool, see SlackEventHub
+    LISTENER_WORKERS = int(os.getenv('SLACK_LISTENER_WORKERS', '8'))
+    LISTENER_MAX_PENDING = int(os.getenv('SLACK_LISTENER_MAX_PENDING', '100'))
+    LISTENER_MAX_CONCURRENCY = int(os.getenv('SLACK_LISTENER_MAX_CONCURRENCY', '4'))  # per listener default
+    LISTENER_IDEMPOTENCY_TTL = float(os.getenv('SLACK_LISTENER_IDEMPOTENCY_TTL', '600'))  # seconds
+    LISTENER_IDEMPOTENCY_MAX_KEYS = int(os.getenv('SLACK_LISTENER_IDEMPOTENCY_MAX_KEYS', '10000'))
+    # SQLite file shared by every process on the host (the outbound queue file by default), so a
+    # retry landing on another gunicorn worker is still dropped. Empty keeps the keys in process
+    # memory. Replicas on other hosts don't share it: route Slack retries to one host in that case.
+    LISTENER_IDEMPOTENCY_PATH = os.getenv(
+        'SLACK_LISTENER_IDEMPOTENCY_PATH',
+        os.getenv('SLACK_OUTBOUND_QUEUE_PATH', 'data/slack_outbound_queue.sqlite3')
+    )
+
+    # Worker threads shared by multi-channel sends
+    FAN_OUT_WORKERS = int(os.getenv('SLACK_FAN_OUT_WORKERS', '8'))
+
+    # Durable outbound queue drained by background workers
+    OUTBOUND_QUEUE_PATH = os.getenv('SLACK_OUTBOUND_QUEUE_PATH', 'data/slack_outbound_queue.sqlite3')
+    OUTBOUND_QUEUE_WORKERS = int(os.getenv('SLACK_OUTBOUND_QUEUE_WORKERS', '2'))
+    OUTBOUND_QUEUE_MAX_ATTEMPTS = int(os.getenv('SLACK_OUTBOUND_QUEUE_MAX_ATTEMPTS', '8'))
+    OUTBOUND_QUEUE_BACKOFF_BASE = float(os.getenv('SLACK_OUTBOUND_QUEUE_BACKOFF_BASE', '2'))  # seconds
+    OUTBOUND_QUEUE_BACKOFF_MAX = float(os.getenv('SLACK_OUTBOUND_QUEUE_BACKOFF_MAX', '300'))  # seconds
+    OUTBOUND_QUEUE_LEASE_TIMEOUT = float(os.getenv('SLACK_OUTBOUND_QUEUE_LEASE_TIMEOUT', '120'))  # seconds
+
 
 class GoogleConnectionConfig:
     SERVICE_ACC = {
         "type": "service_account"
     }
 
+    # Sheet snapshots are reused until the file's Drive modifiedTime changes
+    SHEET_CACHE_SIZE = int(os.getenv('GOOGLE_SHEET_CACHE_SIZE', '64'))
+    SHEET_REVISION_CHECK_INTERVAL = float(os.getenv('GOOGLE_SHEET_REVISION_CHECK_INTERVAL', '10'))  # seconds
+    SHEET_PAGE_SIZE = int(os.getenv('GOOGLE_SHEET_PAGE_SIZE', '500'))
+    SHEET_MAX_PAGE_SIZE = int(os.getenv('GOOGLE_SHEET_MAX_PAGE_SIZE', '5000'))
+
 class DatabaseConfig:
     driver = "mysql"
     host = "HOST"
@@ -26,3 +82,22 @@ class DatabaseConfig:
     password = "PWD"
     database = "TABLE"
 
+    # Connection pool
+    pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+    pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+    pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '10'))  # checkout wait, seconds
+    pool_recycle = float(os.getenv('DB_POOL_RECYCLE', '3600'))  # max connection age, seconds
+    pool_ping_interval = float(os.getenv('DB_POOL_PING_INTERVAL', '30'))  # pre-ping after idle, seconds
+
+    # Rows per executemany() transaction in bulk_insert / bulk_upsert
+    bulk_batch_size = int(os.getenv('DB_BULK_BATCH_SIZE', '1000'))
+
+    # Query instrumentation, result bodies are only logged when enabled and are capped
+    slow_query_ms = float(os.getenv('DB_SLOW_QUERY_MS', '500'))
+    stats_max_fingerprints = int(os.getenv('DB_STATS_MAX_FINGERPRINTS', '500'))
+    log_result_body = os.getenv('DB_LOG_RESULT_BODY', 'false').lower() == 'true'
+    log_result_max_chars = int(os.getenv('DB_LOG_RESULT_MAX_CHARS', '2000'))
+
+    # In-memory team_member_detail directory
+    team_directory_ttl = float(os.getenv('TEAM_DIRECTORY_TTL', '300'))  # seconds
+
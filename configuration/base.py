@@ -12,3 +12,49 @@ class DevelopmentConfig(Config):
 
 class FlaskSecretKey:
     FLASK_SECRET_KEY = os.getenv('FLASK_SECRET_KEY')
+
+
+class JobConfig:
+    MAX_WORKERS = int(os.getenv('ASYNC_JOB_WORKERS', '4'))
+    MAX_PENDING = int(os.getenv('ASYNC_JOB_MAX_PENDING', '32'))
+    RESULT_TTL = float(os.getenv('ASYNC_JOB_RESULT_TTL', '600'))  # seconds
+    # Job state is shared through this SQLite file, so any gunicorn worker can answer /api/jobs/<id>
+    STORE_PATH = os.getenv('ASYNC_JOB_STORE_PATH', 'data/async_jobs.sqlite3')
+
+
+class LogConfig:
+    LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
+    # Level of the per-call "Func start / end" lines written by log_func / log_class
+    FUNC_LEVEL = os.getenv('LOG_FUNC_LEVEL', 'INFO').upper()
+    FORMAT = os.getenv('LOG_FORMAT', 'text').lower()  # text | json
+
+    # Hand records to a background listener thread instead of writing on the request thread
+    ASYNC = os.getenv('LOG_ASYNC', 'true').lower() == 'true'
+    QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+    # Sampled span tracing for log_func / log_class
+    TRACE_ENABLED = os.getenv('TRACE_ENABLED', 'true').lower() == 'true'
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0.1'))
+    TRACE_BUFFER_SIZE = int(os.getenv('TRACE_BUFFER_SIZE', '2000'))
+
+
+class AccessLogConfig:
+    ENABLED = os.getenv('ACCESS_LOG_ENABLED', 'true').lower() == 'true'
+    # Default share of requests that get an access log line, routes.json "access_log" overrides it per route
+    SAMPLE_RATE = float(os.getenv('ACCESS_LOG_SAMPLE_RATE', '1.0'))
+    LOG_BODY = os.getenv('ACCESS_LOG_BODY', 'false').lower() == 'true'
+    LOG_BODY_ON_ERROR = os.getenv('ACCESS_LOG_BODY_ON_ERROR', 'true').lower() == 'true'
+    BODY_MAX_CHARS = int(os.getenv('ACCESS_LOG_BODY_MAX_CHARS', '2000'))
+    HEADER_ALLOWLIST = [
+        header.strip() for header in
+        os.getenv('ACCESS_LOG_HEADERS', 'Content-Type,Content-Length,User-Agent,X-Correlation-ID,Prefer').split(',')
+        if header.strip()
+    ]
+    FORMAT_WORKERS = int(os.getenv('ACCESS_LOG_FORMAT_WORKERS', '1'))
+    MAX_PENDING = int(os.getenv('ACCESS_LOG_MAX_PENDING', '1000'))
+
+
+class HealthConfig:
+    PROBE_TIMEOUT = float(os.getenv('READINESS_PROBE_TIMEOUT', '3'))  # seconds, per probe
+    CACHE_TTL = float(os.getenv('READINESS_CACHE_TTL', '15'))  # seconds a readiness result is reused
+    PROBE_WORKERS = int(os.getenv('READINESS_PROBE_WORKERS', '4'))
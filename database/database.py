@@ -1,106 +1,281 @@
 import json
+import logging
 import textwrap
-from typing import Iterable, Optional
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import certifi
 import pymongo
 import pymysql
 import pytds
 
-from utility import logger, log_class
+from configuration.account import DatabaseConfig
+from utility import logger, log_class, record_upstream
+from .instrumentation import query_stats
+from .pool import ConnectionPool
+from .statement_cache import normalize_fields, render_statement
 
 
 @log_class
 class BaseDatabaseConnection:
+    # Driver errors after which a connection is dropped from the pool instead of reused
+    _disconnect_errors = ()
 
-    def __init__(self, user, pwd, host, port, database):
+    def __init__(self, user, pwd, host, port, database, pool_min_size: int = 1, pool_max_size: int = 10,
+                 pool_timeout: float = 10.0, pool_recycle: float = 3600.0, pool_ping_interval: float = 30.0):
         self.user = user
         self.pwd = pwd
         self.host = host
         self.port = int(port)
         self.database = database
-        self._cursor = self._connect_database()
+        self._pool = ConnectionPool(
+            connect=self._connect_database,
+            ping=self._ping_connection,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            checkout_timeout=pool_timeout,
+            recycle=pool_recycle,
+            ping_interval=pool_ping_interval,
+            disconnect_errors=self._disconnect_errors,
+            name=f"{type(self).__name__}://{host}:{port}/{database}"
+        )
 
     def _connect_database(self):
         raise NotImplementedError("Do not use 'BaseDatabaseConnection' object directly.")
 
+    def _ping_connection(self, connection):
+        raise NotImplementedError("Do not use 'BaseDatabaseConnection' object directly.")
+
+    def ping(self):
+        """ Check out a connection and round-trip to the server, raises when unreachable. """
+        with self._pool.connection() as connection:
+            self._ping_connection(connection)
+
     def execute_modify_sql(self, sql: str, args: dict = None):
+        started = time.perf_counter()
         try:
-            res = self._cursor.execute(sql, args)
-            self._debug_print(sql=sql, res=res, args=args)
-            self._connection.commit()
+            with self._pool.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(sql, args)
+                    res = cursor.rowcount
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+                finally:
+                    cursor.close()
+            wall_ms = self._record_query(sql=sql, operation='modify', started=started, rows=res)
+            self._debug_print(sql=sql, res=res, args=args, wall_ms=wall_ms)
             return res
         except Exception as e:
+            self._record_query(sql=sql, operation='modify', started=started, error=True)
             logger.error(f"Modify Error: {e}")
-            self._connection.rollback()
             return None
 
     def execute_select_sql(self, sql: str, args: dict = None, fetchall: bool = False):
+        started = time.perf_counter()
         try:
-            self._cursor.execute(sql, args)
-            if fetchall:
-                res = self._cursor.fetchall()
-            else:
-                res = self._cursor.fetchone()
-            self._debug_print(sql=sql, res=res, args=args)
-            self._connection.commit()
+            with self._pool.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(sql, args)
+                    if fetchall:
+                        res = cursor.fetchall()
+                    else:
+                        res = cursor.fetchone()
+                    connection.commit()
+                finally:
+                    cursor.close()
+            rows = len(res) if fetchall else int(res is not None)
+            wall_ms = self._record_query(sql=sql, operation='select', started=started, rows=rows)
+            self._debug_print(sql=sql, res=res, args=args, wall_ms=wall_ms)
             return res
         except Exception as e:
+            self._record_query(sql=sql, operation='select', started=started, error=True)
             logger.error(f"Query Error: {e}")
             return None
 
+    def _streaming_cursor(self, connection):
+        """ Unbuffered cursor that reads rows from the server as they are fetched. """
+        raise NotImplementedError("Do not use 'BaseDatabaseConnection' object directly.")
+
+    def iter_select(self, sql: str, args: dict = None, fetch_size: int = 500,
+                    batches: bool = False) -> Iterator[Any]:
+        """
+        Stream a SELECT in constant memory: yield rows one by one, or lists of up to fetch_size rows
+        when batches=True. The connection stays checked out until the generator is exhausted; if the
+        caller stops early it is closed rather than drained and the pool opens a new one.
+        """
+        started = time.perf_counter()
+        pooled = self._pool.checkout()
+        connection = pooled.raw
+        cursor = None
+        finished = False
+        row_count = 0
+        try:
+            cursor = self._streaming_cursor(connection)
+            cursor.execute(sql, args)
+
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                row_count += len(rows)
+                if batches:
+                    yield rows
+                else:
+                    yield from rows
+
+            connection.commit()
+            finished = True
+        except GeneratorExit:
+            logger.info("Streaming select closed early, discarding its connection")
+            raise
+        except Exception as e:
+            logger.error(f"Stream Query Error: {e}")
+            raise
+        finally:
+            if finished and cursor is not None:
+                cursor.close()
+            self._pool.checkin(pooled, discard=not finished)
+            wall_ms = self._record_query(sql=sql, operation='stream', started=started, rows=row_count)
+            self._debug_print(sql=sql, res=f"{row_count} rows streamed", args=args, wall_ms=wall_ms)
+
+    def execute_many_sql(self, sql: str, rows: List[dict], batch_size: int = 1000) -> List[Dict[str, Any]]:
+        """ executemany() in chunks of batch_size, one transaction per chunk, report rows affected per chunk. """
+        report = []
+        for chunk_index, start in enumerate(range(0, len(rows), batch_size)):
+            chunk = rows[start:start + batch_size]
+            started = time.perf_counter()
+            try:
+                with self._pool.connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        cursor.executemany(sql, chunk)
+                        affected = cursor.rowcount
+                        connection.commit()
+                    except Exception:
+                        connection.rollback()
+                        raise
+                    finally:
+                        cursor.close()
+                self._record_query(sql=sql, operation='bulk', started=started, rows=affected)
+                report.append({'chunk': chunk_index, 'rows': len(chunk), 'affected': affected, 'error': None})
+            except Exception as e:
+                self._record_query(sql=sql, operation='bulk', started=started, error=True)
+                logger.error(f"Bulk Modify Error (chunk {chunk_index}): {e}")
+                report.append({'chunk': chunk_index, 'rows': len(chunk), 'affected': 0, 'error': str(e)})
+
+        self._debug_print(sql=sql, res=report, args={'rows': len(rows), 'batch_size': batch_size})
+        return report
+
+    def pool_stats(self):
+        return self._pool.stats()
+
     def __del__(self):
-        if hasattr(self, '_connection') and self._connection:
-            self._connection.close()
+        if hasattr(self, '_pool') and self._pool:
+            self._pool.close()
+
+    def _record_query(self, sql: str, operation: str, started: float, rows: int = None,
+                      error: bool = False) -> float:
+        wall_ms = (time.perf_counter() - started) * 1000
+        query_stats.record(
+            sql=sql,
+            operation=operation,
+            wall_ms=wall_ms,
+            rows=rows,
+            pool_wait_ms=self._pool.last_wait_ms,
+            error=error
+        )
+        record_upstream('db', wall_ms)
+        return wall_ms
+
+    def _debug_print(self, sql: str, res: Any, args: dict = None, wall_ms: float = None):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
 
-    def _debug_print(self, sql: str, res: str, args: dict = None):
-        logger.info(textwrap.dedent(
+        # Result bodies can be whole tables, only log them when enabled and capped.
+        if DatabaseConfig.log_result_body:
+            formatted_result = json.dumps(res, default=str, ensure_ascii=False)
+            max_chars = DatabaseConfig.log_result_max_chars
+            if len(formatted_result) > max_chars:
+                formatted_result = f"{formatted_result[:max_chars]}... <truncated {len(formatted_result) - max_chars} chars>"
+        else:
+            formatted_result = "Result body logging disabled"
+
+        logger.debug(textwrap.dedent(
             """
             --------------------------------
             🐞 debug prints
             --------------------------------
             {formatted_sql}
             {formatted_args}
+            {formatted_elapsed}
             {formatted_result}
             --------------------------------
             """
         ).format(
             formatted_sql=" ".join(sql.split()),
             formatted_args=json.dumps(args, default=str, ensure_ascii=False) if args else "No arguments provided",
-            formatted_result=json.dumps(res, default=str, ensure_ascii=False)
+            formatted_elapsed=f"elapsed: {wall_ms:.3f}ms" if wall_ms is not None else "elapsed: NA",
+            formatted_result=formatted_result
         ))
 
 
 class MsSqlDatabase(BaseDatabaseConnection):
+    _disconnect_errors = (pytds.OperationalError, pytds.InterfaceError)
+
     def _connect_database(self):
         try:
-            self._connection = pytds.connect(dsn=self.host,
-                                             port=self.port,
-                                             user=self.user,
-                                             password=self.pwd,
-                                             database=self.database,
-                                             as_dict=True)
+            connection = pytds.connect(dsn=self.host,
+                                       port=self.port,
+                                       user=self.user,
+                                       password=self.pwd,
+                                       database=self.database,
+                                       as_dict=True)
             # print(f"Connect to MsSql Database: {self.host}")
-            return self._connection.cursor()
+            return connection
         except Exception as e:
             logger.error(f"MsSQL Connect Fail: {e}")
-            return None
+            raise
+
+    def _ping_connection(self, connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _streaming_cursor(self, connection):
+        # pytds reads result rows off the TDS stream on fetch, nothing is buffered up front.
+        return connection.cursor()
 
 
 class MySqlDatabase(BaseDatabaseConnection):
+    _disconnect_errors = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
     def _connect_database(self):
         try:
-            self._connection = pymysql.connect(host=self.host,
-                                               port=self.port,
-                                               user=self.user,
-                                               password=self.pwd,
-                                               database=self.database,
-                                               cursorclass=pymysql.cursors.DictCursor)
+            connection = pymysql.connect(host=self.host,
+                                         port=self.port,
+                                         user=self.user,
+                                         password=self.pwd,
+                                         database=self.database,
+                                         cursorclass=pymysql.cursors.DictCursor)
             # print(f"Connect to MySql Database: {self.host}")
-            return self._connection.cursor()
+            return connection
         except Exception as e:
             logger.error(f"MySQL Connect Fail: {e}")
-            return None
+            raise
+
+    def _ping_connection(self, connection):
+        connection.ping(reconnect=False)
+
+    def _streaming_cursor(self, connection):
+        return connection.cursor(pymysql.cursors.SSDictCursor)
 
 
 class PyMongodb:
@@ -138,23 +313,44 @@ class Database:
 
         self.config = config
         self.__connection = None
+        self.__connection_lock = threading.Lock()
 
     @property
     def _connection(self):
         if self.__connection is None:
-            user = self.config.user
-            pwd = self.config.password
-            host = self.config.host
-            port = self.config.port
-            database = self.config.database
-            db_class = {
-                'mssql': MsSqlDatabase,
-                'mysql': MySqlDatabase
-            }.get(self.config.driver.lower())
-
-            self.__connection = db_class(user, pwd, host, port, database)
+            with self.__connection_lock:
+                if self.__connection is None:
+                    user = self.config.user
+                    pwd = self.config.password
+                    host = self.config.host
+                    port = self.config.port
+                    database = self.config.database
+                    db_class = {
+                        'mssql': MsSqlDatabase,
+                        'mysql': MySqlDatabase
+                    }.get(self.config.driver.lower())
+
+                    self.__connection = db_class(
+                        user, pwd, host, port, database,
+                        pool_min_size=getattr(self.config, 'pool_min_size', 1),
+                        pool_max_size=getattr(self.config, 'pool_max_size', 10),
+                        pool_timeout=getattr(self.config, 'pool_timeout', 10.0),
+                        pool_recycle=getattr(self.config, 'pool_recycle', 3600.0),
+                        pool_ping_interval=getattr(self.config, 'pool_ping_interval', 30.0)
+                    )
         return self.__connection
 
+    def reset_after_fork(self):
+        """ New lock for a forked worker, the pool itself is reset by reset_pools_after_fork. """
+        self.__connection_lock = threading.Lock()
+
+    def pool_stats(self):
+        """ Pool wait time and utilization of the underlying connection pool. """
+        return self._connection.pool_stats()
+
+    def ping(self):
+        return self._connection.ping()
+
     def remove_dict_empty_value(self, dict_obj: dict):
         return {k: v for k, v in dict_obj.items() if v is not None and v != ""}
 
@@ -162,39 +358,15 @@ class Database:
             self, table: str, fields: Optional[Iterable[str]] = None,
             condition: Optional[Iterable[str]] = None,
             order_by: str = None, desc: bool = False):
-
-        if not fields or not list(fields):
-            fields_str = "*"
-        else:
-            fields_str = ', '.join(fields)
-
-        sql = f"SELECT {fields_str} FROM {table} "
-
-        if condition:
-            condition_str = ' AND '.join(f"{field} = %({field})s" for field in condition)
-            sql += f"WHERE {condition_str} "
-
-        if order_by:
-            order_type = "DESC" if desc else "ASC"
-            sql += f"ORDER BY {order_by} {order_type}"
-
-        return sql
+        return render_statement(
+            'select', table, normalize_fields(fields), tuple(condition or ()), order_by, bool(desc)
+        )
 
     def update(self, table: str, fields: Iterable[str], condition: Optional[Iterable[str]] = None):
-
-        fields_str = ', '.join(f"{field} = %({field})s" for field in fields)
-        sql = f"UPDATE {table} SET {fields_str} "
-
-        if condition:
-            condition_str = ' AND '.join(f"{field} = %({field})s" for field in condition)
-            sql += f"WHERE {condition_str} "
-
-        return sql
+        return render_statement('update', table, normalize_fields(fields), tuple(condition or ()))
 
     def delete(self, table: str, condition: Iterable[str]):
-        conditions = ' AND '.join(f"{field} = %({field})s" for field in condition)
-        sql = f"DELETE FROM {table} WHERE {conditions}"
-        return sql
+        return render_statement('delete', table, (), tuple(condition))
 
     def create(self, table: str, **fields) -> str:
         columns = ', '.join(fields.keys())
@@ -204,12 +376,69 @@ class Database:
         sql = f"INSERT INTO {table} ({columns}) VALUES ({values});"
         return sql
 
+    def bulk_insert(self, table: str, rows: List[dict], batch_size: int = None) -> List[Dict[str, Any]]:
+        """ Insert rows (dicts sharing the same keys) with bound parameters, batch_size rows per transaction. """
+        if not rows:
+            return []
+
+        columns = list(rows[0].keys())
+        columns_str = ', '.join(columns)
+        values_str = ', '.join(f"%({column})s" for column in columns)
+        sql = f"INSERT INTO {table} ({columns_str}) VALUES ({values_str})"
+        return self.execute_many_sql(sql, rows, batch_size)
+
+    def bulk_upsert(self, table: str, rows: List[dict], key_fields: Iterable[str],
+                    update_fields: Optional[Iterable[str]] = None, batch_size: int = None) -> List[Dict[str, Any]]:
+        """
+        Insert rows, updating update_fields (default: every non-key column) when key_fields already exist.
+        MySQL uses ON DUPLICATE KEY UPDATE (key_fields must be a unique key), MSSQL uses MERGE on key_fields.
+        """
+        key_fields = list(key_fields)
+        if not key_fields:
+            # MERGE would render an empty ON clause, and it hides a caller bug on MySQL too
+            raise ValueError("bulk_upsert requires at least one key field")
+
+        if not rows:
+            return []
+
+        columns = list(rows[0].keys())
+        if update_fields is None:
+            update_fields = [column for column in columns if column not in key_fields]
+        update_fields = list(update_fields)
+
+        columns_str = ', '.join(columns)
+        if self.config.driver.lower() == 'mssql':
+            source_str = ', '.join(f"%({column})s AS {column}" for column in columns)
+            on_str = ' AND '.join(f"target.{field} = source.{field}" for field in key_fields)
+            sql = f"MERGE INTO {table} AS target USING (SELECT {source_str}) AS source ON {on_str} "
+            if update_fields:
+                set_str = ', '.join(f"target.{field} = source.{field}" for field in update_fields)
+                sql += f"WHEN MATCHED THEN UPDATE SET {set_str} "
+            insert_str = ', '.join(f"source.{column}" for column in columns)
+            sql += f"WHEN NOT MATCHED THEN INSERT ({columns_str}) VALUES ({insert_str});"
+        else:
+            values_str = ', '.join(f"%({column})s" for column in columns)
+            # A no-op assignment keeps the statement valid when there is nothing to update.
+            set_str = ', '.join(f"{field} = VALUES({field})" for field in update_fields) or \
+                f"{key_fields[0]} = {key_fields[0]}"
+            sql = f"INSERT INTO {table} ({columns_str}) VALUES ({values_str}) ON DUPLICATE KEY UPDATE {set_str}"
+
+        return self.execute_many_sql(sql, rows, batch_size)
+
+    def execute_many_sql(self, sql: str, rows: List[dict], batch_size: int = None) -> List[Dict[str, Any]]:
+        batch_size = batch_size or getattr(self.config, 'bulk_batch_size', 1000)
+        return self._connection.execute_many_sql(sql, rows, batch_size)
+
     def execute_modify_sql(self, sql: str, args: dict = None):
         return self._connection.execute_modify_sql(sql, args)
 
     def execute_select_sql(self, sql: str, args: dict = None, fetchall: bool = False):
         return self._connection.execute_select_sql(sql, args, fetchall)
 
+    def iter_select(self, sql: str, args: dict = None, fetch_size: int = 500, batches: bool = False):
+        """ Lazily stream a large SELECT, see BaseDatabaseConnection.iter_select. """
+        return self._connection.iter_select(sql, args, fetch_size, batches)
+
 
 class MongoDB:
     def __init__(self, config):
@@ -0,0 +1,112 @@
+import bisect
+import itertools
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from configuration.account import DatabaseConfig
+from utility import logger
+
+# Upper bounds (ms) of the latency histogram buckets, the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def fingerprint(sql: str) -> str:
+    """ Normalize a statement so the same query shape shares one stats entry. """
+    normalized = " ".join(sql.split())
+    normalized = _STRING_LITERAL_RE.sub("?", normalized)
+    normalized = _NUMBER_LITERAL_RE.sub("?", normalized)
+    return _IN_LIST_RE.sub("(?+)", normalized)
+
+
+class QueryStats:
+    """
+    Per-fingerprint DB call statistics: call / error counts, wall time histogram, rows and pool wait.
+
+    Statements slower than `slow_query_ms` are also written to the slow-query log (WARNING).
+    At most `max_fingerprints` shapes are tracked, the rest are folded into '<other>'.
+    """
+
+    def __init__(self, slow_query_ms: float = DatabaseConfig.slow_query_ms,
+                 max_fingerprints: int = DatabaseConfig.stats_max_fingerprints):
+        self.slow_query_ms = slow_query_ms
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def _new_entry(self) -> Dict[str, Any]:
+        return {
+            'calls': 0, 'errors': 0, 'rows': 0,
+            'total_ms': 0.0, 'max_ms': 0.0, 'pool_wait_ms': 0.0,
+            'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        }
+
+    def record(self, sql: str, operation: str, wall_ms: float, rows: Optional[int] = None,
+               pool_wait_ms: float = 0.0, error: bool = False):
+        key = fingerprint(sql)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    key = '<other>'
+                    entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = self._new_entry()
+                    entry['operation'] = operation
+
+            entry['calls'] += 1
+            entry['errors'] += int(error)
+            entry['rows'] += rows or 0
+            entry['total_ms'] += wall_ms
+            entry['max_ms'] = max(entry['max_ms'], wall_ms)
+            entry['pool_wait_ms'] += pool_wait_ms
+            entry['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, wall_ms)] += 1
+
+        if self.slow_query_ms and wall_ms >= self.slow_query_ms:
+            logger.warning(
+                f"Slow query {wall_ms:.1f}ms (pool wait {pool_wait_ms:.1f}ms, rows {rows}): {key}"
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ Stats per fingerprint, most total time first. """
+        with self._lock:
+            entries = {key: dict(entry, buckets=list(entry['buckets'])) for key, entry in self._entries.items()}
+
+        statements = []
+        for key, entry in sorted(entries.items(), key=lambda item: item[1]['total_ms'], reverse=True):
+            calls = entry['calls']
+            cumulative = list(itertools.accumulate(entry['buckets']))
+            statements.append({
+                'fingerprint': key,
+                'operation': entry['operation'],
+                'calls': calls,
+                'errors': entry['errors'],
+                'rows': entry['rows'],
+                'total_ms': round(entry['total_ms'], 3),
+                'avg_ms': round(entry['total_ms'] / calls, 3) if calls else 0.0,
+                'max_ms': round(entry['max_ms'], 3),
+                'avg_pool_wait_ms': round(entry['pool_wait_ms'] / calls, 3) if calls else 0.0,
+                'histogram_ms': {  # Cumulative, like Prometheus `le` buckets
+                    **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, cumulative)},
+                    'le_inf': cumulative[-1],
+                },
+            })
+
+        return {'slow_query_ms': self.slow_query_ms, 'statements': statements}
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+    def reset_after_fork(self):
+        """ A forked worker starts with a fresh lock and reports only its own queries. """
+        self._lock = threading.Lock()
+        self._entries = {}
+
+
+query_stats = QueryStats()
@@ -0,0 +1,222 @@
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Tuple, Type
+
+from utility import logger
+
+
+_pools = weakref.WeakSet()
+
+
+def all_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """ Stats of every live pool, keyed by pool name. """
+    return {pool.name: pool.stats() for pool in list(_pools)}
+
+
+def reset_pools_after_fork():
+    """ Call in a forked child (e.g. gunicorn post_fork) before any pool is used. """
+    for pool in list(_pools):
+        pool.reset_after_fork()
+
+
+class PoolTimeoutError(Exception):
+    """ No connection became available within the checkout timeout. """
+
+
+class _PooledConnection:
+    __slots__ = ('raw', 'created_at', 'last_used_at')
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    Thread-safe DB-API connection pool.
+
+    - Keeps between `min_size` and `max_size` connections, callers wait up to
+      `checkout_timeout` seconds when all of them are in use.
+    - Connections idle for more than `ping_interval` seconds are pinged before being handed
+      out (pre-ping), connections older than `recycle` seconds are replaced.
+    - Connections that raised one of `disconnect_errors` are discarded instead of returned.
+    """
+
+    def __init__(self, connect: Callable[[], Any], ping: Callable[[Any], None], min_size: int = 1,
+                 max_size: int = 10, checkout_timeout: float = 10.0, recycle: float = 3600.0,
+                 ping_interval: float = 30.0, disconnect_errors: Tuple[Type[BaseException], ...] = (),
+                 name: str = "default"):
+        self.name = name
+        self._connect = connect
+        self._ping = ping
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.recycle = recycle
+        self.ping_interval = ping_interval
+        self.disconnect_errors = disconnect_errors
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle: Deque[_PooledConnection] = deque()
+        self._size = 0
+        self._stats = {
+            'checkouts': 0, 'timeouts': 0, 'connects': 0, 'discards': 0,
+            'wait_time_total_ms': 0.0, 'wait_time_max_ms': 0.0,
+        }
+
+        _pools.add(self)
+        self._fill_min_size()
+
+    def _fill_min_size(self):
+        for _ in range(self.min_size):
+            try:
+                pooled = self._open()
+            except Exception as e:
+                logger.error(f"Connection pool warm-up failed: {e}")
+                return
+            with self._cond:
+                self._size += 1
+                self._idle.append(pooled)
+
+    def _open(self) -> _PooledConnection:
+        raw = self._connect()
+        with self._cond:
+            self._stats['connects'] += 1
+        return _PooledConnection(raw)
+
+    @staticmethod
+    def _close(pooled: _PooledConnection):
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, pooled: _PooledConnection) -> bool:
+        now = time.monotonic()
+        if self.recycle and now - pooled.created_at > self.recycle:
+            return False
+        if self.ping_interval is not None and now - pooled.last_used_at > self.ping_interval:
+            try:
+                self._ping(pooled.raw)
+            except Exception as e:
+                logger.warning(f"Discarding stale pooled connection: {e}")
+                return False
+        return True
+
+    def checkout(self) -> _PooledConnection:
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+
+        while True:
+            pooled = None
+            open_new = False
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"No connection available within {self.checkout_timeout}s (max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    pooled = self._idle.pop()  # LIFO keeps the hottest connections in use
+                else:
+                    self._size += 1
+                    open_new = True
+
+            if open_new:
+                try:
+                    pooled = self._open()
+                except Exception:
+                    self._release_slot()
+                    raise
+            elif not self._is_usable(pooled):
+                self._close(pooled)
+                self._release_slot(discarded=True)
+                continue
+
+            waited_ms = (time.monotonic() - started) * 1000
+            self._local.wait_ms = waited_ms
+            with self._cond:
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_total_ms'] += waited_ms
+                self._stats['wait_time_max_ms'] = max(self._stats['wait_time_max_ms'], waited_ms)
+            return pooled
+
+    @property
+    def last_wait_ms(self) -> float:
+        """ Checkout wait of the calling thread's most recent checkout. """
+        return getattr(self._local, 'wait_ms', 0.0)
+
+    def checkin(self, pooled: _PooledConnection, discard: bool = False):
+        if discard:
+            self._close(pooled)
+            self._release_slot(discarded=True)
+            return
+
+        pooled.last_used_at = time.monotonic()
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def _release_slot(self, discarded: bool = False):
+        with self._cond:
+            self._size -= 1
+            if discarded:
+                self._stats['discards'] += 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """ Check a raw connection out for the duration of the block. """
+        pooled = self.checkout()
+        discard = False
+        try:
+            yield pooled.raw
+        except self.disconnect_errors:
+            discard = True
+            raise
+        finally:
+            self.checkin(pooled, discard=discard)
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for pooled in idle:
+            self._close(pooled)
+
+    def reset_after_fork(self):
+        """
+        Drop the connections inherited from the parent process without closing them.
+
+        A DB-API close() would send the server a quit on a socket the parent still uses; the
+        child opens its own connections on next checkout. The condition is replaced because a
+        parent thread may have held it at fork time.
+        """
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle = deque()
+        self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            in_use = self._size - len(self._idle)
+            checkouts = self._stats['checkouts']
+            return {
+                **self._stats,
+                'wait_time_avg_ms': round(self._stats['wait_time_total_ms'] / checkouts, 3) if checkouts else 0.0,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'utilization': round(in_use / self.max_size, 4) if self.max_size else 0.0,
+            }
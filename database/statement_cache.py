@@ -0,0 +1,90 @@
+"""
+Pre-rendered, parameterized SQL for the Database query builder.
+
+Statements are rendered once per (operation, table, field tuple, condition-key tuple,
+order_by, desc) and kept in a bounded LRU, so hot lookups skip the joins and f-strings.
+
+Micro-benchmark: python -m database.statement_cache
+"""
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '512'))
+
+
+def normalize_fields(fields: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """ Hashable field tuple; a plain string is one field expression (e.g. "*"). """
+    if not fields:
+        return ()
+    if isinstance(fields, str):
+        return (fields,)
+    return tuple(fields)
+
+
+def _build_select(table: str, fields: Tuple[str, ...], condition: Tuple[str, ...],
+                  order_by: Optional[str], desc: bool) -> str:
+    fields_str = ', '.join(fields) if fields else "*"
+    sql = f"SELECT {fields_str} FROM {table} "
+
+    if condition:
+        condition_str = ' AND '.join(f"{field} = %({field})s" for field in condition)
+        sql += f"WHERE {condition_str} "
+
+    if order_by:
+        order_type = "DESC" if desc else "ASC"
+        sql += f"ORDER BY {order_by} {order_type}"
+
+    return sql
+
+
+def _build_update(table: str, fields: Tuple[str, ...], condition: Tuple[str, ...]) -> str:
+    fields_str = ', '.join(f"{field} = %({field})s" for field in fields)
+    sql = f"UPDATE {table} SET {fields_str} "
+
+    if condition:
+        condition_str = ' AND '.join(f"{field} = %({field})s" for field in condition)
+        sql += f"WHERE {condition_str} "
+
+    return sql
+
+
+def _build_delete(table: str, condition: Tuple[str, ...]) -> str:
+    conditions = ' AND '.join(f"{field} = %({field})s" for field in condition)
+    return f"DELETE FROM {table} WHERE {conditions}"
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def render_statement(operation: str, table: str, fields: Tuple[str, ...], condition: Tuple[str, ...],
+                     order_by: Optional[str] = None, desc: bool = False) -> str:
+    """ Cached SQL for operation 'select' / 'update' / 'delete'. """
+    if operation == 'select':
+        return _build_select(table, fields, condition, order_by, desc)
+    if operation == 'update':
+        return _build_update(table, fields, condition)
+    if operation == 'delete':
+        return _build_delete(table, condition)
+    raise ValueError(f"Unsupported statement operation: {operation}")
+
+
+def statement_cache_info() -> Dict[str, Any]:
+    info = render_statement.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
+
+
+if __name__ == '__main__':
+    import timeit
+
+    condition = {'slack_user_id': 'U123', 'team': 'SDET'}
+    number = 200_000
+
+    def _uncached():
+        return _build_select("team_member_detail", ("*",), tuple(condition), "id", True)
+
+    def _cached():
+        return render_statement('select', "team_member_detail", normalize_fields("*"), tuple(condition), "id", True)
+
+    assert _uncached() == _cached()
+    for label, func in (('builder (before)', _uncached), ('statement cache (after)', _cached)):
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{label:<24} {seconds / number * 1e9:8.1f} ns/call")
@@ -1,6 +1,7 @@
 from configuration.account import DatabaseConfig
 from utility import logger, log_class
 from .database import Database
+from .team_directory import NOT_INDEXED, TeamDirectoryCache
 
 
 @log_class
@@ -9,10 +10,27 @@ class TeamDatabase(Database):
     def __init__(self):
         super().__init__(DatabaseConfig)
 
+        if not hasattr(self, 'team_directory'):
+            self.team_directory = TeamDirectoryCache(
+                loader=self._load_team_directory,
+                ttl=getattr(DatabaseConfig, 'team_directory_ttl', 300.0)
+            )
+
+    def _load_team_directory(self):
+        sql = self.select(table="team_member_detail", fields="*")
+        return self._connection.execute_select_sql(sql, fetchall=True)
+
+    def invalidate_team_directory(self):
+        self.team_directory.invalidate()
+
+    def reset_after_fork(self):
+        super().reset_after_fork()
+        self.team_directory.reset_after_fork()
+
     def get_team_member_detail(
             self, member_id: int = None, team: str = None, name: str = None, slack_user_id: str = None,
             slack_group_id: str = None, atlassian_id: str = None, gmail: str = None, jkopay_mail: str = None,
-            order_by: str = "id", desc: bool = True, fetchall: bool = False):
+            order_by: str = "id", desc: bool = True, fetchall: bool = False, use_cache: bool = True):
         condition = {
             'id': member_id,
             'team': team,
@@ -24,6 +42,15 @@ class TeamDatabase(Database):
             'jkopay_mail': jkopay_mail,
         }
         condition = self.remove_dict_empty_value(condition)
+
+        if use_cache:
+            try:
+                res = self.team_directory.lookup(condition, order_by=order_by, desc=desc, fetchall=fetchall)
+                if res is not NOT_INDEXED:
+                    return res
+            except Exception as e:
+                logger.error(f"Team directory lookup failed, falling back to SQL: {e}")
+
         sql = self.select(
             table="team_member_detail",
             fields="*",
@@ -32,4 +59,11 @@ class TeamDatabase(Database):
             desc=desc
         )
 
-        return self._connection.execute_select_sql(sql, condition, fetchall=fetchall)
\ No newline at end of file
+        return self._connection.execute_select_sql(sql, condition, fetchall=fetchall)
+
+
+def reset_team_database_after_fork():
+    """ TeamDatabase is a process-wide singleton, so a forked worker keeps the parent's instance. """
+    instance = TeamDatabase.__dict__.get('_instance')
+    if instance is not None:
+        instance.reset_after_fork()
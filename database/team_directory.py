@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utility import logger
+
+# Columns with a hash index, lookups on anything else fall back to SQL
+TEAM_DIRECTORY_INDEXED_FIELDS = (
+    'id', 'team', 'name', 'slack_user_id', 'slack_group_id', 'atlassian_id', 'gmail', 'jkopay_mail',
+)
+
+NOT_INDEXED = object()
+
+
+def _index_key(value: Any) -> Any:
+    """
+    Compare like the table's case-insensitive MySQL collation: casefolded, trailing spaces
+    ignored. Integers are keyed as text, so id=5 and id='5' match as they do in SQL.
+    """
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        return str(value).rstrip(' ').casefold()
+    return value
+
+
+class TeamDirectoryCache:
+    """
+    In-memory copy of the small, rarely changing `team_member_detail` table.
+
+    The table is bulk-loaded once and hash-indexed by TEAM_DIRECTORY_INDEXED_FIELDS, so a
+    Slack / Atlassian / mail lookup is a dict lookup instead of a DB round trip. It reloads
+    after `ttl` seconds or on invalidate(); if a reload fails the previous copy keeps serving.
+    """
+
+    def __init__(self, loader: Callable[[], Optional[List[Dict[str, Any]]]], ttl: float = 300.0,
+                 indexed_fields: Iterable[str] = TEAM_DIRECTORY_INDEXED_FIELDS):
+        self._loader = loader
+        self.ttl = ttl
+        self.indexed_fields = tuple(indexed_fields)
+
+        self._lock = threading.Lock()
+        self._rows: List[Dict[str, Any]] = []
+        self._indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at <= self.ttl
+
+    def _ensure_loaded(self):
+        if self._is_fresh():
+            return
+
+        with self._lock:
+            if self._is_fresh():
+                return
+
+            try:
+                rows = self._loader()
+                if rows is None:
+                    raise RuntimeError("team directory loader returned no result")
+            except Exception as e:
+                if self._loaded_at is None:
+                    raise
+                logger.error(f"Team directory reload failed, serving previous copy: {e}")
+                self._loaded_at = time.monotonic()  # Back off until the next TTL
+                return
+
+            indexes = {field: {} for field in self.indexed_fields}
+            for row in rows:
+                for field in self.indexed_fields:
+                    value = row.get(field)
+                    if value is not None:
+                        indexes[field].setdefault(_index_key(value), []).append(row)
+
+            self._rows, self._indexes = list(rows), indexes
+            self._loaded_at = time.monotonic()
+            logger.info(f"Team directory loaded: {len(rows)} members")
+
+    def reset_after_fork(self):
+        """ New lock for a forked worker, the loaded copy keeps serving. """
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """ Force a reload on the next lookup (e.g. after the table was modified). """
+        with self._lock:
+            if self._loaded_at is not None:
+                self._loaded_at = float('-inf')  # Expired, but still a fallback if the reload fails
+
+    def lookup(self, condition: Dict[str, Any], order_by: str = "id", desc: bool = True,
+               fetchall: bool = False):
+        """
+        Same semantics as the SQL lookup: AND of equality conditions, ordered, first row or all rows.
+        Returns NOT_INDEXED when a condition column has no index.
+        """
+        if any(field not in self.indexed_fields for field in condition):
+            return NOT_INDEXED
+
+        self._ensure_loaded()
+        indexes, rows = self._indexes, self._rows
+
+        if condition:
+            keys = {field: _index_key(value) for field, value in condition.items()}
+            # Start from the most selective index, then filter the rest in place.
+            candidates = min((indexes[field].get(key, []) for field, key in keys.items()), key=len)
+            matches = [
+                row for row in candidates
+                if all(_index_key(row.get(field)) == key for field, key in keys.items())
+            ]
+        else:
+            matches = rows
+
+        if order_by and len(matches) > 1:
+            matches = sorted(
+                matches,
+                key=lambda row: (row.get(order_by) is None, row.get(order_by)),
+                reverse=desc
+            )
+
+        if fetchall:
+            return [dict(row) for row in matches]
+        return dict(matches[0]) if matches else None
@@ -2,39 +2,80 @@ from json import JSONDecodeError
 
 from flask import Blueprint, request
 
-from integration_tool import AtlassianJira, SlackBot
-from utility import logger, response_spec
+from integration_tool import integrations
+from integration_tool.atlassian.jira import RESERVED_TICKET_KEYS
+from integration_tool.slack.message_builder import MessageBuilderMethod, SlackDigestBuilder
+from integration_tool.slack.bot import normalize_channels
+from integration_tool.slack.outbound_queue import SlackOutboundQueue
+from utility import is_true, logger, response_spec, stream_response_spec
+from utility.spec import STREAM_FORMATS
 from utility.constant import ResponseResult
 
 demo_qjts_route = Blueprint('demo_qjts_route', __name__)
-atlassian_jira = AtlassianJira()
-slack_bot = SlackBot()
+atlassian_jira = integrations.jira
+slack_bot = integrations.slack_bot
 
 
-def _extract_jira_data(jql: str):
-    return atlassian_jira.query_by_jql(jql=jql)
+def _extract_jira_data(jql: str, max_results: int = None, extra_fields: list = None, bypass_cache: bool = False):
+    return atlassian_jira.query_by_jql(
+        jql=jql,
+        max_results=max_results,
+        extra_fields=extra_fields,
+        bypass_cache=bypass_cache
+    )
 
 
-def _format_slack_ticket_message(ticket_result: dict) -> str:
+def _iter_jira_data(jql: str, max_results: int = None, extra_fields: list = None):
+    return atlassian_jira.iter_jql(jql=jql, max_results=max_results, extra_fields=extra_fields)
+
+
+def _format_slack_ticket_entry(ticket: dict) -> str:
+    assignee = f"<@{ticket.get('Assignee', '')}>" if ticket.get('Assignee') else ""
+    issue_validator = f"<@{ticket.get('IssueValidator', '')}>" if ticket.get('IssueValidator') else ""
+
+    return (
+        f"▶   *{ticket.get('Summary', '')}*\n"
+        f"    ○   {ticket.get('URL', '')}\n"
+        f"    ○   Assignee: {assignee}\n"
+        f"    ○   IssueValidator: {issue_validator}\n\n"
+        f"    ○   Status: `{ticket.get('Status', '')}`\n"
+        f"    ○   StoryPoint: {ticket.get('StoryPoint', '')}"
+    )
+
+
+def _format_slack_ticket_message(ticket_result: list) -> list:
+    """ Build the digest as a series of size-capped messages, replies go into the first one's thread. """
     if not ticket_result:
-        return "No tickets found."
-
-    ticket_entries = []
-    for ticket in ticket_result:
-        assignee = f"<@{ticket.get('Assignee', '')}>" if ticket.get('Assignee') else ""
-        issue_validator = f"<@{ticket.get('IssueValidator', '')}>" if ticket.get('IssueValidator') else ""
-
-        ticket_entry = (
-            f"▶   *{ticket.get('Summary', '')}*\n"
-            f"    ○   {ticket.get('URL', '')}\n"
-            f"    ○   Assignee: {assignee}\n"
-            f"    ○   IssueValidator: {issue_validator}\n\n"
-            f"    ○   Status: `{ticket.get('Status', '')}`\n"
-            f"    ○   StoryPoint: {ticket.get('StoryPoint', '')}"
-        )
-        ticket_entries.append(ticket_entry)
+        return [MessageBuilderMethod.customize("No tickets found.")]
 
-    return "\n\n".join(ticket_entries)
+    digest_builder = SlackDigestBuilder(title=f"*Jira tickets ({len(ticket_result)})*")
+    return digest_builder.build(_format_slack_ticket_entry(ticket) for ticket in ticket_result)
+
+
+def _send_slack_ticket_message(slack_channel, ticket_result: list, delivery_id: str = None):
+    """ Post the digest, or queue it for background delivery when a delivery_id is given. """
+    try:
+        ticket_slack_msgs = _format_slack_ticket_message(ticket_result=ticket_result)
+        if delivery_id:
+            slack_bot.enqueue_thread(
+                channels=slack_channel,
+                messages=ticket_slack_msgs,
+                delivery_id=delivery_id
+            )
+            logger.info(f"Queued for Slack Channel: {slack_channel} ({delivery_id})")
+            return
+
+        report = slack_bot.chat_post_thread(
+            channels=slack_channel,
+            messages=ticket_slack_msgs
+        )
+        if report['failed']:
+            logger.error(f"Sent to Slack Channel: {report['succeeded']}/{report['total']} succeeded, "
+                         f"{report['failed']} failed: {slack_channel}")
+        else:
+            logger.info(f"Sent to Slack Channel: {report['succeeded']}/{report['total']} succeeded: {slack_channel}")
+    except Exception as slack_error:
+        logger.error(f"Failed to send message to Slack: {slack_error}")
 
 
 @demo_qjts_route.route('/query_jira_to_slack', methods=['POST'])
@@ -50,7 +91,15 @@ def index():
         )
 
     jql = request_data.get('jql')
-    slack_channel = request_data.get('slack_channel')
+    slack_channel = normalize_channels(request_data.get('slack_channel'))
+    stream_format = request_data.get('stream')  # 'ndjson' / 'json', omit for a single response
+    max_results = request_data.get('max_results')
+    bypass_cache = request_data.get('bypass_cache', False)
+    # Only a JSON true or the string "true" bypasses, so "false" / "0" keep the cache
+    bypass_cache = is_true(bypass_cache)
+    extra_fields = request_data.get('extra_fields') or []  # Jira field paths, e.g. ["reporter.displayName"]
+    async_delivery = request_data.get('async_delivery', False)
+    async_delivery = is_true(async_delivery)
 
     if not jql:
         return response_spec(
@@ -59,26 +108,88 @@ def index():
             result_obj="JQL parameter is required"
         )
 
+    if not isinstance(extra_fields, list) or not all(isinstance(field, str) for field in extra_fields):
+        return response_spec(
+            result=ResponseResult.INVALID_PARAMETER.code,
+            message="Invalid extra_fields parameter",
+            result_obj="extra_fields must be a list of Jira field paths"
+        )
+
+    if RESERVED_TICKET_KEYS.intersection(extra_fields):
+        return response_spec(
+            result=ResponseResult.INVALID_PARAMETER.code,
+            message="Invalid extra_fields parameter",
+            result_obj=f"extra_fields must not reuse built-in ticket keys: {', '.join(sorted(RESERVED_TICKET_KEYS))}"
+        )
+
+    if stream_format and stream_format not in STREAM_FORMATS:
+        return response_spec(
+            result=ResponseResult.INVALID_PARAMETER.code,
+            message="Invalid stream parameter",
+            result_obj=f"stream must be one of {list(STREAM_FORMATS)}"
+        )
+
     try:
-        ticket_result = _extract_jira_data(jql=jql)
+        max_results = int(max_results) if max_results is not None else None
+    except (TypeError, ValueError):
+        return response_spec(
+            result=ResponseResult.INVALID_PARAMETER.code,
+            message="Invalid max_results parameter",
+            result_obj="max_results must be an integer"
+        )
+
+    # Queued deliveries are reported in the X-Slack-Delivery-ID header, see /api/slack/deliveries/<id>.
+    # A stream's headers go out before the digest is queued, so streams don't get a delivery ID.
+    delivery_id = None
+    if slack_channel and async_delivery and not stream_format:
+        delivery_id = SlackOutboundQueue.new_delivery_id()
+
+    try:
+        if stream_format:
+            # Streaming is meant for large result sets, so it always reads through to Jira.
+            def _stream_tickets():
+                tickets = []
+                for ticket in _iter_jira_data(jql=jql, max_results=max_results, extra_fields=extra_fields):
+                    if slack_channel:
+                        tickets.append(ticket)
+                    yield ticket
+
+                if slack_channel:
+                    _send_slack_ticket_message(
+                        slack_channel=slack_channel,
+                        ticket_result=tickets,
+                        delivery_id=SlackOutboundQueue.new_delivery_id() if async_delivery else None
+                    )
+
+            return stream_response_spec(
+                result=ResponseResult.SUCCESS.code,
+                message=ResponseResult.SUCCESS.message,
+                result_iter=_stream_tickets(),
+                stream_format=stream_format
+            )
+
+        ticket_result = _extract_jira_data(
+            jql=jql,
+            max_results=max_results,
+            extra_fields=extra_fields,
+            bypass_cache=bypass_cache
+        )
 
         if slack_channel:
-            try:
-                ticket_slack_msg = _format_slack_ticket_message(ticket_result=ticket_result)
-                slack_bot.chat_post_message(
-                    channels=slack_channel,
-                    message=ticket_slack_msg,
-                    message_builder_method="customize"
-                )
-                logger.info(f"Sent to Slack Channel: {slack_channel}")
-            except Exception as slack_error:
-                logger.error(f"Failed to send message to Slack: {slack_error}")
+            _send_slack_ticket_message(
+                slack_channel=slack_channel,
+                ticket_result=ticket_result,
+                delivery_id=delivery_id
+            )
 
-        return response_spec(
+        response, status = response_spec(
             result=ResponseResult.SUCCESS.code,
             message=ResponseResult.SUCCESS.message,
             result_obj=ticket_result
         )
+        if delivery_id:
+            response.headers['X-Slack-Delivery-ID'] = delivery_id
+        return response, status
     except JSONDecodeError as e:
         logger.error(f"JSONDecodeError: {e}")
         return response_spec(
@@ -1,31 +1,98 @@
+import re
 from json import JSONDecodeError
 
-from flask import Blueprint
+from flask import Blueprint, request
 
-from integration_tool import GoogleSheet
+from configuration.account import GoogleConnectionConfig
+from integration_tool import integrations
 from utility import logger
 from utility import response_spec
 from utility.constant import ResponseResult
 
 example_ggs_route = Blueprint('example_ggs_route', __name__)
 
-google_sheet = GoogleSheet()
+google_sheet = integrations.google_sheet
 
 GOOGLE_SHEET_URL = "https://docs.google.com/spreadsheets/d/xxxxx/edit?usp=sharing"
 
+# A cell or a cell:cell range; column-only ranges (A:B) would read the whole column grid
+_A1_RANGE = re.compile(r"^[A-Za-z]{1,3}[1-9][0-9]*(:[A-Za-z]{1,3}[1-9][0-9]*)?$")
+
+
+def _invalid_parameter(message: str, detail: str):
+    return response_spec(
+        result=ResponseResult.INVALID_PARAMETER.code,
+        message=message,
+        result_obj=detail
+    )
+
+
 @example_ggs_route.route('/get_google_sheet', methods=['GET'])
 def index():
+    """
+    Query params, all optional:
+        worksheet: worksheet title, default the first worksheet
+        range: A1 range, e.g. A1:D20
+        page / page_size: row window, page starts at 1
+        bypass_cache: true to skip the snapshot cache
+    Without range / page the whole worksheet values are returned as before.
+    """
+    worksheet_title = request.args.get('worksheet')
+    cell_range = request.args.get('range')
+    page = request.args.get('page', type=int)
+    page_size = request.args.get('page_size', default=GoogleConnectionConfig.SHEET_PAGE_SIZE, type=int)
+    bypass_cache = request.args.get('bypass_cache', '').lower() == 'true'
+
+    if cell_range and not _A1_RANGE.match(cell_range):
+        return _invalid_parameter(
+            "Invalid range parameter",
+            "range must be a cell or cell range in A1 notation, e.g. A1:D20"
+        )
+    if cell_range and page is not None:
+        return _invalid_parameter("Invalid page parameter", "page can't be combined with range")
+    if page is not None and page < 1:
+        return _invalid_parameter("Invalid page parameter", "page must be an integer starting at 1")
+    if not 1 <= page_size <= GoogleConnectionConfig.SHEET_MAX_PAGE_SIZE:
+        return _invalid_parameter(
+            "Invalid page_size parameter",
+            f"page_size must be between 1 and {GoogleConnectionConfig.SHEET_MAX_PAGE_SIZE}"
+        )
+
     try:
-        worksheets = google_sheet.open_by_url(google_sheet_url=GOOGLE_SHEET_URL)
+        row_offset = (page - 1) * page_size if page else 0
+        sheet = google_sheet.get_values(
+            google_sheet_url=GOOGLE_SHEET_URL,
+            worksheet_title=worksheet_title,
+            cell_range=cell_range,
+            row_offset=row_offset,
+            # One row past the page tells whether more data follows; trailing empty rows aren't returned
+            row_limit=page_size + 1 if page else None,
+            bypass_cache=bypass_cache
+        )
 
-        for worksheet in worksheets:
-            contents = worksheet.get_all_values()
+        if not cell_range and page is None:
+            result_obj = sheet['values']
+        else:
+            result_obj = {
+                'worksheet': sheet['worksheet'],
+                'revision': sheet['revision'],
+                'cached': sheet['cached'],
+                'values': sheet['values'][:page_size] if page is not None else sheet['values'],
+            }
+            if page is not None:
+                has_more = len(sheet['values']) > page_size
+                result_obj['pagination'] = {
+                    'page': page,
+                    'page_size': page_size,
+                    'has_more': has_more,
+                    'next_page': page + 1 if has_more else None,
+                }
 
-            return response_spec(
-                result=ResponseResult.SUCCESS.code,
-                message=ResponseResult.SUCCESS.message,
-                result_obj=contents
-            )
+        return response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj=result_obj
+        )
 
     except JSONDecodeError as e:
         logger.error(f"JSONDecodeError: {e}")
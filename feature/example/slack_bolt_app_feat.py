@@ -1,17 +1,14 @@
 from flask import Blueprint
 
-from integration_tool import SlackBoltApp, SlackBot
+from integration_tool import integrations
 from utility import logger, log_func
 
 example_sbqf_route = Blueprint('example_sbqf_route', __name__)
 
-slack_app = SlackBoltApp()
-slack_app.start()
-slack_bot = SlackBot()
+slack_bot = integrations.slack_bot
 
 
 @log_func
-@slack_app.command('/ags_health_check"')
 def handle_command(ack, command, say, client):
     try:
         logger.info(f"Received slash command: {command}")
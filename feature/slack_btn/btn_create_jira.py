@@ -3,17 +3,15 @@ from json import JSONDecodeError
 
 from flask import Blueprint, request
 
-from database.table_database import TeamDatabase
-from integration_tool import AtlassianJira, SlackBot, SlackBoltApp
-from utility import logger, log_func, response_spec
+from integration_tool import integrations
+from integration_tool.slack.bot import normalize_channels
+from utility import is_true, logger, log_func, response_spec
 from utility.constant import ResponseResult
 
 slack_btn_smsj_route = Blueprint('slack_btn_smsj_route', __name__)
-atlassian_jira = AtlassianJira()
-slack_bot = SlackBot()
-slack_app = SlackBoltApp()
-slack_app.start()
-team_db = TeamDatabase()
+atlassian_jira = integrations.jira
+slack_bot = integrations.slack_bot
+team_db = integrations.team_db
 
 
 def _current_date_time():
@@ -49,19 +47,49 @@ def index():
             result_obj=f"Error parsing request JSON: {e}"
         )
 
-    slack_channel = request_data.get('slack_channel', [])
+    slack_channel = normalize_channels(request_data.get('slack_channel', []))
+    async_delivery = request_data.get('async_delivery', False)
+    async_delivery = is_true(async_delivery)
+
+    if async_delivery and not slack_channel:
+        return response_spec(
+            result=ResponseResult.INVALID_PARAMETER.code,
+            message="Missing slack_channel parameter",
+            result_obj="slack_channel is required for async_delivery"
+        )
 
     try:
+        if async_delivery:
+            # Return right away, the delivery can be checked at /api/slack/deliveries/<delivery_id>
+            delivery_id = slack_bot.enqueue_message(
+                channels=slack_channel,
+                message=_format_slack_message(),
+                message_builder_method='single_button_block'
+            )
+            return response_spec(
+                result=ResponseResult.SUCCESS.code,
+                message=ResponseResult.SUCCESS.message,
+                result_obj={'delivery_id': delivery_id}
+            )
+
         response = slack_bot.chat_post_message(
             channels=slack_channel,
             message=_format_slack_message(),
             message_builder_method='single_button_block'
         )
 
+        if response['total'] and response['failed'] == response['total']:
+            logger.error(f"Sprint ticket message failed on every channel: {slack_channel}")
+            return response_spec(
+                result=ResponseResult.SLACK_API_ERROR.code,
+                message=ResponseResult.SLACK_API_ERROR.message,
+                result_obj=response
+            )
+
         return response_spec(
             result=ResponseResult.SUCCESS.code,
             message=ResponseResult.SUCCESS.message,
-            result_obj=str(response)
+            result_obj=response
         )
     except JSONDecodeError as e:
         logger.error(f"JSONDecodeError: {e}")
@@ -112,7 +140,6 @@ def _create_jira(slack_user_id: str):
         )
 
 
-@slack_app.action('sprint_ticket')
 def _handle_btn(ack, body, logger):
     try:
         ack()
@@ -0,0 +1,35 @@
+from flask import Blueprint, request
+
+from database.instrumentation import query_stats
+from database.pool import all_pool_stats
+from database.statement_cache import statement_cache_info
+from utility import logger, response_spec
+from utility.constant import ResponseResult
+
+system_dbs_route = Blueprint('system_dbs_route', __name__)
+
+
+@system_dbs_route.route('/db/stats', methods=['GET'])
+def index():
+    try:
+        stats = {
+            'queries': query_stats.snapshot(),
+            'pools': all_pool_stats(),
+            'statement_cache': statement_cache_info(),
+        }
+
+        if request.args.get('reset', '').lower() == 'true':
+            query_stats.reset()
+
+        return response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj=stats
+        )
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        return response_spec(
+            result=ResponseResult.UNEXPECTED_ERROR.code,
+            message=ResponseResult.UNEXPECTED_ERROR.message,
+            result_obj=f"Error: {e}"
+        )
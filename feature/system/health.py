@@ -0,0 +1,86 @@
+import time
+
+from flask import Blueprint
+
+from configuration.account import AtlassianConnectionConfig, GoogleConnectionConfig
+from integration_tool import AtlassianJira, integrations
+from utility import logger, response_spec
+from utility.constant import ResponseResult
+from utility.health import get_build_info, readiness_checker
+
+system_hc_route = Blueprint('system_hc_route', __name__)
+
+GOOGLE_PROBE_SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+
+_google_credentials = None
+
+
+def _probe_mysql():
+    integrations.team_db.ping()
+
+
+def _probe_slack():
+    integrations.slack_bot.client.auth_test()
+
+
+def _probe_jira():
+    AtlassianJira._connection(
+        username=AtlassianConnectionConfig.USER_NAME,
+        password=AtlassianConnectionConfig.ATLASSIAN_API_TOKEN
+    ).myself()
+
+
+def _probe_google():
+    """ Only exchanges the service account for a token, and only once the cached one has expired. """
+    global _google_credentials
+    from google.auth.transport.requests import Request
+    from google.oauth2 import service_account
+
+    if _google_credentials is None:
+        _google_credentials = service_account.Credentials.from_service_account_info(
+            GoogleConnectionConfig.SERVICE_ACC, scopes=GOOGLE_PROBE_SCOPES
+        )
+    if not _google_credentials.valid:
+        _google_credentials.refresh(Request())
+
+
+readiness_checker.register('mysql', _probe_mysql)
+readiness_checker.register('slack', _probe_slack)
+readiness_checker.register('jira', _probe_jira)
+readiness_checker.register('google', _probe_google)
+
+
+@system_hc_route.route('/healthz', methods=['GET'])
+def healthz():
+    """ Liveness: the process serves requests, no dependency is touched. """
+    build_info = get_build_info()
+    return response_spec(
+        result=ResponseResult.SUCCESS.code,
+        message=ResponseResult.SUCCESS.message,
+        result_obj={
+            'status': 'ok',
+            'git_commit_id': build_info['git_commit_id'],
+            'uptime_seconds': round(time.time() - build_info['started_at'], 1),
+        }
+    )
+
+
+@system_hc_route.route('/readyz', methods=['GET'])
+def readyz():
+    """ Readiness: cached concurrent dependency probes, 503 while a critical one fails. """
+    try:
+        readiness = readiness_checker.check()
+        body, _ = response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj=readiness
+        )
+        return body, 200 if readiness['ready'] else 503
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        body, _ = response_spec(
+            result=ResponseResult.UNEXPECTED_ERROR.code,
+            message=ResponseResult.UNEXPECTED_ERROR.message,
+            result_obj=f"Error: {e}"
+        )
+        return body, 503
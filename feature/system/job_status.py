@@ -0,0 +1,31 @@
+from flask import Blueprint
+
+from utility import logger, response_spec, job_manager
+from utility.constant import ResponseResult
+
+system_js_route = Blueprint('system_js_route', __name__)
+
+
+@system_js_route.route('/jobs/<job_id>', methods=['GET'])
+def index(job_id: str):
+    try:
+        job = job_manager.get(job_id=job_id)
+        if job is None:
+            return response_spec(
+                result=ResponseResult.INVALID_PARAMETER.code,
+                message="Unknown job_id",
+                result_obj=f"Job {job_id} not found or expired"
+            )
+
+        return response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj=job
+        )
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        return response_spec(
+            result=ResponseResult.UNEXPECTED_ERROR.code,
+            message=ResponseResult.UNEXPECTED_ERROR.message,
+            result_obj=f"Error: {e}"
+        )
@@ -0,0 +1,20 @@
+from flask import Blueprint, Response
+
+from integration_tool import atlassian_client_pool, jql_result_cache
+from utility import logger, metrics, render_stats
+
+system_mt_route = Blueprint('system_mt_route', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@system_mt_route.route('/metrics', methods=['GET'])
+def index():
+    try:
+        body = metrics.render()
+        body += render_stats('ags_atlassian_client_pool', atlassian_client_pool.stats(), 'Atlassian client pool')
+        body += render_stats('ags_jql_result_cache', jql_result_cache.stats(), 'JQL result cache')
+        return Response(body, content_type=PROMETHEUS_CONTENT_TYPE)
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        return Response(f"# Error: {e}\n", status=500, content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,33 @@
+from flask import Blueprint
+
+from integration_tool import integrations
+from utility import logger, response_spec
+from utility.constant import ResponseResult
+
+system_sd_route = Blueprint('system_sd_route', __name__)
+slack_bot = integrations.slack_bot
+
+
+@system_sd_route.route('/slack/deliveries/<delivery_id>', methods=['GET'])
+def index(delivery_id: str):
+    try:
+        delivery = slack_bot.get_delivery_status(delivery_id=delivery_id)
+        if delivery is None:
+            return response_spec(
+                result=ResponseResult.INVALID_PARAMETER.code,
+                message="Unknown delivery_id",
+                result_obj=f"Delivery {delivery_id} not found"
+            )
+
+        return response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj=delivery
+        )
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        return response_spec(
+            result=ResponseResult.SLACK_API_ERROR.code,
+            message=ResponseResult.SLACK_API_ERROR.message,
+            result_obj=f"Error: {e}"
+        )
@@ -0,0 +1,34 @@
+from flask import Blueprint, request
+
+from configuration.account import SlackBotConfig
+from integration_tool import integrations
+from utility import logger, response_spec
+from utility.constant import ResponseResult
+
+system_se_route = Blueprint('system_se_route', __name__)
+
+
+@system_se_route.route('/slack/events', methods=['POST'])
+def index():
+    """ Slack Events API / interactivity Request URL, used when SLACK_RECEIVER_MODE=http. """
+    if SlackBotConfig.RECEIVER_MODE != 'http':
+        body, _ = response_spec(
+            result=ResponseResult.UNEXPECTED_ERROR.code,
+            message=ResponseResult.UNEXPECTED_ERROR.message,
+            result_obj="Slack HTTP receiver is disabled, set SLACK_RECEIVER_MODE=http"
+        )
+        return body, 404
+
+    try:
+        handler = integrations.slack_bolt_app.http_request_handler()
+    except ValueError as e:
+        logger.error(f"Slack HTTP receiver unavailable: {e}")
+        body, _ = response_spec(
+            result=ResponseResult.UNEXPECTED_ERROR.code,
+            message=ResponseResult.UNEXPECTED_ERROR.message,
+            result_obj=f"Error: {e}"
+        )
+        return body, 503
+
+    # Bolt answers 401 itself when the X-Slack-Signature check fails
+    return handler.handle(request)
@@ -0,0 +1,24 @@
+from flask import Blueprint
+
+from integration_tool import slack_event_hub
+from utility import logger, response_spec
+from utility.constant import ResponseResult
+
+system_sh_route = Blueprint('system_sh_route', __name__)
+
+
+@system_sh_route.route('/slack/listeners', methods=['GET'])
+def index():
+    try:
+        return response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj=slack_event_hub.stats()
+        )
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        return response_spec(
+            result=ResponseResult.UNEXPECTED_ERROR.code,
+            message=ResponseResult.UNEXPECTED_ERROR.message,
+            result_obj=f"Error: {e}"
+        )
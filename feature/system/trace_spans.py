@@ -0,0 +1,32 @@
+from flask import Blueprint, request
+
+from utility import logger, response_spec
+from utility.constant import ResponseResult
+from utility.tracing import tracer
+
+system_ts_route = Blueprint('system_ts_route', __name__)
+
+
+@system_ts_route.route('/trace/spans', methods=['GET'])
+def index():
+    try:
+        limit = request.args.get('limit', default=200, type=int)
+        correlation_id = request.args.get('correlation_id')
+
+        return response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj={
+                'enabled': tracer.enabled,
+                'sample_rate': tracer.sample_rate,
+                'spans': tracer.recent_spans(limit=limit, correlation_id=correlation_id),
+                'log_pipeline': logger.pipeline_stats(),
+            }
+        )
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        return response_spec(
+            result=ResponseResult.UNEXPECTED_ERROR.code,
+            message=ResponseResult.UNEXPECTED_ERROR.message,
+            result_obj=f"Error: {e}"
+        )
@@ -0,0 +1,82 @@
+"""
+Production server settings: `gunicorn -c gunicorn.conf.py`.
+
+The app is preloaded in the master and forked into WORKERS processes with THREADS threads each.
+Slack Socket Mode is deferred while the app is imported and opened by one worker, elected
+through a lock file (post_worker_init); the master never opens it, and the other workers stand
+by to take over when the owner exits.
+
+In-process state (metrics, caches, traces) is per worker process; async job state is shared
+through a SQLite file. Each module-level client, pool, executor and lock listed in post_fork is
+replaced in the worker right after fork, so workers don't share it with the master or each other.
+State added later that holds threads or locks must be added there too.
+"""
+import os
+
+# Must be set before the app is imported, SlackBoltApp.start() reads it
+os.environ.setdefault('SLACK_SOCKET_MODE_DEFERRED', 'true')
+
+from configuration.base import Config  # noqa: E402
+
+wsgi_app = 'run:app'
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{Config.PORT}")
+
+worker_class = 'gthread'
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))  # seconds a worker may stay silent before restart
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))  # seconds to finish in-flight requests
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+
+# Requests are logged by the app access logger
+accesslog = None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """
+    Worker only, right after fork. Drop the master's copies of connections, executors and locks
+    (a master thread may have held a lock at fork time); the worker builds its own on first use.
+    """
+    from database.instrumentation import query_stats
+    from database.pool import reset_pools_after_fork
+    from database.table_database import reset_team_database_after_fork
+    from integration_tool import atlassian_client_pool, integrations, jql_result_cache, slack_event_hub
+    from integration_tool.google.sheet_cache import sheet_snapshot_cache
+    from integration_tool.slack.bot import reset_fan_out_executor_after_fork
+    from integration_tool.slack.outbound_queue import reset_outbound_queue_after_fork
+    from utility import access_logger, job_manager, metrics, readiness_checker
+    from utility.tracing import tracer
+
+    reset_pools_after_fork()
+    reset_team_database_after_fork()
+    query_stats.reset_after_fork()
+    atlassian_client_pool.reset_after_fork()
+    jql_result_cache.reset_after_fork()
+    integrations.reset_after_fork()
+    sheet_snapshot_cache.reset_after_fork()
+    slack_event_hub.reset_after_fork()
+    reset_fan_out_executor_after_fork()
+    reset_outbound_queue_after_fork()
+    access_logger.reset_after_fork()
+    job_manager.reset_after_fork()
+    metrics.reset_after_fork()
+    readiness_checker.reset_after_fork()
+    tracer.reset_after_fork()
+
+
+def post_worker_init(worker):
+    """ Worker only, once it is set up: take part in the Socket Mode election. """
+    from integration_tool.slack.bolt_app import elect_socket_mode_worker
+    elect_socket_mode_worker()
+
+
+def worker_exit(server, worker):
+    """ Close the Socket Mode connection if this worker owned it, releasing the lock for a standby. """
+    from integration_tool.slack.bolt_app import stop_socket_mode
+    stop_socket_mode()
@@ -1,5 +1,9 @@
+from .atlassian.client_pool import atlassian_client_pool
 from .atlassian.confluence import AtlassianConfluence
 from .atlassian.jira import AtlassianJira
+from .atlassian.jql_cache import jql_result_cache
 from .slack.bolt_app import  SlackBoltApp
 from .slack.bot import SlackBot
-from .google.google_sheet import GoogleSheet
\ No newline at end of file
+from .google.google_sheet import GoogleSheet
+from .registry import integrations
+from .slack.event_hub import slack_event_hub
\ No newline at end of file
@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import Any, Dict, Tuple, Type
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from configuration.account import AtlassianConnectionConfig
+from utility import logger, record_upstream
+
+
+class _PooledClient:
+    """ One Atlassian client with its keep-alive session and bookkeeping. """
+
+    def __init__(self, client: Any, password: str):
+        self.client = client
+        self.password = password
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+    def is_expired(self, now: float, idle_timeout: float, ttl: float) -> bool:
+        if idle_timeout and now - self.last_used_at > idle_timeout:
+            return True
+        if ttl and now - self.created_at > ttl:
+            return True
+        return False
+
+    def close(self):
+        session = getattr(self.client, '_session', None)
+        if session is not None:
+            session.close()
+
+
+class AtlassianClientPool:
+    """
+    Process-wide registry of long-lived Jira / Confluence clients.
+
+    Clients are keyed by (client class, domain, username) and share a
+    `requests.Session` with a keep-alive HTTP connection pool, so repeated calls
+    reuse the TCP / TLS connection instead of opening a new one each time.
+    """
+
+    def __init__(self, pool_connections: int = AtlassianConnectionConfig.POOL_CONNECTIONS,
+                 pool_maxsize: int = AtlassianConnectionConfig.POOL_MAXSIZE,
+                 idle_timeout: float = AtlassianConnectionConfig.POOL_IDLE_TIMEOUT,
+                 ttl: float = AtlassianConnectionConfig.POOL_TTL):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str, str], _PooledClient] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _build_session(self, upstream: str) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        def _record_elapsed(response, *args, **kwargs):
+            record_upstream(upstream, response.elapsed.total_seconds() * 1000)
+
+        session.hooks['response'].append(_record_elapsed)
+        return session
+
+    def get_client(self, client_cls: Type, url: str, username: str, password: str) -> Any:
+        """ Return a pooled client, building a new one on first use or after eviction. """
+        key = (client_cls.__name__, url, username)
+        now = time.monotonic()
+
+        with self._lock:
+            # Evicted sessions are only dropped, not closed: another thread may still be
+            # mid-request on them, the sockets are released once the client is collected.
+            self._evict_expired(now)
+
+            pooled = self._clients.get(key)
+            if pooled is not None and pooled.password != password:
+                # Credentials rotated, the cached session carries the old basic auth.
+                self._clients.pop(key)
+                self._stats['evictions'] += 1
+                pooled = None
+
+            if pooled is None:
+                self._stats['misses'] += 1
+                client = client_cls(
+                    url=url,
+                    username=username,
+                    password=password,
+                    cloud=True,
+                    session=self._build_session(upstream=client_cls.__name__.lower())
+                )
+                pooled = _PooledClient(client=client, password=password)
+                self._clients[key] = pooled
+                logger.info(f"Atlassian client pool miss: {client_cls.__name__} {username}@{url}")
+            else:
+                self._stats['hits'] += 1
+
+            pooled.last_used_at = now
+
+        return pooled.client
+
+    def _evict_expired(self, now: float):
+        """ Drop expired clients, caller must hold the lock. """
+        expired_keys = [
+            key for key, pooled in self._clients.items()
+            if pooled.is_expired(now, self.idle_timeout, self.ttl)
+        ]
+        for key in expired_keys:
+            self._clients.pop(key)
+        self._stats['evictions'] += len(expired_keys)
+
+    def clear(self):
+        """ Close every pooled session (e.g. on shutdown). """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for pooled in clients:
+            pooled.close()
+
+    def reset_after_fork(self):
+        """
+        Forget the clients inherited from the parent process, without touching their sockets.
+
+        Closing them here would tear down connections the parent still uses, and the inherited
+        lock may have been held by a parent thread at fork time.
+        """
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_ratio': round(self._stats['hits'] / total, 4) if total else 0.0,
+                'size': len(self._clients),
+                'pool_maxsize': self.pool_maxsize,
+            }
+
+
+atlassian_client_pool = AtlassianClientPool()
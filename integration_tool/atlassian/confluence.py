@@ -4,17 +4,19 @@ from atlassian import Confluence
 
 from configuration.account import AtlassianConnectionConfig
 from utility import logger
+from .client_pool import atlassian_client_pool
 
 
 class AtlassianConfluence:
     @staticmethod
     def _connection(username: str, password: str,
                     atlassian_domain: str = AtlassianConnectionConfig.ATLASSIAN_DOMAIN):
-        return Confluence(
+        """ Get a pooled keep-alive client instead of opening a new session per call. """
+        return atlassian_client_pool.get_client(
+            client_cls=Confluence,
             url=atlassian_domain,
             username=username,
-            password=password,
-            cloud=True
+            password=password
         )
 
     def create_page(
@@ -1,87 +1,206 @@
-from typing import Any, Dict, List
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from atlassian import Jira
 
 from configuration.account import AtlassianConnectionConfig
 from utility import logger, log_func
+from .client_pool import atlassian_client_pool
+from .jql_cache import jql_result_cache
 from datetime import datetime, timedelta
 
 
+def _user_email(user: Optional[Dict[str, Any]]) -> Optional[str]:
+    """ None when the user field is unset, "" when the user hides their email address. """
+    return user.get('emailAddress', '') if user else None
+
+
+def _user_account(user: Optional[Dict[str, Any]]) -> Optional[str]:
+    email = _user_email(user)
+    return email.split("@")[0] if email else email
+
+
+# Output key -> (Jira field path, optional transform). Drives both the `fields=` projection
+# sent to Jira and the ticket transform, so only what is read here is downloaded.
+JQL_FIELD_SPEC = {
+    'Summary': ('summary', None),
+    'Status': ('status.name', None),
+    'Priority': ('priority.name', None),
+    'StoryPoint': ('customfield_10039', None),
+    'Sprint': ('customfield_10020', None),
+    'Assignee': ('assignee', _user_account),
+    'AssigneeEmail': ('assignee', _user_email),
+    'IssueValidator': ('customfield_10088', _user_account),
+    'IssueValidatorEmail': ('customfield_10088', _user_email),
+}
+
+_JQL_FIELD_PATHS = {key: (path.split('.'), transform) for key, (path, transform) in JQL_FIELD_SPEC.items()}
+
+# Keys every ticket dict already carries; an extra field with one of these names would overwrite it.
+RESERVED_TICKET_KEYS = frozenset({'RespId', 'Key', 'URL', *JQL_FIELD_SPEC})
+
+
 class AtlassianJira:
     @staticmethod
     def _connection(username: str, password: str,
                     atlassian_domain: str = AtlassianConnectionConfig.ATLASSIAN_DOMAIN):
-        return Jira(
+        """ Get a pooled keep-alive client instead of opening a new session per call. """
+        return atlassian_client_pool.get_client(
+            client_cls=Jira,
             url=atlassian_domain,
             username=username,
-            password=password,
-            cloud=True
+            password=password
         )
 
     @log_func
-    def query_by_jql(self, jql: Any, username: str = None,
+    def query_by_jql(self, jql: Any, max_results: Optional[int] = None, extra_fields: Iterable[str] = None,
+                     bypass_cache: bool = False, username: str = None,
                      password: str = None) -> List[Dict[str, Any]]:
-        """ Get ticket from JQL search result with all related fields. """
+        """ Get ticket from JQL search result with the projected fields, walking every page (cached). """
+        username = username or AtlassianConnectionConfig.USER_NAME
+        extra_fields = tuple(extra_fields or ())
+        cache_key = jql_result_cache.make_key(
+            jql=jql,
+            fields=self.jql_fields(extra_fields),
+            username=username,
+            max_results=max_results,
+            extra_fields=extra_fields
+        )
+
+        ticket_list = jql_result_cache.get_or_load(
+            key=cache_key,
+            loader=lambda: list(self.iter_jql(
+                jql=jql,
+                max_results=max_results,
+                extra_fields=extra_fields,
+                username=username,
+                password=password
+            )),
+            bypass=bypass_cache
+        )
+        return list(ticket_list)
+
+    @staticmethod
+    def jql_fields(extra_fields: Iterable[str] = None) -> List[str]:
+        """ Top-level Jira fields needed by JQL_FIELD_SPEC plus any extra field paths. """
+        reserved = sorted(RESERVED_TICKET_KEYS.intersection(extra_fields or ()))
+        if reserved:
+            raise ValueError(f"extra_fields clash with built-in ticket keys: {', '.join(reserved)}")
+        paths = [path for path, _ in JQL_FIELD_SPEC.values()] + list(extra_fields or ())
+        return sorted({path.split('.')[0] for path in paths})
+
+    def iter_jql(self, jql: Any, max_results: Optional[int] = None, extra_fields: Iterable[str] = None,
+                 page_size: int = AtlassianConnectionConfig.JQL_PAGE_SIZE, username: str = None,
+                 password: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream tickets from a JQL search page by page.
+
+        The next page is fetched in the background while the current page is transformed,
+        and iteration stops once `max_results` tickets have been yielded. Only the fields in
+        JQL_FIELD_SPEC plus `extra_fields` (Jira field paths, e.g. 'reporter.displayName')
+        are requested from Jira.
+        """
+        extra_fields = tuple(extra_fields or ())
+        fields = self.jql_fields(extra_fields)
         jira_server = self._connection(
             username=username or AtlassianConnectionConfig.USER_NAME,
             password=password or AtlassianConnectionConfig.ATLASSIAN_API_TOKEN
         )
-
-        jql_result = jira_server.jql(jql)
         logger.info(f"JQL: {jql}")
-        # logger.debug(f"JQL Result: {jql_result}")
 
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jql-prefetch')
         try:
-            ticket_list = []
-            for resp_id, ticket in enumerate(jql_result.get('issues', []), 1):
-                ticket_dict = self._query_by_jql_resp(
-                    resp_id=resp_id,
-                    ticket=ticket
-                )
-                ticket_list.append(ticket_dict)
-
-            return ticket_list
+            resp_id = 0
+            # Run each fetch in the caller's context so the correlation id and the request's
+            # Server-Timing entries see the Jira calls made on the prefetch thread
+            future = executor.submit(
+                contextvars.copy_context().run,
+                self._fetch_jql_page, jira_server, jql, fields, 0, None, page_size
+            )
+
+            while future is not None:
+                jql_result = future.result()
+                issues = jql_result.get('issues', [])
+                next_start, next_page_token = self._next_jql_page(jql_result=jql_result, page_len=len(issues))
+
+                future = None
+                has_more = bool(issues) and (next_start is not None or next_page_token is not None)
+                if has_more and (max_results is None or resp_id + len(issues) < max_results):
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._fetch_jql_page, jira_server, jql, fields, next_start, next_page_token, page_size
+                    )
+
+                for ticket in issues:
+                    if max_results is not None and resp_id >= max_results:
+                        return
+                    resp_id += 1
+                    yield self._query_by_jql_resp(resp_id=resp_id, ticket=ticket, extra_fields=extra_fields)
         except Exception as e:
             logger.error(f"Failed {str(e)}")
             raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @staticmethod
+    def _fetch_jql_page(jira_server: Jira, jql: Any, fields: List[str], start: Optional[int],
+                        next_page_token: Optional[str], limit: int) -> Dict[str, Any]:
+        """ Fetch one page, via `nextPageToken` on the enhanced search API or `startAt` otherwise. """
+        if AtlassianConnectionConfig.JQL_ENHANCED_SEARCH:
+            params = {'jql': jql, 'maxResults': limit, 'fields': ",".join(fields)}
+            if next_page_token:
+                params['nextPageToken'] = next_page_token
+            return jira_server.get(jira_server.resource_url('search/jql'), params=params)
+
+        return jira_server.jql(jql, fields=fields, start=start, limit=limit)
+
+    @staticmethod
+    def _next_jql_page(jql_result: Dict[str, Any], page_len: int):
+        """ Return (next startAt, next pageToken) of a search response, both None on the last page. """
+        if 'nextPageToken' in jql_result or 'isLast' in jql_result:
+            next_page_token = jql_result.get('nextPageToken')
+            if jql_result.get('isLast') or not next_page_token:
+                return None, None
+            return None, next_page_token
+
+        next_start = jql_result.get('startAt', 0) + page_len
+        if next_start >= jql_result.get('total', 0):
+            return None, None
+        return next_start, None
+
+    @staticmethod
+    def _resolve_field_path(fields: Dict[str, Any], path: List[str]) -> Any:
+        """ Walk a dotted field path, mapping over list values (e.g. fixVersions.name). """
+        value = fields
+        for part in path:
+            if isinstance(value, list):
+                value = [item.get(part) if isinstance(item, dict) else None for item in value]
+            elif isinstance(value, dict):
+                value = value.get(part)
+            else:
+                return None
+        return value
+
+    @classmethod
     def _query_by_jql_resp(
-            ticket: Dict[str, Any], resp_id: int) -> Dict[str, Any]:
-        """ Extract and format data from a single Jira ticket. """
-        fields = ticket.get('fields', {})
+            cls, ticket: Dict[str, Any], resp_id: int, extra_fields: Iterable[str] = ()) -> Dict[str, Any]:
+        """ Extract and format data from a single Jira ticket according to JQL_FIELD_SPEC. """
+        fields = ticket.get('fields') or {}
         ticket_key = ticket.get('key', 'UNKNOWN')
 
         ticket_dict = {
             'RespId': resp_id,
             'Key': ticket_key,
             'URL': f"{AtlassianConnectionConfig.ATLASSIAN_DOMAIN}browse/{ticket_key}",
-            'Summary': fields.get('summary'),
-            'Status': fields.get('status', {}).get('name'),
-            'Priority': fields.get('priority', {}).get('name'),
-            'StoryPoint': fields.get('customfield_10039'),
-            'Sprint': fields.get('customfield_10020'),
-            'Assignee': None,
-            'AssigneeEmail': None,
-            'IssueValidator': None,
-            'IssueValidatorEmail': None,
         }
 
-        assignee = fields.get('assignee', {})
-        if assignee:
-            email = assignee.get('emailAddress', '')
-            ticket_dict.update({
-                'AssigneeEmail': email,
-                'Assignee': email.split("@")[0] if email else ""
-            })
-
-        validator = fields.get('customfield_10088', {})
-        if validator:
-            email = validator.get('emailAddress', '')
-            ticket_dict.update({
-                'IssueValidatorEmail': email,
-                'IssueValidator': email.split("@")[0] if email else ""
-            })
+        for key, (path, transform) in _JQL_FIELD_PATHS.items():
+            value = cls._resolve_field_path(fields, path)
+            ticket_dict[key] = transform(value) if transform else value
+
+        for extra_field in extra_fields:
+            ticket_dict[extra_field] = cls._resolve_field_path(fields, extra_field.split('.'))
 
         return ticket_dict
 
@@ -0,0 +1,169 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from configuration.account import AtlassianConnectionConfig
+from utility import logger
+
+
+_MISSING = object()
+
+
+class _CacheEntry:
+    __slots__ = ('value', 'stored_at')
+
+    def __init__(self, value: Any, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class JqlResultCache:
+    """
+    Bounded LRU cache for JQL results with per-entry TTL and stale-while-revalidate.
+
+    - age <= ttl: served from cache.
+    - ttl < age <= ttl + stale_ttl: served stale while one background refresh reloads it.
+    - older than that (or missing): loaded synchronously, by one caller per key while the
+      others wait for its result.
+
+    Callers always get their own copy, so mutating a returned ticket never leaks into the cache.
+    """
+
+    def __init__(self, max_size: int = AtlassianConnectionConfig.JQL_CACHE_SIZE,
+                 ttl: float = AtlassianConnectionConfig.JQL_CACHE_TTL,
+                 stale_ttl: float = AtlassianConnectionConfig.JQL_CACHE_STALE_TTL,
+                 refresh_workers: int = AtlassianConnectionConfig.JQL_CACHE_REFRESH_WORKERS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_workers = refresh_workers
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, _CacheEntry]' = OrderedDict()
+        self._refreshing = set()
+        self._loading: Dict[Hashable, threading.Event] = {}
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='jql-cache-refresh')
+        self._stats = {
+            'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0, 'bypasses': 0,
+            'refreshes': 0, 'refresh_errors': 0, 'evictions': 0,
+        }
+
+    @staticmethod
+    def make_key(jql: str, fields: Optional[Iterable[str]] = None, **params) -> Tuple:
+        """ Key on whitespace-normalized JQL, the requested field set and any extra query params. """
+        normalized_jql = " ".join(str(jql).split())
+        normalized_fields = tuple(sorted(set(fields))) if fields else ()
+        return normalized_jql, normalized_fields, tuple(sorted(params.items()))
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], bypass: bool = False) -> Any:
+        """ Return the cached value for key, calling loader on miss / bypass. """
+        if bypass:
+            self._count('bypasses')
+            return self._load(key, loader)
+
+        while True:
+            cached, in_flight, is_leader = self._lookup(key, loader)
+            if cached is not _MISSING:
+                return self._copy(cached)
+            if is_leader:
+                break
+            # Another caller is loading this key; re-check once it is done (or load it if that failed).
+            in_flight.wait()
+
+        try:
+            return self._load(key, loader)
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            in_flight.set()
+
+    def _lookup(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, Optional[threading.Event], bool]:
+        """ (cached value or _MISSING, the key's in-flight load, whether this caller must run it) """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.stored_at
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry.value, None, False
+
+                if age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._stats['stale_hits'] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._executor.submit(self._refresh, key, loader)
+                    return entry.value, None, False
+
+            in_flight = self._loading.get(key)
+            if in_flight is not None:
+                self._stats['coalesced'] += 1
+                return _MISSING, in_flight, False
+
+            self._stats['misses'] += 1
+            in_flight = self._loading[key] = threading.Event()
+            return _MISSING, in_flight, True
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        # Cached tickets are shared between requests; hand out copies the caller may mutate.
+        return copy.deepcopy(value)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = loader()
+        self._store(key, self._copy(value))
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]):
+        try:
+            self._load(key, loader)
+            self._count('refreshes')
+        except Exception as e:
+            # Keep serving the stale entry, the next stale hit will retry.
+            self._count('refresh_errors')
+            logger.error(f"JQL cache refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = _CacheEntry(value=value, stored_at=time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def reset_after_fork(self):
+        """
+        Give a forked worker its own lock and refresh pool; the parent's refresh threads don't
+        exist in the child and its lock may have been held at fork time. Entries are kept.
+        """
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._loading = {}
+        self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers, thread_name_prefix='jql-cache-refresh')
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """ Drop one entry, or everything when key is None. """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, 'size': len(self._entries), 'max_size': self.max_size}
+
+
+jql_result_cache = JqlResultCache()
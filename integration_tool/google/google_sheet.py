@@ -1,9 +1,22 @@
 import json
+import re
+from typing import Any, Dict, Optional
 
 import pygsheets
 
 from configuration.account import GoogleConnectionConfig
-from utility import log_class
+from utility import log_class, upstream_timer
+from .sheet_cache import sheet_snapshot_cache
+
+_SPREADSHEET_ID_PATTERNS = (re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)"), re.compile(r'key=([^&#]+)'))
+
+
+def spreadsheet_id_from_url(google_sheet_url: str) -> str:
+    for pattern in _SPREADSHEET_ID_PATTERNS:
+        match = pattern.search(google_sheet_url)
+        if match:
+            return match.group(1)
+    raise ValueError(f"No spreadsheet ID found in URL: {google_sheet_url}")
 
 
 @log_class
@@ -16,9 +29,64 @@ class GoogleSheet:
 
     def _establish_connection(self, service_account_json: dict):
         service_account_json = json.dumps(service_account_json)
-        return pygsheets.authorize(service_account_json=service_account_json)
+        with upstream_timer('google'):
+            return pygsheets.authorize(service_account_json=service_account_json)
 
     def open_by_url(self, google_sheet_url: str):
-        sheet = self.connection.open_by_url(google_sheet_url)
-        worksheets = sheet.worksheets()
+        with upstream_timer('google'):
+            sheet = self.connection.open_by_url(google_sheet_url)
+            worksheets = sheet.worksheets()
         return worksheets
+
+    def get_revision(self, spreadsheet_id: str) -> str:
+        """ Drive modifiedTime of the spreadsheet, a metadata only request. """
+        with upstream_timer('google'):
+            return self.connection.drive.get_update_time(spreadsheet_id)
+
+    def get_values(self, google_sheet_url: str, worksheet_title: Optional[str] = None, cell_range: Optional[str] = None,
+                   row_offset: int = 0, row_limit: Optional[int] = None, bypass_cache: bool = False) -> Dict[str, Any]:
+        """
+        Read one worksheet (the first one by default): the whole sheet, an A1 range such as
+        'A1:D20', or a window of `row_limit` rows starting after `row_offset` rows.
+
+        Each distinct read is cached as a snapshot and re-fetched only after the spreadsheet's
+        revision changed.
+        """
+        spreadsheet_id = spreadsheet_id_from_url(google_sheet_url)
+        revision = sheet_snapshot_cache.revision(
+            spreadsheet_id=spreadsheet_id,
+            fetch_revision=lambda: self.get_revision(spreadsheet_id),
+            bypass=bypass_cache
+        )
+        key = (spreadsheet_id, worksheet_title, cell_range, row_offset if row_limit else None, row_limit)
+
+        snapshot, cached = sheet_snapshot_cache.get(
+            key=key,
+            revision=revision,
+            loader=lambda: self._read_worksheet(spreadsheet_id, worksheet_title, cell_range, row_offset, row_limit),
+            bypass=bypass_cache
+        )
+        return {**snapshot, 'revision': revision, 'cached': cached}
+
+    def _read_worksheet(self, spreadsheet_id: str, worksheet_title: Optional[str], cell_range: Optional[str],
+                        row_offset: int, row_limit: Optional[int]) -> Dict[str, Any]:
+        with upstream_timer('google'):
+            spreadsheet = self.connection.open_by_key(spreadsheet_id)
+            if worksheet_title:
+                worksheet = spreadsheet.worksheet_by_title(worksheet_title)
+            else:
+                worksheet = spreadsheet.sheet1
+
+            if cell_range:
+                start, _, end = cell_range.partition(':')
+                values = worksheet.get_values(start, end or start)
+            elif row_limit:
+                first_row = row_offset + 1
+                last_row = min(row_offset + row_limit, worksheet.rows)
+                values = worksheet.get_values((first_row, 1), (last_row, worksheet.cols),
+                                              include_tailing_empty_rows=False) \
+                    if first_row <= last_row else []
+            else:
+                values = worksheet.get_all_values()
+
+        return {'worksheet': worksheet.title, 'grid_rows': worksheet.rows, 'values': values}
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from configuration.account import GoogleConnectionConfig
+
+# Loads of different keys may share a lock stripe, the lock count stays fixed however many keys pass
+_LOAD_LOCK_STRIPES = 64
+
+
+class SheetSnapshotCache:
+    """
+    Snapshots of sheet reads, valid for as long as the spreadsheet revision is unchanged.
+
+    The revision (Drive modifiedTime) is asked for at most once per `check_interval` per
+    spreadsheet, every read in between is served from memory. Snapshots are LRU bounded and a
+    missing snapshot is loaded by one caller while concurrent callers for the same key (and lock
+    stripe) wait.
+    """
+
+    def __init__(self, max_entries: int = GoogleConnectionConfig.SHEET_CACHE_SIZE,
+                 check_interval: float = GoogleConnectionConfig.SHEET_REVISION_CHECK_INTERVAL):
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._revisions: Dict[str, Tuple[str, float]] = {}  # spreadsheet_id -> (revision, checked_at)
+        self._snapshots: 'OrderedDict[Hashable, Tuple[str, Any]]' = OrderedDict()  # key -> (revision, value)
+        self._load_locks = [threading.Lock() for _ in range(_LOAD_LOCK_STRIPES)]
+        self._stats = {'hits': 0, 'misses': 0, 'revision_checks': 0}
+
+    def revision(self, spreadsheet_id: str, fetch_revision: Callable[[], str], bypass: bool = False) -> str:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._revisions.get(spreadsheet_id)
+            if cached is not None and not bypass and now - cached[1] < self.check_interval:
+                return cached[0]
+
+        revision = fetch_revision()
+        with self._lock:
+            self._stats['revision_checks'] += 1
+            self._revisions[spreadsheet_id] = (revision, time.monotonic())
+        return revision
+
+    def get(self, key: Hashable, revision: str, loader: Callable[[], Any], bypass: bool = False) -> Tuple[Any, bool]:
+        """ Return (value, from_cache) for `key` at `revision`, loading it when stale or missing. """
+        if not bypass:
+            hit = self._lookup(key, revision)
+            if hit is not None:
+                return hit[1], True
+
+        with self._load_locks[hash(key) % len(self._load_locks)]:
+            if not bypass:
+                # Another caller may have loaded it while this one waited
+                hit = self._lookup(key, revision)
+                if hit is not None:
+                    return hit[1], True
+
+            value = loader()
+            with self._lock:
+                self._stats['misses'] += 1
+                self._snapshots[key] = (revision, value)
+                self._snapshots.move_to_end(key)
+                while len(self._snapshots) > self.max_entries:
+                    self._snapshots.popitem(last=False)
+            return value, False
+
+    def _lookup(self, key: Hashable, revision: str):
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or snapshot[0] != revision:
+                return None
+            self._snapshots.move_to_end(key)
+            self._stats['hits'] += 1
+            return snapshot
+
+    def invalidate(self, spreadsheet_id: str = None):
+        """ Drop every snapshot, or only those of one spreadsheet (keys start with its ID). """
+        with self._lock:
+            if spreadsheet_id is None:
+                self._snapshots.clear()
+                self._revisions.clear()
+                return
+            self._revisions.pop(spreadsheet_id, None)
+            for key in [key for key in self._snapshots if key[0] == spreadsheet_id]:
+                self._snapshots.pop(key)
+
+    def reset_after_fork(self):
+        """ New locks for a forked worker, a parent thread may have held one at fork time. """
+        self._lock = threading.Lock()
+        self._load_locks = [threading.Lock() for _ in range(_LOAD_LOCK_STRIPES)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._snapshots), 'max_entries': self.max_entries}
+
+
+sheet_snapshot_cache = SheetSnapshotCache()
@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from utility import logger
+
+
+class LazyIntegration:
+    """
+    Stands in for an integration client and builds it on first attribute access.
+
+    Feature modules keep module-level names (`slack_bot = integrations.slack_bot`) without
+    doing any work at import time; the factory runs once, thread-safe, when first used.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], reset_on_fork: bool = True):
+        self._name = name
+        self._factory = factory
+        self.reset_on_fork = reset_on_fork
+        self._instance = None
+        self._lock = threading.Lock()
+        self.init_ms = None
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    self.init_ms = round((time.perf_counter() - started) * 1000, 1)
+                    logger.info(f"Integration '{self._name}' initialized in {self.init_ms}ms")
+                    self._instance = instance
+        return self._instance
+
+    def reset(self):
+        """ Forget the built client (e.g. in a forked worker), the next access builds a new one. """
+        self._lock = threading.Lock()
+        self._instance = None
+        self.init_ms = None
+
+    def __getattr__(self, item: str) -> Any:
+        # Only reached for attributes the proxy itself doesn't have
+        return getattr(self.get(), item)
+
+    def __repr__(self) -> str:
+        state = 'initialized' if self.initialized else 'not initialized'
+        return f"<LazyIntegration {self._name} ({state})>"
+
+
+class IntegrationRegistry:
+    """ Named lazy integration clients shared by every feature module. """
+
+    def __init__(self):
+        self._integrations: Dict[str, LazyIntegration] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], reset_on_fork: bool = True) -> LazyIntegration:
+        self._integrations[name] = LazyIntegration(name=name, factory=factory, reset_on_fork=reset_on_fork)
+        return self._integrations[name]
+
+    def reset_after_fork(self):
+        """ Rebuild clients (and their HTTP / DB connections) in a forked worker instead of sharing them. """
+        for integration in self._integrations.values():
+            if integration.reset_on_fork:
+                integration.reset()
+
+    def __getattr__(self, name: str) -> LazyIntegration:
+        try:
+            return self.__dict__['_integrations'][name]
+        except KeyError:
+            raise AttributeError(f"No integration registered as '{name}'") from None
+
+    def total_init_ms(self) -> float:
+        return sum(integration.init_ms or 0 for integration in self._integrations.values())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {'initialized': integration.initialized, 'init_ms': integration.init_ms}
+            for name, integration in self._integrations.items()
+        }
+
+
+def _jira():
+    from .atlassian.jira import AtlassianJira
+    return AtlassianJira()
+
+
+def _confluence():
+    from .atlassian.confluence import AtlassianConfluence
+    return AtlassianConfluence()
+
+
+def _slack_bot():
+    from .slack.bot import SlackBot
+    return SlackBot()
+
+
+def _slack_bolt_app():
+    from .slack.bolt_app import SlackBoltApp
+    return SlackBoltApp()
+
+
+def _google_sheet():
+    from .google.google_sheet import GoogleSheet
+    return GoogleSheet()
+
+
+def _team_db():
+    from database.table_database import TeamDatabase
+    return TeamDatabase()
+
+
+integrations = IntegrationRegistry()
+integrations.register('jira', _jira)
+integrations.register('confluence', _confluence)
+integrations.register('slack_bot', _slack_bot)
+# Keeps the listeners registered at import time; its WebClient opens a connection per call
+integrations.register('slack_bolt_app', _slack_bolt_app, reset_on_fork=False)
+integrations.register('google_sheet', _google_sheet)
+integrations.register('team_db', _team_db)
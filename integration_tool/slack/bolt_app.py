@@ -1,12 +1,20 @@
+import os
 import threading
 import time
 from typing import Optional, Callable
 
 from slack_bolt import App
+from slack_bolt.adapter.flask import SlackRequestHandler
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 
 from configuration.account import SlackBotConfig
 from utility import logger, log_class, set_correlation_id
+from .bot import TimedWebClient
+
+# Apps whose Socket Mode start was deferred to the elected server worker (see elect_socket_mode_worker)
+_deferred_socket_mode_apps = []
+# Apps with an open Socket Mode connection in this process
+_socket_mode_apps = []
 
 
 @log_class
@@ -20,9 +28,12 @@ class SlackBoltApp:
         if not self.bot_token:
             raise ValueError("Bot token is required but not provided and no default exists")
 
-        self.app = App(token=self.bot_token, signing_secret=self.signing_secret)
+        # No auth.test at construction, so listeners can be declared at import time without network calls
+        self.app = App(client=TimedWebClient(token=self.bot_token), signing_secret=self.signing_secret,
+                       token_verification_enabled=False)
         self._setup_handlers()
         self.handler = None
+        self._http_handler = None
         self._thread = None
         self._is_running = False
 
@@ -59,14 +70,26 @@ class SlackBoltApp:
         self.stop()
         return False  # Don't suppress exceptions
 
-    def start(self, start_socket_mode: bool = True) -> 'SlackBoltApp':
-        """ Start the Slack Bolt application. """
+    def start(self, start_socket_mode: bool = True,
+              defer: bool = SlackBotConfig.SOCKET_MODE_DEFERRED) -> 'SlackBoltApp':
+        """
+        Start the Slack Bolt application.
+
+        With `defer` the Socket Mode connection is only queued here and opened later by
+        elect_socket_mode_worker(), so a pre-forking server opens it in one worker instead of
+        once per worker.
+        """
         if self._is_running:
             logger.warning('Slack Bot application is already running')
             return self
 
-        if start_socket_mode:
+        if start_socket_mode and defer:
+            if self not in _deferred_socket_mode_apps:
+                _deferred_socket_mode_apps.append(self)
+            logger.info("Socket Mode start deferred to the elected server worker")
+        elif start_socket_mode:
             self._start_socket_mode()
+            _socket_mode_apps.append(self)
 
         return self
 
@@ -95,6 +118,17 @@ class SlackBoltApp:
             logger.error(f"Failed to start Socket Mode: {e}")
             raise
 
+    def http_request_handler(self) -> SlackRequestHandler:
+        """
+        Flask adapter for the Events API / interactivity HTTP receiver, dispatching to the same
+        listeners as Socket Mode. Bolt verifies each request signature with the signing secret.
+        """
+        if self._http_handler is None:
+            if not self.signing_secret:
+                raise ValueError('Signing secret is required for the HTTP receiver')
+            self._http_handler = SlackRequestHandler(self.app)
+        return self._http_handler
+
     def stop(self):
         """ Stop the Slack Bolt application and clean up resources. """
         if not self._is_running:
@@ -105,7 +139,10 @@ class SlackBoltApp:
 
         # Implement proper shutdown
         if self.handler:
-            # Bolt doesn't have a clean way to stop the socket mode handler
+            try:
+                self.handler.close()
+            except Exception as e:
+                logger.warning(f"Socket Mode handler close failed: {e}")
             self._is_running = False
             self.handler = None
 
@@ -129,3 +166,43 @@ class SlackBoltApp:
     def command(self, command_name: str, *args, **kwargs) -> Callable:
         """ Register a slash command handler."""
         return self.app.command(command_name, *args, **kwargs)
+
+
+def start_deferred_socket_mode():
+    """ Open the Socket Mode connections that were deferred, call once from the owning process. """
+    while _deferred_socket_mode_apps:
+        _deferred_socket_mode_apps.pop(0).start(defer=False)
+
+
+def elect_socket_mode_worker(lock_path: str = SlackBotConfig.SOCKET_MODE_LOCK_PATH):
+    """
+    Call in every server worker: the worker that takes the exclusive lock on `lock_path` opens
+    the deferred Socket Mode connections. The others keep a standby thread blocked on the
+    lock, so when the owner exits (restart, max_requests, crash) another worker takes over.
+    """
+    import fcntl  # POSIX only, like the pre-forking servers that call this
+
+    if not _deferred_socket_mode_apps:
+        return
+
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Held open for the life of the worker, the OS releases the lock when the process exits
+    lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _wait_for_lock():
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        logger.info(f"Worker {os.getpid()} owns the Slack Socket Mode connection")
+        try:
+            start_deferred_socket_mode()
+        except Exception as e:
+            logger.error(f"Slack Socket Mode failed to start in worker {os.getpid()}: {e}")
+
+    threading.Thread(target=_wait_for_lock, name='socket-mode-election', daemon=True).start()
+
+
+def stop_socket_mode():
+    """ Close every Socket Mode connection opened by this process. """
+    while _socket_mode_apps:
+        _socket_mode_apps.pop().stop()
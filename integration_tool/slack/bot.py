@@ -1,12 +1,64 @@
+import contextvars
 import ssl
-from typing import Any, List, Union, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Union, Optional
 
 import certifi
 from slack_sdk import WebClient
 
 from configuration.account import SlackBotConfig
-from utility import logger, log_class
+from utility import logger, log_class, upstream_timer
 from .message_builder import MessageBuilderMethod
+from .outbound_queue import get_outbound_queue
+
+_fan_out_executor = None
+_fan_out_executor_lock = threading.Lock()
+
+
+def reset_fan_out_executor_after_fork():
+    """ The pool threads don't survive fork, let the child create its own on first use. """
+    global _fan_out_executor, _fan_out_executor_lock
+
+    _fan_out_executor = None
+    _fan_out_executor_lock = threading.Lock()
+
+
+def _get_fan_out_executor() -> ThreadPoolExecutor:
+    """ Bounded pool shared by every SlackBot, created on first multi-channel send. """
+    global _fan_out_executor
+
+    if _fan_out_executor is None:
+        with _fan_out_executor_lock:
+            if _fan_out_executor is None:
+                _fan_out_executor = ThreadPoolExecutor(
+                    max_workers=SlackBotConfig.FAN_OUT_WORKERS,
+                    thread_name_prefix='slack-fan-out'
+                )
+    return _fan_out_executor
+
+
+class TimedWebClient(WebClient):
+    """ WebClient that reports every Web API call as a 'slack' upstream call. """
+
+    def api_call(self, *args, **kwargs):
+        with upstream_timer('slack'):
+            return super().api_call(*args, **kwargs)
+
+
+def normalize_channels(channels: Union[str, List[str], None]) -> List[str]:
+    """ Accept one channel or a list of channels, drop blanks and duplicates but keep order. """
+    if not channels:
+        return []
+    if isinstance(channels, str):
+        channels = [channels]
+
+    normalized = []
+    for channel in channels:
+        channel = str(channel).strip() if channel else ""
+        if channel and channel not in normalized:
+            normalized.append(channel)
+    return normalized
 
 
 @log_class
@@ -19,40 +71,109 @@ class SlackBot:
             raise ValueError("Bot token is required but not provided and no default exists")
 
         ssl_context = ssl.create_default_context(cafile=certifi.where())
-        self.client = WebClient(token=self.token, ssl=ssl_context)
+        self.client = TimedWebClient(token=self.token, ssl=ssl_context)
         self.message_builder = MessageBuilderMethod
 
 
     def chat_post_message(self,  channels: Union[str, List[str]], message: Any, message_builder_method: str = 'customize'):
-        """ Send message to slack channel. """
+        """ Send message to every slack channel concurrently, return the per-channel delivery report. """
         processed_message = getattr(self.message_builder, message_builder_method)(message)
 
-        results = []
-        for channel in channels:
+        def _send(channel: str):
             logger.info(f"Sending message to channel: {channel}")
-            response = self.client.chat_postMessage(
+            return self.client.chat_postMessage(
                 channel=channel,
                 **processed_message,
             )
-            results.append(response)
 
-        logger.info(f"Successfully sent messages to {len(results)} channels")
-        return results
+        report = self._fan_out(channels=channels, send=_send)
+        logger.info(f"Sent messages to {report['succeeded']}/{report['total']} channels")
+        return report
+
+    def chat_post_thread(self, channels: Union[str, List[str]], messages: List[Dict[str, Any]]):
+        """ Post a series of payloads per channel: the first as a message, the rest as replies in its thread. """
+        def _send(channel: str):
+            logger.info(f"Sending {len(messages)} threaded messages to channel: {channel}")
+            first_response = self.client.chat_postMessage(channel=channel, **messages[0])
+            for reply in messages[1:]:
+                self.client.chat_postMessage(channel=channel, thread_ts=first_response.get('ts'), **reply)
+            return first_response
+
+        report = self._fan_out(channels=channels, send=_send)
+        logger.info(f"Sent threaded messages to {report['succeeded']}/{report['total']} channels")
+        return report
+
+    def enqueue_thread(self, channels: Union[str, List[str]], messages: List[Dict[str, Any]],
+                       delivery_id: Optional[str] = None) -> str:
+        """ Queue a threaded series (see chat_post_thread) for background delivery. """
+        return get_outbound_queue(self.client).enqueue(
+            channels=normalize_channels(channels),
+            payloads=messages,
+            thread_replies=True,
+            delivery_id=delivery_id
+        )
+
+    def enqueue_message(self, channels: Union[str, List[str]], message: Any,
+                        message_builder_method: str = 'customize', delivery_id: Optional[str] = None) -> str:
+        """ Queue the message for background delivery and return the delivery ID right away. """
+        processed_message = getattr(self.message_builder, message_builder_method)(message)
+        return get_outbound_queue(self.client).enqueue(
+            channels=normalize_channels(channels),
+            payloads=[processed_message],
+            delivery_id=delivery_id
+        )
+
+    def get_delivery_status(self, delivery_id: str) -> Optional[Dict[str, Any]]:
+        """ Look up a queued delivery by the ID returned from enqueue_message. """
+        return get_outbound_queue(self.client).get_delivery(delivery_id)
 
     def channels_set_topic(self, channels: Union[str, List[str]], topic: str):
-        """ Set the channel topic on top. """
-        results = []
-        for channel in channels:
+        """ Set the channel topic on top, concurrently for every channel. """
+        def _send(channel: str):
             logger.info(f"Setting topic for channel {channel}: {topic}")
-            response = self.client.conversations_setTopic(
+            return self.client.conversations_setTopic(
                 channel=channel,
                 topic=topic
             )
-            results.append(response)
 
-        logger.info(f"Set topic for {len(results)} channels")
-        return results
+        report = self._fan_out(channels=channels, send=_send)
+        logger.info(f"Set topic for {report['succeeded']}/{report['total']} channels")
+        return report
 
     def get_channel_info(self, channel: str):
         response = self.client.conversations_info(channel=channel)
         return response
+
+    def _fan_out(self, channels: Union[str, List[str]], send: Callable[[str], Any]) -> Dict[str, Any]:
+        """
+        Run `send` once per channel on the shared bounded pool.
+
+        Everything for one channel runs inside a single task, so per-channel ordering is kept
+        while channels proceed in parallel. Failures are reported per channel instead of
+        aborting the remaining channels.
+        """
+        channels = normalize_channels(channels)
+
+        def _deliver(channel: str) -> Dict[str, Any]:
+            try:
+                response = send(channel)
+                return {'channel': channel, 'ok': True, 'ts': response.get('ts'), 'error': None}
+            except Exception as e:
+                logger.error(f"Slack delivery to {channel} failed: {e}")
+                return {'channel': channel, 'ok': False, 'ts': None, 'error': str(e)}
+
+        if len(channels) <= 1:
+            results = [_deliver(channel) for channel in channels]
+        else:
+            # One context copy per task keeps the correlation ID and request timings on the workers
+            executor = _get_fan_out_executor()
+            futures = [executor.submit(contextvars.copy_context().run, _deliver, channel) for channel in channels]
+            results = [future.result() for future in futures]
+
+        succeeded = sum(1 for result in results if result['ok'])
+        return {
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'results': results,
+        }
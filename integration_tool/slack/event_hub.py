@@ -0,0 +1,355 @@
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Union
+
+from configuration.account import SlackBotConfig
+from utility import logger, set_correlation_id
+from ..registry import integrations
+
+LISTENER_KINDS = ('action', 'command', 'event', 'message', 'shortcut', 'view', 'options')
+
+# Arguments the hub always needs from Bolt, whatever the handler itself declares
+_HUB_ARGS = ('ack', 'body')
+
+
+class IdempotencyCache:
+    """ Remembers delivery keys for `ttl` seconds, so retried deliveries can be dropped (this process only). """
+
+    def __init__(self, ttl: float = SlackBotConfig.LISTENER_IDEMPOTENCY_TTL,
+                 max_keys: int = SlackBotConfig.LISTENER_IDEMPOTENCY_MAX_KEYS):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._expires_at: 'OrderedDict[str, float]' = OrderedDict()
+
+    def seen(self, key: str) -> bool:
+        """ True if the key was recorded within the TTL, otherwise record it and return False. """
+        now = time.monotonic()
+        with self._lock:
+            while self._expires_at:
+                expires_at = next(iter(self._expires_at.values()))
+                if expires_at > now and len(self._expires_at) < self.max_keys:
+                    break
+                self._expires_at.popitem(last=False)
+
+            if key in self._expires_at:
+                return True
+            self._expires_at[key] = now + self.ttl
+            return False
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+
+class SqliteIdempotencyCache:
+    """
+    IdempotencyCache kept in a SQLite file, so every process on the host sees the same keys.
+
+    A key is claimed by a single upsert that only succeeds when the key is new or expired,
+    which makes the check-and-record atomic across processes. Expired rows are pruned at most
+    once per `prune_interval` seconds.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS slack_delivery_seen (
+        delivery_key TEXT PRIMARY KEY,
+        expires_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, db_path: str, ttl: float = SlackBotConfig.LISTENER_IDEMPOTENCY_TTL,
+                 prune_interval: float = 60.0):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self._pruned_at = 0.0
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # Set up on first use rather than at import, the hub exists even without listeners
+        if not self._initialized:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.db_path, timeout=5)
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(self._SCHEMA)
+            self._initialized = True
+        return connection
+
+    def seen(self, key: str) -> bool:
+        """ True if any process recorded the key within the TTL, otherwise record it and return False. """
+        now = time.time()
+        connection = None
+        try:
+            connection = self._connect()
+            with connection:  # one transaction, committed on exit
+                if now - self._pruned_at > self.prune_interval:
+                    self._pruned_at = now
+                    connection.execute("DELETE FROM slack_delivery_seen WHERE expires_at <= ?", (now,))
+
+                cursor = connection.execute(
+                    "INSERT INTO slack_delivery_seen (delivery_key, expires_at) VALUES (?, ?) "
+                    "ON CONFLICT (delivery_key) DO UPDATE SET expires_at = excluded.expires_at "
+                    "WHERE slack_delivery_seen.expires_at <= ?",
+                    (key, now + self.ttl, now)
+                )
+                return cursor.rowcount == 0
+        except (sqlite3.Error, OSError) as e:
+            # Better to run a retried delivery twice than to drop a new one
+            logger.error(f"Slack idempotency check failed, handling {key} anyway: {e}")
+            return False
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def reset_after_fork(self):
+        """ Nothing is held between calls, every check opens its own connection. """
+
+
+def _build_idempotency_cache() -> Union[IdempotencyCache, SqliteIdempotencyCache]:
+    if SlackBotConfig.LISTENER_IDEMPOTENCY_PATH:
+        return SqliteIdempotencyCache(db_path=SlackBotConfig.LISTENER_IDEMPOTENCY_PATH)
+    return IdempotencyCache()
+
+
+class _OnceAck:
+    """ Ack handed to handlers: the hub already acked, later calls are no-ops. """
+
+    def __init__(self, ack: Callable):
+        self._ack = ack
+        self._lock = threading.Lock()
+        self.acked = False
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            if self.acked:
+                return None
+            self.acked = True
+        return self._ack(*args, **kwargs)
+
+
+def _delivery_key(body: Dict[str, Any]) -> Optional[str]:
+    """ Stable ID of one Slack delivery, shared by its retries. """
+    if not isinstance(body, dict):
+        return None
+    if body.get('event_id'):
+        return f"event:{body['event_id']}"
+
+    actions = body.get('actions') or []
+    if actions and actions[0].get('action_ts'):
+        return f"action:{actions[0].get('action_id')}:{actions[0]['action_ts']}"
+    if body.get('trigger_id'):
+        return f"trigger:{body['trigger_id']}"
+    return None
+
+
+class SlackEventHub:
+    """
+    The one Bolt app (and Socket Mode connection) of the process.
+
+    Features declare their listeners in routes.json ("slack_listeners"); blueprint registration
+    adds them here. A delivery is acked right away on the Socket Mode thread, retried deliveries
+    (same event_id / action_ts) are dropped, and the handler itself runs on a bounded pool with
+    at most `max_concurrency` runs per listener; further deliveries wait in the listener's
+    queue, up to `max_pending` across all listeners.
+    """
+
+    def __init__(self, max_workers: int = SlackBotConfig.LISTENER_WORKERS,
+                 max_pending: int = SlackBotConfig.LISTENER_MAX_PENDING,
+                 default_max_concurrency: int = SlackBotConfig.LISTENER_MAX_CONCURRENCY):
+        self.max_pending = max_pending
+        self.default_max_concurrency = default_max_concurrency
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='slack-listener')
+        self._idempotency = _build_idempotency_cache()
+        self._lock = threading.Lock()
+        self._listeners: Dict[str, Dict[str, Any]] = {}
+        self._pending = 0
+
+    def register(self, kind: str, key: Any, handler: Callable, name: str = None,
+                 max_concurrency: Optional[int] = None) -> Callable:
+        """ Add `handler` as a Bolt `kind` listener (e.g. kind='action', key='sprint_ticket'). """
+        if kind not in LISTENER_KINDS:
+            raise ValueError(f"Unknown Slack listener kind '{kind}', expected one of {LISTENER_KINDS}")
+
+        name = name or f"{kind}:{key}"
+        with self._lock:
+            if name in self._listeners:
+                logger.info(f"Slack listener {name} already registered, skipping.")
+                return self._listeners[name]['handler']
+            self._listeners[name] = {
+                'kind': kind, 'key': key, 'handler': handler,
+                'max_concurrency': max_concurrency or self.default_max_concurrency,
+                'queue': deque(), 'running': 0,
+                'dispatched': 0, 'errors': 0, 'duplicates': 0, 'rejected': 0,
+                'total_ms': 0.0, 'max_ms': 0.0, 'acked': 0, 'ack_total_ms': 0.0, 'ack_max_ms': 0.0,
+                'last_dispatched_at': None,
+            }
+
+        getattr(integrations.slack_bolt_app.app, kind)(key)(self._instrument(name, handler))
+        return handler
+
+    def _instrument(self, name: str, handler: Callable) -> Callable:
+        handler_args = inspect.getfullargspec(inspect.unwrap(handler)).args
+
+        @wraps(handler)
+        def wrapper(**kwargs):
+            received = time.perf_counter()
+            ack = _OnceAck(kwargs['ack'])
+            ack()
+            self._record_ack(name, (time.perf_counter() - received) * 1000)
+
+            delivery_key = _delivery_key(kwargs.get('body'))
+            if delivery_key and self._idempotency.seen(f"{name}:{delivery_key}"):
+                self._count(name, 'duplicates')
+                logger.info(f"Slack listener {name} dropped retried delivery {delivery_key}")
+                return None
+
+            call_kwargs = {arg: kwargs[arg] for arg in handler_args if arg in kwargs}
+            if 'ack' in call_kwargs:
+                call_kwargs['ack'] = ack
+            self._enqueue(name, lambda: handler(**call_kwargs))
+            return None
+
+        # Bolt injects arguments by the listener's signature: the handler's own plus what the hub needs
+        del wrapper.__wrapped__
+        wrapper.__signature__ = inspect.Signature([
+            inspect.Parameter(arg, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+            for arg in dict.fromkeys(list(handler_args) + list(_HUB_ARGS))
+        ])
+        return wrapper
+
+    def _enqueue(self, name: str, call: Callable[[], Any]):
+        with self._lock:
+            listener = self._listeners[name]
+            if listener['running'] < listener['max_concurrency']:
+                listener['running'] += 1
+            elif self._pending < self.max_pending:
+                listener['queue'].append((call, time.perf_counter()))
+                self._pending += 1
+                return
+            else:
+                listener['rejected'] += 1
+                logger.warning(f"Slack listener {name} rejected a delivery, {self._pending} deliveries pending")
+                return
+
+        self._executor.submit(self._run, name, call)
+
+    def _run(self, name: str, call: Callable[[], Any]):
+        while call is not None:
+            set_correlation_id()
+            started = time.perf_counter()
+            error = False
+            try:
+                call()
+            except Exception as e:
+                error = True
+                logger.error(f"Slack listener {name} failed: {e}", exc_info=True)
+            finally:
+                self._record(name, (time.perf_counter() - started) * 1000, error)
+
+            # Keep the slot and run the listener's next queued delivery, or release the slot
+            with self._lock:
+                listener = self._listeners[name]
+                if listener['queue']:
+                    call, _ = listener['queue'].popleft()
+                    self._pending -= 1
+                else:
+                    listener['running'] -= 1
+                    call = None
+
+    def _count(self, name: str, counter: str):
+        with self._lock:
+            self._listeners[name][counter] += 1
+
+    def _record_ack(self, name: str, elapsed_ms: float):
+        with self._lock:
+            listener = self._listeners[name]
+            listener['acked'] += 1
+            listener['ack_total_ms'] += elapsed_ms
+            listener['ack_max_ms'] = max(listener['ack_max_ms'], elapsed_ms)
+
+    def _record(self, name: str, elapsed_ms: float, error: bool):
+        with self._lock:
+            listener = self._listeners[name]
+            listener['dispatched'] += 1
+            listener['errors'] += int(error)
+            listener['total_ms'] += elapsed_ms
+            listener['max_ms'] = max(listener['max_ms'], elapsed_ms)
+            listener['last_dispatched_at'] = time.time()
+
+    def reset_after_fork(self):
+        """
+        Give a forked worker its own handler pool and lock. Deliveries queued or running in the
+        parent stay there, so the per-listener queues and slots start empty; counters are kept.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='slack-listener')
+        self._lock = threading.Lock()
+        self._pending = 0
+        for listener in self._listeners.values():
+            listener['queue'] = deque()
+            listener['running'] = 0
+        self._idempotency.reset_after_fork()
+
+    def start(self, receiver_mode: str = SlackBotConfig.RECEIVER_MODE):
+        """
+        Open the shared Socket Mode connection, only when at least one listener is registered.
+        In 'http' receiver mode nothing is opened, deliveries come in through /api/slack/events.
+        """
+        if not self._listeners:
+            logger.info("No Slack listeners registered, Socket Mode not started")
+            return
+        if receiver_mode == 'http':
+            logger.info("Slack receiver mode is 'http', listeners are served at /api/slack/events")
+            return
+
+        try:
+            integrations.slack_bolt_app.start()
+        except Exception as e:
+            # The HTTP API keeps serving, only the Slack listeners are unavailable
+            logger.error(f"Slack Socket Mode failed to start: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        from .bolt_app import _socket_mode_apps
+
+        def _avg(total: float, count: int, digits: int = 1) -> Optional[float]:
+            return round(total / count, digits) if count else None
+
+        with self._lock:
+            listeners = {}
+            for name, listener in self._listeners.items():
+                listeners[name] = {
+                    'kind': listener['kind'],
+                    'key': str(listener['key']),
+                    'max_concurrency': listener['max_concurrency'],
+                    'running': listener['running'],
+                    'queued': len(listener['queue']),
+                    'dispatched': listener['dispatched'],
+                    'errors': listener['errors'],
+                    'duplicates': listener['duplicates'],
+                    'rejected': listener['rejected'],
+                    'avg_ms': _avg(listener['total_ms'], listener['dispatched']),
+                    'max_ms': round(listener['max_ms'], 1),
+                    'ack_avg_ms': _avg(listener['ack_total_ms'], listener['acked'], digits=2),
+                    'ack_max_ms': round(listener['ack_max_ms'], 2),
+                    'last_dispatched_at': listener['last_dispatched_at'],
+                }
+            return {
+                'receiver_mode': SlackBotConfig.RECEIVER_MODE,
+                'socket_mode_connections': len(_socket_mode_apps),
+                'queue_depth': self._pending,
+                'max_pending': self.max_pending,
+                'listeners': listeners,
+            }
+
+
+slack_event_hub = SlackEventHub()
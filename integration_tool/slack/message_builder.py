@@ -1,5 +1,14 @@
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List
+
+# Slack per-message limits, see https://api.slack.com/reference/block-kit/blocks
+SLACK_MAX_BLOCKS = 50
+SLACK_MAX_SECTION_TEXT = 3000
+SLACK_MAX_MESSAGE_TEXT = 40000
+
+
+def _truncate(text: str, limit: int, marker: str = "…") -> str:
+    return text if len(text) <= limit else text[:limit - len(marker)] + marker
 
 
 class MessageBuilderMethod:
@@ -27,18 +36,27 @@ class MessageBuilderMethod:
             }
         ]
 
-        for key, value in message.items():
-            if value is not None:
-                formatted_value = json.dumps(value, indent=4, ensure_ascii=False)
-                blocks.append(
-                    {
-                        'type': 'section',
-                        'text': {
-                            'type': 'mrkdwn',
-                            'text': f"*{key}:*\n```{formatted_value}```"
-                        }
+        items = [(key, value) for key, value in message.items() if value is not None]
+        for index, (key, value) in enumerate(items):
+            if len(blocks) == SLACK_MAX_BLOCKS - 1 and index < len(items) - 1:
+                blocks.append({
+                    'type': 'context',
+                    'elements': [{'type': 'mrkdwn', 'text': f"_{len(items) - index} more keys omitted_"}]
+                })
+                break
+
+            formatted_value = json.dumps(value, indent=4, ensure_ascii=False)
+            prefix = f"*{key}:*\n```"
+            formatted_value = _truncate(formatted_value, SLACK_MAX_SECTION_TEXT - len(prefix) - 3)
+            blocks.append(
+                {
+                    'type': 'section',
+                    'text': {
+                        'type': 'mrkdwn',
+                        'text': f"{prefix}{formatted_value}```"
                     }
-                )
+                }
+            )
 
         return {'blocks': blocks}
 
@@ -74,4 +92,73 @@ class MessageBuilderMethod:
                     }
                 }
             ]
-        }
\ No newline at end of file
+        }
+
+
+class SlackDigestBuilder:
+    """
+    Split a long list of mrkdwn entries (e.g. one per Jira ticket) into several Slack messages.
+
+    Entries are packed into section blocks of at most SLACK_MAX_SECTION_TEXT characters, and
+    a new message is started before a message would exceed `max_blocks` blocks or `max_chars`
+    characters. Parts are collected in lists and joined once per block, never by repeated
+    string concatenation. The first message carries the title, the rest are meant to be
+    posted as thread replies under it.
+    """
+
+    def __init__(self, title: str, entry_separator: str = "\n\n", max_blocks: int = SLACK_MAX_BLOCKS,
+                 max_chars: int = 12000):
+        self.title = title
+        self.entry_separator = entry_separator
+        self.max_blocks = max_blocks
+        self.max_chars = min(max_chars, SLACK_MAX_MESSAGE_TEXT)
+
+    @staticmethod
+    def _section(text: str) -> Dict[str, Any]:
+        return {'type': 'section', 'text': {'type': 'mrkdwn', 'text': text}}
+
+    def _message(self, blocks: List[Dict[str, Any]], part: int) -> Dict[str, Any]:
+        fallback = self.title if part == 1 else f"{self.title} ({part})"
+        return {'text': fallback, 'blocks': blocks}
+
+    def iter_messages(self, entries: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """ Yield chat_postMessage payloads lazily, one per Slack message. """
+        part = 1
+        blocks = [self._section(_truncate(self.title, SLACK_MAX_SECTION_TEXT))]
+        message_chars = len(self.title)
+        section_parts: List[str] = []
+        section_chars = 0
+        separator_len = len(self.entry_separator)
+
+        for entry in entries:
+            entry = _truncate(entry, SLACK_MAX_SECTION_TEXT)
+            extra = len(entry) + (separator_len if section_parts else 0)
+
+            if section_parts and section_chars + extra > SLACK_MAX_SECTION_TEXT:
+                blocks.append(self._section(self.entry_separator.join(section_parts)))
+                section_parts, section_chars = [], 0
+                extra = len(entry)
+
+            # Flush the whole message if this entry would push it past the block or char budget.
+            pending_blocks = len(blocks) + (1 if section_parts else 0)
+            over_blocks = not section_parts and pending_blocks + 1 > self.max_blocks
+            if over_blocks or message_chars + extra > self.max_chars:
+                if section_parts:
+                    blocks.append(self._section(self.entry_separator.join(section_parts)))
+                    section_parts, section_chars = [], 0
+                yield self._message(blocks, part)
+                part += 1
+                blocks, message_chars = [], 0
+                extra = len(entry)
+
+            section_parts.append(entry)
+            section_chars += extra
+            message_chars += extra
+
+        if section_parts:
+            blocks.append(self._section(self.entry_separator.join(section_parts)))
+        if blocks:
+            yield self._message(blocks, part)
+
+    def build(self, entries: Iterable[str]) -> List[Dict[str, Any]]:
+        return list(self.iter_messages(entries))
@@ -0,0 +1,313 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+from configuration.account import SlackBotConfig
+from utility import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slack_outbound_message (
+    delivery_id TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    payloads TEXT NOT NULL,
+    thread_replies INTEGER NOT NULL DEFAULT 0,
+    sent_count INTEGER NOT NULL DEFAULT 0,
+    thread_ts TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (delivery_id, channel)
+);
+CREATE INDEX IF NOT EXISTS idx_slack_outbound_message_due ON slack_outbound_message (status, next_attempt_at);
+"""
+
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+
+def _retry_after(headers: Optional[Dict[str, Any]]) -> Optional[float]:
+    """ Seconds from a Retry-After header (any casing), None when missing or malformed. """
+    for name, value in (headers or {}).items():
+        if name.lower() == 'retry-after':
+            try:
+                return max(float(value), 0.0)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class SlackOutboundQueue:
+    """
+    Durable outbound Slack queue backed by a local SQLite file.
+
+    One row is one channel of a delivery: an ordered series of chat_postMessage payloads
+    (optionally threaded under the first one). `sent_count` records progress so a retry
+    resumes the series instead of re-posting what already went out. Rows are claimed with a
+    lease, so several processes can drain the same file and a crashed worker's rows are
+    picked up again once the lease expires.
+    """
+
+    def __init__(self, client: WebClient, db_path: str = SlackBotConfig.OUTBOUND_QUEUE_PATH,
+                 workers: int = SlackBotConfig.OUTBOUND_QUEUE_WORKERS,
+                 max_attempts: int = SlackBotConfig.OUTBOUND_QUEUE_MAX_ATTEMPTS,
+                 backoff_base: float = SlackBotConfig.OUTBOUND_QUEUE_BACKOFF_BASE,
+                 backoff_max: float = SlackBotConfig.OUTBOUND_QUEUE_BACKOFF_MAX,
+                 lease_timeout: float = SlackBotConfig.OUTBOUND_QUEUE_LEASE_TIMEOUT,
+                 poll_interval: float = 1.0):
+        self.client = client
+        self.db_path = db_path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def new_delivery_id() -> str:
+        return str(uuid.uuid4())
+
+    def enqueue(self, channels: List[str], payloads: List[Dict[str, Any]], thread_replies: bool = False,
+                delivery_id: Optional[str] = None) -> str:
+        """ Persist one delivery (the same payload series for every channel) and return its ID. """
+        if not channels:
+            # A delivery without rows could never be looked up, so don't hand out an ID for it
+            raise ValueError("At least one Slack channel is required")
+
+        delivery_id = delivery_id or self.new_delivery_id()
+        now = time.time()
+        rows = [
+            (delivery_id, channel, json.dumps(payloads, ensure_ascii=False), int(thread_replies),
+             STATUS_PENDING, now, now, now)
+            for channel in channels
+        ]
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO slack_outbound_message "
+                "(delivery_id, channel, payloads, thread_replies, status, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        logger.info(f"Queued Slack delivery {delivery_id} for {len(rows)} channels")
+        self._wakeup.set()
+        return delivery_id
+
+    def get_delivery(self, delivery_id: str) -> Optional[Dict[str, Any]]:
+        """ Per-channel state of a delivery plus an overall status, None when unknown. """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT channel, status, attempts, sent_count, payloads, thread_ts, last_error, "
+                "created_at, updated_at FROM slack_outbound_message WHERE delivery_id = ? ORDER BY channel",
+                (delivery_id,)
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        statuses = {row['status'] for row in rows}
+        if statuses == {STATUS_SENT}:
+            overall = STATUS_SENT
+        elif statuses <= {STATUS_SENT, STATUS_FAILED}:
+            overall = STATUS_FAILED if statuses == {STATUS_FAILED} else 'partial'
+        else:
+            overall = STATUS_PENDING
+
+        return {
+            'delivery_id': delivery_id,
+            'status': overall,
+            'channels': [
+                {
+                    'channel': row['channel'],
+                    'status': row['status'],
+                    'attempts': row['attempts'],
+                    'sent': row['sent_count'],
+                    'total': len(json.loads(row['payloads'])),
+                    'thread_ts': row['thread_ts'],
+                    'last_error': row['last_error'],
+                    'created_at': row['created_at'],
+                    'updated_at': row['updated_at'],
+                }
+                for row in rows
+            ],
+        }
+
+    def start(self) -> 'SlackOutboundQueue':
+        if self._threads:
+            return self
+
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run_worker, name=f'slack-outbound-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Slack outbound queue started with {self.workers} workers: {self.db_path}")
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _run_worker(self):
+        while not self._stopping.is_set():
+            try:
+                row = self._claim_next()
+            except Exception as e:
+                logger.error(f"Slack outbound queue claim failed: {e}")
+                row = None
+
+            if row is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._deliver(row)
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT rowid, * FROM slack_outbound_message "
+                    "WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND updated_at < ?) "
+                    "ORDER BY next_attempt_at LIMIT 1",
+                    (STATUS_PENDING, now, STATUS_SENDING, now - self.lease_timeout)
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE slack_outbound_message SET status = ?, attempts = attempts + 1, updated_at = ? "
+                        "WHERE rowid = ?",
+                        (STATUS_SENDING, now, row['rowid'])
+                    )
+                connection.execute("COMMIT")
+                return row
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _update(self, rowid: int, **values):
+        values['updated_at'] = time.time()
+        assignments = ', '.join(f"{column} = ?" for column in values)
+        with self._connect() as connection:
+            connection.execute(
+                f"UPDATE slack_outbound_message SET {assignments} WHERE rowid = ?",
+                (*values.values(), rowid)
+            )
+
+    def _deliver(self, row: sqlite3.Row):
+        rowid = row['rowid']
+        channel = row['channel']
+        payloads = json.loads(row['payloads'])
+        sent_count = row['sent_count']
+        thread_ts = row['thread_ts']
+        attempts = row['attempts'] + 1
+
+        try:
+            for index in range(sent_count, len(payloads)):
+                payload = dict(payloads[index])
+                if row['thread_replies'] and index > 0 and thread_ts:
+                    payload['thread_ts'] = thread_ts
+
+                response = self.client.chat_postMessage(channel=channel, **payload)
+                if index == 0:
+                    thread_ts = response.get('ts')
+                self._update(rowid, sent_count=index + 1, thread_ts=thread_ts)
+
+            self._update(rowid, status=STATUS_SENT, last_error=None)
+            logger.info(f"Slack delivery {row['delivery_id']} sent to {channel}")
+        except Exception as e:
+            self._handle_failure(row=row, attempts=attempts, error=e)
+
+    def _handle_failure(self, row: sqlite3.Row, attempts: int, error: Exception):
+        retry_after = None
+        retryable = True
+        if isinstance(error, SlackApiError):
+            status_code = error.response.status_code
+            if status_code == 429:
+                retry_after = _retry_after(error.response.headers)
+                if retry_after is None:
+                    retry_after = self.backoff_base
+            else:
+                # Only rate limits and Slack-side outages are worth retrying, not e.g. channel_not_found.
+                retryable = status_code >= 500
+
+        if not retryable or attempts >= self.max_attempts:
+            self._update(row['rowid'], status=STATUS_FAILED, last_error=str(error))
+            logger.error(f"Slack delivery {row['delivery_id']} to {row['channel']} failed: {error}")
+            return
+
+        delay = retry_after if retry_after is not None else min(
+            self.backoff_base * (2 ** (attempts - 1)), self.backoff_max
+        )
+        self._update(
+            row['rowid'],
+            status=STATUS_PENDING,
+            next_attempt_at=time.time() + delay,
+            last_error=str(error)
+        )
+        logger.warning(
+            f"Slack delivery {row['delivery_id']} to {row['channel']} retry {attempts} in {delay:.1f}s: {error}"
+        )
+
+
+_outbound_queue = None
+_outbound_queue_lock = threading.Lock()
+
+
+def reset_outbound_queue_after_fork():
+    """ The worker threads don't survive fork, let the child start its own queue on first use. """
+    global _outbound_queue, _outbound_queue_lock
+
+    _outbound_queue = None
+    _outbound_queue_lock = threading.Lock()
+
+
+def get_outbound_queue(client: WebClient) -> SlackOutboundQueue:
+    """ Process-wide queue, created and started on first use. """
+    global _outbound_queue
+
+    if _outbound_queue is None:
+        with _outbound_queue_lock:
+            if _outbound_queue is None:
+                _outbound_queue = SlackOutboundQueue(client=client).start()
+    return _outbound_queue
@@ -1,8 +1,6 @@
-import json
 import os
 import secrets
 import socket
-import subprocess
 from http import HTTPStatus
 
 from flask import Flask, g, request
@@ -11,11 +9,13 @@ from werkzeug.wrappers import Response
 
 import blueprint
 from configuration.base import Config, DevelopmentConfig, FlaskSecretKey
-from utility import logger, log_func, set_correlation_id, response_spec, log_response_spec
+from integration_tool import slack_event_hub
+from utility import logger, set_correlation_id, response_spec, access_logger, metrics, get_build_info
 from utility.constant import ResponseResult
 
 app = Flask(__name__, template_folder="./template")
 blueprint.register_blueprints(app)
+slack_event_hub.start()
 
 
 @app.before_request
@@ -32,33 +32,6 @@ def _add_correlation_id_to_response(response):
     return response
 
 
-@log_func
-def _log_response_info(response: Response):
-    if request.is_json:
-        request_body = json.dumps(request.get_json(), indent=4, ensure_ascii=False)
-    elif request.data:
-        request_body = request.data.decode('utf-8')
-    else:
-        request_body = "None"
-
-    try:
-        if response.is_json:
-            response_body = json.dumps(response.get_json(), indent=4, ensure_ascii=False)
-        else:
-            response_body = response.get_data(as_text=True)
-    except (TypeError, json.JSONDecodeError):
-        response_body = response.get_data(as_text=True)
-
-    logger.info(log_response_spec(
-        request=request,
-        request_body=request_body,
-        response=response,
-        response_body=response_body
-    ))
-
-    return response
-
-
 def _configure_app():
     env = os.environ.get('FLASK_ENV', 'development')
     env_mapping = {
@@ -75,24 +48,8 @@ def _setup_middleware():
         Response(response='Not Found', status=HTTPStatus.NOT_FOUND.value),
         {'/api': app.wsgi_app}
     )
-    app.after_request(_log_response_info)
-
-
-def _get_git_commit_id():
-    try:
-        # Add timeout to prevent hanging
-        commit_id = subprocess.check_output(
-            ['git', 'rev-parse', 'HEAD'],
-            stderr=subprocess.STDOUT,
-            timeout=3  # 3 seconds timeout
-        ).strip().decode('utf-8')
-        return commit_id
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-        error_msg = getattr(e, 'output', str(e))
-        if hasattr(error_msg, 'decode'):
-            error_msg = error_msg.decode('utf-8')
-        logger.error(f"Failed to get Git commit ID: {error_msg}")
-        return "unknown"
+    metrics.init_app(app)
+    access_logger.init_app(app)
 
 
 @app.route('/')
@@ -100,7 +57,7 @@ def index():
     resp_msg = {
         'title': 'SDET Atlassian-Google-Slack Integration Hub',
         'message': 'Welcome & Happy Testing :)',
-        'git_commit_id': _get_git_commit_id(),
+        'git_commit_id': get_build_info()['git_commit_id'],
     }
 
     return response_spec(
@@ -112,6 +69,7 @@ def index():
 
 _configure_app()
 _setup_middleware()
+get_build_info()  # Resolve build metadata once at startup, not per request
 
 if __name__ == '__main__':
     host = "0.0.0.0"
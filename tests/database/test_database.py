@@ -0,0 +1,180 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from database import database as database_module
+from database.database import BaseDatabaseConnection, Database
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def executemany(self, sql, rows):
+        if any(row.get('fail') for row in rows):
+            raise RuntimeError('duplicate entry')
+        self.connection.executed.append((sql, list(rows)))
+        self.rowcount = len(rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+class FakeDatabaseConnection(BaseDatabaseConnection):
+    def __init__(self):
+        self.raw = FakeConnection()
+        super().__init__('user', 'pwd', 'localhost', 3306, 'ags', pool_min_size=0, pool_max_size=1)
+
+    def _connect_database(self):
+        return self.raw
+
+    def _ping_connection(self, connection):
+        pass
+
+
+@pytest.fixture
+def make_database():
+    """ Database is a process-wide singleton, build a fresh one per test over a fake connection. """
+    created = []
+
+    def _make(driver: str, bulk_batch_size: int = 1000):
+        Database._instance = None
+        database = Database(SimpleNamespace(driver=driver, bulk_batch_size=bulk_batch_size))
+        connection = FakeDatabaseConnection()
+        patcher = mock.patch.object(Database, '_connection', new_callable=mock.PropertyMock,
+                                    return_value=connection)
+        patcher.start()
+        created.append(patcher)
+        return database, connection.raw
+
+    original = Database._instance
+    yield _make
+    for patcher in created:
+        patcher.stop()
+    Database._instance = original
+
+
+ROWS = [
+    {'slack_user_id': 'U1', 'team': 'SDET', 'atlassian_id': 'a1'},
+    {'slack_user_id': 'U2', 'team': 'SDET', 'atlassian_id': 'a2'},
+    {'slack_user_id': 'U3', 'team': 'QA', 'atlassian_id': 'a3'},
+]
+
+
+def test_bulk_upsert_on_mysql_binds_parameters_and_updates_non_key_columns(make_database):
+    database, connection = make_database('mysql')
+
+    report = database.bulk_upsert('team_member_detail', ROWS, key_fields=['slack_user_id'])
+
+    sql, rows = connection.executed[0]
+    assert sql == (
+        "INSERT INTO team_member_detail (slack_user_id, team, atlassian_id) "
+        "VALUES (%(slack_user_id)s, %(team)s, %(atlassian_id)s) "
+        "ON DUPLICATE KEY UPDATE team = VALUES(team), atlassian_id = VALUES(atlassian_id)"
+    )
+    assert rows == ROWS
+    assert report == [{'chunk': 0, 'rows': 3, 'affected': 3, 'error': None}]
+
+
+@pytest.mark.parametrize('driver', ['mysql', 'mssql'])
+def test_bulk_upsert_requires_key_fields(make_database, driver):
+    database, connection = make_database(driver)
+
+    with pytest.raises(ValueError):
+        database.bulk_upsert('team_member_detail', ROWS, key_fields=[])
+
+    assert connection.executed == []
+
+
+def test_bulk_upsert_with_nothing_to_update_keeps_the_statement_valid(make_database):
+    database, connection = make_database('mysql')
+
+    database.bulk_upsert('team_member_detail', ROWS, key_fields=['slack_user_id'], update_fields=[])
+
+    assert connection.executed[0][0].endswith("ON DUPLICATE KEY UPDATE slack_user_id = slack_user_id")
+
+
+def test_bulk_upsert_on_mssql_merges_on_the_key_fields(make_database):
+    database, connection = make_database('mssql')
+
+    database.bulk_upsert('team_member_detail', ROWS, key_fields=['slack_user_id'], update_fields=['team'])
+
+    sql = connection.executed[0][0]
+    assert sql.startswith("MERGE INTO team_member_detail AS target USING (SELECT %(slack_user_id)s AS slack_user_id")
+    assert "ON target.slack_user_id = source.slack_user_id" in sql
+    assert "WHEN MATCHED THEN UPDATE SET target.team = source.team" in sql
+    assert sql.endswith(
+        "WHEN NOT MATCHED THEN INSERT (slack_user_id, team, atlassian_id) "
+        "VALUES (source.slack_user_id, source.team, source.atlassian_id);"
+    )
+
+
+def test_bulk_upsert_commits_per_batch_and_reports_failed_batches(make_database):
+    database, connection = make_database('mysql', bulk_batch_size=2)
+    rows = ROWS + [{'slack_user_id': 'U4', 'team': 'QA', 'atlassian_id': 'a4', 'fail': True}]
+
+    report = database.bulk_upsert('team_member_detail', rows, key_fields=['slack_user_id'])
+
+    assert [(entry['chunk'], entry['rows'], entry['affected']) for entry in report] == [(0, 2, 2), (1, 2, 0)]
+    assert report[1]['error'] == 'duplicate entry'
+    assert (connection.commits, connection.rollbacks) == (1, 1)
+
+
+def test_bulk_upsert_without_rows_does_nothing(make_database):
+    database, connection = make_database('mysql')
+
+    assert database.bulk_upsert('team_member_detail', [], key_fields=['slack_user_id']) == []
+    assert connection.executed == []
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError('result body was formatted')
+
+
+def test_debug_print_skips_formatting_when_debug_is_off():
+    connection = FakeDatabaseConnection()
+    with mock.patch.object(database_module.logger, 'isEnabledFor', return_value=False), \
+            mock.patch.object(database_module.logger, 'debug') as debug:
+        connection._debug_print(sql='SELECT 1', res=Unformattable(), args={'id': Unformattable()})
+
+    debug.assert_not_called()
+
+
+@pytest.mark.parametrize('log_result_body, expected', [
+    (True, '"aaaaa... <truncated 7 chars>'),
+    (False, 'Result body logging disabled'),
+])
+def test_debug_print_caps_the_result_body(log_result_body, expected):
+    connection = FakeDatabaseConnection()
+    with mock.patch.object(database_module.logger, 'isEnabledFor', return_value=True), \
+            mock.patch.object(database_module.logger, 'debug') as debug, \
+            mock.patch.multiple(database_module.DatabaseConfig, log_result_body=log_result_body,
+                                log_result_max_chars=6):
+        connection._debug_print(sql='SELECT  *\n FROM t', res='a' * 11, wall_ms=1.5)
+
+    message = debug.call_args.args[0]
+    assert 'SELECT * FROM t' in message
+    assert 'elapsed: 1.500ms' in message
+    assert expected in message
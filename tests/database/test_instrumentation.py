@@ -0,0 +1,59 @@
+from unittest import mock
+
+import pytest
+
+from database import instrumentation
+from database.instrumentation import QueryStats, fingerprint
+
+
+@pytest.mark.parametrize('sql, expected', [
+    ("SELECT * FROM t WHERE id = 5", "SELECT * FROM t WHERE id = ?"),
+    ("SELECT *\n  FROM t   WHERE name = 'O''Brien'", "SELECT * FROM t WHERE name = ?"),
+    ("SELECT * FROM t WHERE id IN (1, 2, 3)", "SELECT * FROM t WHERE id IN (?+)"),
+    ("SELECT * FROM t WHERE id IN (1,2)", "SELECT * FROM t WHERE id IN (?+)"),
+    ("SELECT * FROM t2 WHERE score > 1.5", "SELECT * FROM t2 WHERE score > ?"),
+    ("SELECT * FROM t WHERE id = %(id)s", "SELECT * FROM t WHERE id = %(id)s"),
+])
+def test_fingerprint_folds_literals_and_whitespace(sql, expected):
+    assert fingerprint(sql) == expected
+
+
+def test_same_query_shape_shares_one_entry():
+    stats = QueryStats(slow_query_ms=0, max_fingerprints=10)
+    stats.record("SELECT * FROM t WHERE id = 1", 'select', wall_ms=3, rows=1)
+    stats.record("SELECT * FROM t WHERE id = 2", 'select', wall_ms=30, rows=1, pool_wait_ms=4)
+    stats.record("SELECT * FROM t WHERE id = 3", 'select', wall_ms=7, error=True)
+
+    [statement] = stats.snapshot()['statements']
+    assert statement['fingerprint'] == "SELECT * FROM t WHERE id = ?"
+    assert statement['calls'] == 3
+    assert statement['errors'] == 1
+    assert statement['rows'] == 2
+    assert statement['max_ms'] == 30
+    assert statement['avg_ms'] == pytest.approx(40 / 3, abs=0.001)
+    assert statement['avg_pool_wait_ms'] == pytest.approx(4 / 3, abs=0.001)
+    assert statement['histogram_ms']['le_1'] == 0
+    assert statement['histogram_ms']['le_5'] == 1
+    assert statement['histogram_ms']['le_10'] == 2
+    assert statement['histogram_ms']['le_50'] == 3
+    assert statement['histogram_ms']['le_inf'] == 3
+
+
+def test_statements_past_the_limit_fold_into_other():
+    stats = QueryStats(slow_query_ms=0, max_fingerprints=1)
+    stats.record("SELECT * FROM a", 'select', wall_ms=1)
+    stats.record("SELECT * FROM b", 'select', wall_ms=1)
+    stats.record("SELECT * FROM c", 'select', wall_ms=1)
+
+    statements = {statement['fingerprint']: statement['calls'] for statement in stats.snapshot()['statements']}
+    assert statements == {"SELECT * FROM a": 1, '<other>': 2}
+
+
+def test_slow_queries_are_logged_with_their_fingerprint():
+    stats = QueryStats(slow_query_ms=100, max_fingerprints=10)
+    with mock.patch.object(instrumentation.logger, 'warning') as warning:
+        stats.record("SELECT * FROM t WHERE id = 1", 'select', wall_ms=99)
+        stats.record("SELECT * FROM t WHERE id = 2", 'select', wall_ms=150)
+
+    warning.assert_called_once()
+    assert "SELECT * FROM t WHERE id = ?" in warning.call_args.args[0]
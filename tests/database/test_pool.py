@@ -0,0 +1,129 @@
+import itertools
+from unittest import mock
+
+import pytest
+
+from database import pool as pool_module
+from database.pool import ConnectionPool, PoolTimeoutError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeConnection:
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self._ids)
+        self.alive = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Disconnected(Exception):
+    pass
+
+
+def ping(connection: FakeConnection):
+    if not connection.alive:
+        raise Disconnected('server has gone away')
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with mock.patch.object(pool_module.time, 'monotonic', clock):
+        yield clock
+
+
+def make_pool(**kwargs) -> ConnectionPool:
+    options = dict(connect=FakeConnection, ping=ping, min_size=1, max_size=2, checkout_timeout=0.05,
+                   recycle=3600, ping_interval=30, disconnect_errors=(Disconnected,), name='test')
+    options.update(kwargs)
+    return ConnectionPool(**options)
+
+
+def test_connection_is_reused_across_checkouts(clock):
+    pool = make_pool()
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert pool.stats()['connects'] == 1
+
+
+def test_idle_connection_is_pinged_and_replaced_when_dead(clock):
+    pool = make_pool()
+    with pool.connection() as first:
+        pass
+
+    first.alive = False
+    clock.now += 29
+    with pool.connection() as connection:
+        assert connection is first  # not idle long enough to be pinged
+
+    clock.now += 31
+    with pool.connection() as connection:
+        assert connection is not first
+
+    assert first.closed
+    assert pool.stats()['discards'] == 1
+
+
+def test_connection_older_than_recycle_is_replaced(clock):
+    pool = make_pool(ping_interval=None, recycle=60)
+    with pool.connection() as first:
+        pass
+
+    clock.now += 61
+    with pool.connection() as connection:
+        assert connection is not first
+
+    assert first.closed
+    assert pool.stats()['connects'] == 2
+
+
+def test_connection_raising_a_disconnect_error_is_discarded(clock):
+    pool = make_pool()
+
+    with pytest.raises(Disconnected):
+        with pool.connection() as first:
+            raise Disconnected('lost connection')
+    with pool.connection() as connection:
+        assert connection is not first
+
+    assert first.closed
+
+
+def test_checkout_times_out_when_every_connection_is_in_use():
+    pool = make_pool(max_size=1, checkout_timeout=0.05)
+    held = pool.checkout()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.checkout()
+
+    pool.checkin(held)
+    assert pool.stats()['timeouts'] == 1
+    assert pool.stats()['in_use'] == 0
+
+
+def test_reset_after_fork_forgets_inherited_connections_without_closing_them(clock):
+    pool = make_pool(min_size=2)
+    inherited = list(pool._idle)
+
+    pool_module.reset_pools_after_fork()
+
+    assert pool.stats()['size'] == 0
+    assert not any(connection.raw.closed for connection in inherited)
+    with pool.connection() as connection:
+        assert connection not in [pooled.raw for pooled in inherited]
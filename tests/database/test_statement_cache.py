@@ -0,0 +1,43 @@
+import pytest
+
+from database.statement_cache import normalize_fields, render_statement, statement_cache_info
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    render_statement.cache_clear()
+
+
+def test_normalize_fields_accepts_a_string_or_an_iterable():
+    assert normalize_fields(None) == ()
+    assert normalize_fields('*') == ('*',)
+    assert normalize_fields(['id', 'team']) == ('id', 'team')
+
+
+def test_select_is_parameterized():
+    sql = render_statement('select', 'team_member_detail', ('id', 'team'), ('slack_user_id', 'team'), 'id', True)
+
+    assert sql == ("SELECT id, team FROM team_member_detail "
+                   "WHERE slack_user_id = %(slack_user_id)s AND team = %(team)s ORDER BY id DESC")
+
+
+def test_update_and_delete_are_parameterized():
+    assert render_statement('update', 'team_member_detail', ('team',), ('id',)) == \
+        "UPDATE team_member_detail SET team = %(team)s WHERE id = %(id)s "
+    assert render_statement('delete', 'team_member_detail', (), ('id',)) == \
+        "DELETE FROM team_member_detail WHERE id = %(id)s"
+
+
+def test_same_statement_is_rendered_once():
+    first = render_statement('select', 'team_member_detail', ('*',), ('slack_user_id',))
+    second = render_statement('select', 'team_member_detail', ('*',), ('slack_user_id',))
+    render_statement('select', 'team_member_detail', ('*',), ('team',))
+
+    assert first is second
+    info = statement_cache_info()
+    assert (info['hits'], info['misses'], info['size']) == (1, 2, 2)
+
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ValueError):
+        render_statement('truncate', 'team_member_detail', (), ())
@@ -0,0 +1,71 @@
+from unittest import mock
+
+import pytest
+
+from database.table_database import TeamDatabase
+from database.team_directory import NOT_INDEXED, TeamDirectoryCache
+
+MEMBERS = [
+    {'id': 1, 'team': 'SDET', 'name': 'Taurus', 'slack_user_id': 'U01ABC', 'gmail': 'Taurus@Example.com'},
+    {'id': 2, 'team': 'SDET', 'name': 'Leo', 'slack_user_id': 'U02DEF', 'gmail': 'leo@example.com'},
+    {'id': 3, 'team': 'QA', 'name': 'Aries', 'slack_user_id': 'U03GHI', 'gmail': None},
+]
+
+
+@pytest.fixture
+def loader():
+    return mock.Mock(return_value=[dict(member) for member in MEMBERS])
+
+
+@pytest.fixture
+def directory(loader):
+    return TeamDirectoryCache(loader=loader, ttl=300)
+
+
+def test_lookup_is_served_from_the_index_after_one_load(directory, loader):
+    assert directory.lookup({'slack_user_id': 'U02DEF'})['name'] == 'Leo'
+    assert directory.lookup({'team': 'SDET'}, fetchall=True, order_by='id', desc=False) == MEMBERS[:2]
+
+    loader.assert_called_once()
+
+
+@pytest.mark.parametrize('condition', [
+    {'gmail': 'taurus@example.com'},
+    {'gmail': 'TAURUS@EXAMPLE.COM '},
+    {'name': 'taurus', 'team': 'sdet'},
+    {'id': '1'},
+])
+def test_lookup_matches_case_insensitively_like_the_table_collation(directory, condition):
+    assert directory.lookup(condition)['id'] == 1
+
+
+def test_lookup_on_a_missing_value_is_none(directory):
+    assert directory.lookup({'slack_user_id': 'U99'}) is None
+    assert directory.lookup({'slack_user_id': 'U99'}, fetchall=True) == []
+
+
+def test_lookup_on_an_unindexed_column_is_not_indexed(directory, loader):
+    assert directory.lookup({'email_alias': 'leo'}) is NOT_INDEXED
+
+    loader.assert_not_called()
+
+
+def test_reload_failure_keeps_serving_the_previous_copy(directory, loader):
+    directory.lookup({'id': 1})
+    loader.side_effect = RuntimeError('db down')
+    directory.invalidate()
+
+    assert directory.lookup({'id': 2})['name'] == 'Leo'
+
+
+def test_team_database_falls_back_to_sql_when_the_cache_cannot_answer():
+    connection = mock.Mock()
+    connection.execute_select_sql.return_value = {'id': 7}
+    # TeamDatabase is a process-wide singleton, build a fresh one over a fake connection
+    with mock.patch.object(TeamDatabase, '_instance', None), \
+            mock.patch.object(TeamDatabase, '_connection', new_callable=mock.PropertyMock, return_value=connection):
+        database = TeamDatabase()
+        with mock.patch.object(database.team_directory, 'lookup', return_value=NOT_INDEXED):
+            assert database.get_team_member_detail(slack_user_id='U07') == {'id': 7}
+
+    connection.execute_select_sql.assert_called_once()
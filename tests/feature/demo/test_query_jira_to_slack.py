@@ -0,0 +1,45 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from feature.demo import query_jira_to_slack
+from feature.demo.query_jira_to_slack import demo_qjts_route
+
+
+@pytest.fixture
+def slack_bot():
+    # Pass the mocks in, patch() would otherwise probe the lazy proxies and build real clients
+    with mock.patch.object(query_jira_to_slack, 'slack_bot', new=mock.Mock()) as slack_bot:
+        slack_bot.enqueue_thread.side_effect = lambda channels, messages, delivery_id: delivery_id
+        yield slack_bot
+
+
+@pytest.fixture
+def client(slack_bot):
+    jira = mock.Mock()
+    jira.iter_jql.return_value = iter([{'Key': 'AGS-1'}])
+    jira.query_by_jql.return_value = [{'Key': 'AGS-1'}]
+    with mock.patch.object(query_jira_to_slack, 'atlassian_jira', new=jira):
+        app = Flask(__name__)
+        app.register_blueprint(demo_qjts_route)
+        yield app.test_client()
+
+
+def test_async_delivery_reports_the_queued_delivery_id(client, slack_bot):
+    response = client.post('/query_jira_to_slack', json={
+        'jql': 'project = AGS', 'slack_channel': 'C1', 'async_delivery': True,
+    })
+
+    delivery_id = response.headers['X-Slack-Delivery-ID']
+    assert slack_bot.enqueue_thread.call_args.kwargs['delivery_id'] == delivery_id
+
+
+def test_streamed_async_delivery_has_no_delivery_id_header(client, slack_bot):
+    response = client.post('/query_jira_to_slack', json={
+        'jql': 'project = AGS', 'slack_channel': 'C1', 'async_delivery': True, 'stream': 'ndjson',
+    })
+
+    assert 'X-Slack-Delivery-ID' not in response.headers
+    response.get_data()  # the digest is queued once the stream has been consumed
+    assert slack_bot.enqueue_thread.call_count == 1
@@ -0,0 +1,75 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from feature.example import get_google_sheet
+from feature.example.get_google_sheet import example_ggs_route
+from utility.constant import ResponseResult
+
+
+@pytest.fixture
+def google_sheet():
+    with mock.patch.object(get_google_sheet, 'google_sheet') as google_sheet:
+        google_sheet.get_values.return_value = {
+            'worksheet': 'Sheet1', 'revision': 'rev-1', 'cached': True, 'grid_rows': 10, 'values': [['a', 'b']],
+        }
+        yield google_sheet
+
+
+@pytest.fixture
+def client(google_sheet):
+    app = Flask(__name__)
+    app.register_blueprint(example_ggs_route)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('cell_range', ['A1', 'A1:D20', 'AB12:ZZ300'])
+def test_cell_ranges_are_read(client, google_sheet, cell_range):
+    response = client.get('/get_google_sheet', query_string={'range': cell_range})
+
+    assert response.status_code == 200
+    assert response.get_json()['ResultObject']['values'] == [['a', 'b']]
+    assert google_sheet.get_values.call_args.kwargs['cell_range'] == cell_range
+
+
+@pytest.mark.parametrize('cell_range', ['A:B', 'A', 'A1:B', 'A0:B2', 'A1;DROP'])
+def test_column_only_and_malformed_ranges_are_rejected(client, google_sheet, cell_range):
+    response = client.get('/get_google_sheet', query_string={'range': cell_range})
+
+    assert response.status_code == 200
+    assert response.get_json()['Result'] == ResponseResult.INVALID_PARAMETER.code
+    assert response.get_json()['Message'] == 'Invalid range parameter'
+    google_sheet.get_values.assert_not_called()
+
+
+def test_page_reads_one_row_window(client, google_sheet):
+    response = client.get('/get_google_sheet', query_string={'page': 2, 'page_size': 3})
+
+    assert response.status_code == 200
+    assert google_sheet.get_values.call_args.kwargs['row_offset'] == 3
+    assert google_sheet.get_values.call_args.kwargs['row_limit'] == 4
+    assert response.get_json()['ResultObject']['pagination']['page'] == 2
+
+
+def test_page_followed_by_data_has_more(client, google_sheet):
+    google_sheet.get_values.return_value['values'] = [['a'], ['b'], ['c'], ['d']]
+
+    response = client.get('/get_google_sheet', query_string={'page': 1, 'page_size': 3})
+
+    result = response.get_json()['ResultObject']
+    assert result['values'] == [['a'], ['b'], ['c']]
+    assert result['pagination']['has_more'] is True
+    assert result['pagination']['next_page'] == 2
+
+
+def test_empty_trailing_grid_rows_end_pagination(client, google_sheet):
+    # grid_rows is 10, but only three rows hold data
+    google_sheet.get_values.return_value['values'] = [['a'], ['b'], ['c']]
+
+    response = client.get('/get_google_sheet', query_string={'page': 1, 'page_size': 3})
+
+    result = response.get_json()['ResultObject']
+    assert result['values'] == [['a'], ['b'], ['c']]
+    assert result['pagination']['has_more'] is False
+    assert result['pagination']['next_page'] is None
@@ -0,0 +1,47 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from feature.slack_btn import btn_create_jira
+from feature.slack_btn.btn_create_jira import slack_btn_smsj_route
+from utility.constant import ResponseResult
+
+
+def _report(*oks):
+    results = [{'channel': f'C{index}', 'ok': ok, 'ts': '1.0' if ok else None, 'error': None if ok else 'boom'}
+               for index, ok in enumerate(oks)]
+    succeeded = sum(oks)
+    return {'total': len(oks), 'succeeded': succeeded, 'failed': len(oks) - succeeded, 'results': results}
+
+
+@pytest.fixture
+def slack_bot():
+    # Pass the mock in, patch() would otherwise probe the lazy proxy and build a real SlackBot
+    with mock.patch.object(btn_create_jira, 'slack_bot', new=mock.Mock()) as slack_bot:
+        yield slack_bot
+
+
+@pytest.fixture
+def client(slack_bot):
+    app = Flask(__name__)
+    app.register_blueprint(slack_btn_smsj_route)
+    return app.test_client()
+
+
+def test_sprint_ticket_reports_a_slack_error_when_every_channel_failed(client, slack_bot):
+    slack_bot.chat_post_message.return_value = _report(False, False)
+
+    body = client.post('/sprint_ticket', json={'slack_channel': ['C0', 'C1']}).get_json()
+
+    assert body['Result'] == ResponseResult.SLACK_API_ERROR.code
+    assert body['ResultObject']['failed'] == 2
+
+
+def test_sprint_ticket_succeeds_when_some_channels_were_reached(client, slack_bot):
+    slack_bot.chat_post_message.return_value = _report(True, False)
+
+    body = client.post('/sprint_ticket', json={'slack_channel': ['C0', 'C1']}).get_json()
+
+    assert body['Result'] == ResponseResult.SUCCESS.code
+    assert body['ResultObject']['succeeded'] == 1
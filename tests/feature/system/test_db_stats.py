@@ -0,0 +1,38 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from database.instrumentation import QueryStats
+from feature.system import db_stats
+from feature.system.db_stats import system_dbs_route
+
+
+@pytest.fixture
+def stats():
+    stats = QueryStats(slow_query_ms=0, max_fingerprints=10)
+    stats.record("SELECT * FROM t WHERE id = 1", 'select', wall_ms=2, rows=1)
+    with mock.patch.object(db_stats, 'query_stats', stats):
+        yield stats
+
+
+@pytest.fixture
+def client(stats):
+    app = Flask(__name__)
+    app.register_blueprint(system_dbs_route)
+    return app.test_client()
+
+
+def test_db_stats_reports_queries_pools_and_statement_cache(client):
+    result = client.get('/db/stats').get_json()['ResultObject']
+
+    assert result['queries']['statements'][0]['fingerprint'] == "SELECT * FROM t WHERE id = ?"
+    assert 'pools' in result
+    assert 'statement_cache' in result
+
+
+def test_reset_returns_the_stats_then_clears_them(client):
+    result = client.get('/db/stats', query_string={'reset': 'true'}).get_json()['ResultObject']
+
+    assert len(result['queries']['statements']) == 1
+    assert client.get('/db/stats').get_json()['ResultObject']['queries']['statements'] == []
@@ -0,0 +1,66 @@
+import time
+from unittest import mock
+
+import pytest
+from flask import Blueprint, Flask
+
+from feature.system import job_status
+from feature.system.job_status import system_js_route
+from utility.constant import ResponseResult
+from utility.job import JobManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JobManager(max_workers=1, max_pending=0, result_ttl=60, db_path=str(tmp_path / 'jobs.sqlite3'))
+    with mock.patch.object(job_status, 'job_manager', manager):
+        yield manager
+    manager._executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def client(manager):
+    report_route = Blueprint('report_route', __name__)
+
+    @report_route.route('/report', methods=['POST'])
+    def report():
+        return {'rows': 3}
+
+    manager.enable_async(report_route)
+    app = Flask(__name__)
+    app.register_blueprint(report_route)
+    app.register_blueprint(system_js_route)
+    return app.test_client()
+
+
+def test_async_request_is_accepted_and_its_result_can_be_polled(client):
+    response = client.post('/report', headers={'Prefer': 'respond-async'})
+
+    assert response.status_code == 202
+    location = response.headers['Location']
+    job_id = response.get_json()['ResultObject']['job_id']
+    assert location == f'/api/jobs/{job_id}'
+
+    deadline = time.monotonic() + 5
+    while True:
+        body = client.get(location.removeprefix('/api')).get_json()
+        if body['ResultObject']['status'] == 'succeeded' or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+
+    assert body['Result'] == ResponseResult.SUCCESS.code
+    assert body['ResultObject']['result'] == {'status_code': 200, 'body': {'rows': 3}}
+
+
+def test_synchronous_request_is_not_queued(client):
+    response = client.post('/report')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'rows': 3}
+
+
+def test_unknown_job_id_is_reported(client):
+    body = client.get('/jobs/missing').get_json()
+
+    assert body['Result'] == ResponseResult.INVALID_PARAMETER.code
+    assert body['Message'] == 'Unknown job_id'
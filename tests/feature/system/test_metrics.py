@@ -0,0 +1,29 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from feature.system import metrics as metrics_route
+from feature.system.metrics import PROMETHEUS_CONTENT_TYPE, system_mt_route
+from utility.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def client():
+    registry = MetricsRegistry(buckets=(0.1,))
+    registry.observe_upstream('jira', duration_ms=20)
+    with mock.patch.object(metrics_route, 'metrics', registry):
+        app = Flask(__name__)
+        app.register_blueprint(system_mt_route)
+        yield app.test_client()
+
+
+def test_metrics_endpoint_serves_the_prometheus_text_format(client):
+    response = client.get('/metrics')
+    body = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == PROMETHEUS_CONTENT_TYPE
+    assert 'ags_upstream_duration_seconds_count{upstream="jira"} 1' in body
+    assert '# TYPE ags_jql_result_cache_hits untyped' in body
+    assert '# TYPE ags_atlassian_client_pool_' in body
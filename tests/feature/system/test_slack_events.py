@@ -0,0 +1,70 @@
+import json
+import time
+from unittest import mock
+
+import pytest
+from flask import Flask
+from slack_sdk.signature import SignatureVerifier
+
+from configuration.account import SlackBotConfig
+from feature.system.slack_events import system_se_route
+from integration_tool.registry import integrations
+from integration_tool.slack.bolt_app import SlackBoltApp
+
+SIGNING_SECRET = 'test-signing-secret'
+
+
+@pytest.fixture
+def client():
+    bolt_app = SlackBoltApp(bot_token='xoxb-test', signing_secret=SIGNING_SECRET)
+    app = Flask(__name__)
+    app.register_blueprint(system_se_route)
+
+    with mock.patch.dict(integrations._integrations, {'slack_bolt_app': bolt_app}), \
+            mock.patch.object(SlackBotConfig, 'RECEIVER_MODE', 'http'):
+        yield app.test_client()
+
+
+def signed_headers(body: str, timestamp: int = None, secret: str = SIGNING_SECRET) -> dict:
+    timestamp = str(timestamp or int(time.time()))
+    return {
+        'Content-Type': 'application/json',
+        'X-Slack-Request-Timestamp': timestamp,
+        'X-Slack-Signature': SignatureVerifier(secret).generate_signature(timestamp=timestamp, body=body),
+    }
+
+
+URL_VERIFICATION = json.dumps({'type': 'url_verification', 'token': 'x', 'challenge': 'challenge-123'})
+
+
+def test_signed_request_is_dispatched_to_bolt(client):
+    response = client.post('/slack/events', data=URL_VERIFICATION, headers=signed_headers(URL_VERIFICATION))
+
+    assert response.status_code == 200
+    assert response.get_json() == {'challenge': 'challenge-123'}
+
+
+def test_request_signed_with_another_secret_is_rejected(client):
+    headers = signed_headers(URL_VERIFICATION, secret='someone-else')
+
+    assert client.post('/slack/events', data=URL_VERIFICATION, headers=headers).status_code == 401
+
+
+def test_replayed_request_with_an_old_timestamp_is_rejected(client):
+    headers = signed_headers(URL_VERIFICATION, timestamp=int(time.time()) - 600)
+
+    assert client.post('/slack/events', data=URL_VERIFICATION, headers=headers).status_code == 401
+
+
+def test_tampered_body_is_rejected(client):
+    headers = signed_headers(URL_VERIFICATION)
+    tampered = URL_VERIFICATION.replace('challenge-123', 'challenge-456')
+
+    assert client.post('/slack/events', data=tampered, headers=headers).status_code == 401
+
+
+def test_receiver_is_disabled_outside_http_mode(client):
+    with mock.patch.object(SlackBotConfig, 'RECEIVER_MODE', 'socket_mode'):
+        response = client.post('/slack/events', data=URL_VERIFICATION, headers=signed_headers(URL_VERIFICATION))
+
+    assert response.status_code == 404
@@ -0,0 +1,25 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from feature.system import slack_hub
+from feature.system.slack_hub import system_sh_route
+from utility.constant import ResponseResult
+
+
+@pytest.fixture
+def client():
+    hub = mock.Mock()
+    hub.stats.return_value = {'receiver_mode': 'socket_mode', 'socket_mode_connections': 1, 'listeners': {}}
+    with mock.patch.object(slack_hub, 'slack_event_hub', hub):
+        app = Flask(__name__)
+        app.register_blueprint(system_sh_route)
+        yield app.test_client()
+
+
+def test_slack_listeners_reports_the_hub_stats(client):
+    body = client.get('/slack/listeners').get_json()
+
+    assert body['Result'] == ResponseResult.SUCCESS.code
+    assert body['ResultObject']['socket_mode_connections'] == 1
@@ -0,0 +1,39 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from feature.system import trace_spans
+from feature.system.trace_spans import system_ts_route
+from utility.tracing import Tracer
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer(enabled=True, sample_rate=1.0, buffer_size=10)
+    for correlation_id in ('cid-1', 'cid-2', 'cid-1'):
+        tracer.end_span(tracer.start_span('handler', correlation_id=correlation_id))
+    with mock.patch.object(trace_spans, 'tracer', tracer):
+        yield tracer
+
+
+@pytest.fixture
+def client(tracer):
+    app = Flask(__name__)
+    app.register_blueprint(system_ts_route)
+    return app.test_client()
+
+
+def test_trace_spans_lists_recent_spans_and_the_log_pipeline(client):
+    result = client.get('/trace/spans').get_json()['ResultObject']
+
+    assert result['enabled'] is True
+    assert result['sample_rate'] == 1.0
+    assert len(result['spans']) == 3
+    assert 'async' in result['log_pipeline']
+
+
+def test_trace_spans_filters_by_correlation_id_and_limit(client):
+    result = client.get('/trace/spans', query_string={'correlation_id': 'cid-1', 'limit': 1}).get_json()
+
+    assert [span['correlation_id'] for span in result['ResultObject']['spans']] == ['cid-1']
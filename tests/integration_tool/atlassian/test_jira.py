@@ -0,0 +1,131 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from configuration.account import AtlassianConnectionConfig
+from integration_tool.atlassian.jira import AtlassianJira
+from integration_tool.atlassian.jql_cache import jql_result_cache
+
+
+class FakeJiraServer:
+    """ Serves `total` issues in startAt pages, recording every page request. """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.requests = []
+        self.threads = set()
+
+    def jql(self, jql, fields=None, start=0, limit=50):
+        self.requests.append(start)
+        self.threads.add(threading.current_thread().name)
+        issues = [
+            {'key': f'AGS-{index}', 'fields': {'summary': f'Ticket {index}'}}
+            for index in range(start, min(start + limit, self.total))
+        ]
+        return {'startAt': start, 'maxResults': limit, 'total': self.total, 'issues': issues}
+
+
+@pytest.fixture
+def jira_server():
+    server = FakeJiraServer(total=5)
+    with mock.patch.object(AtlassianJira, '_connection', return_value=server):
+        yield server
+
+
+def test_iter_jql_walks_every_page_in_order(jira_server):
+    tickets = list(AtlassianJira().iter_jql(jql='project = AGS', page_size=2))
+
+    assert [ticket['Key'] for ticket in tickets] == [f'AGS-{index}' for index in range(5)]
+    assert [ticket['RespId'] for ticket in tickets] == [1, 2, 3, 4, 5]
+    assert jira_server.requests == [0, 2, 4]
+
+
+def test_iter_jql_prefetches_on_a_background_thread(jira_server):
+    list(AtlassianJira().iter_jql(jql='project = AGS', page_size=2))
+
+    assert all(name.startswith('jql-prefetch') for name in jira_server.threads)
+
+
+def test_iter_jql_stops_at_max_results_without_fetching_further_pages(jira_server):
+    tickets = list(AtlassianJira().iter_jql(jql='project = AGS', max_results=3, page_size=2))
+
+    assert [ticket['Key'] for ticket in tickets] == ['AGS-0', 'AGS-1', 'AGS-2']
+    assert jira_server.requests == [0, 2]
+
+
+def test_iter_jql_follows_next_page_token_on_enhanced_search():
+    pages = {
+        None: {'issues': [{'key': 'AGS-1', 'fields': {}}], 'nextPageToken': 'page-2'},
+        'page-2': {'issues': [{'key': 'AGS-2', 'fields': {}}], 'isLast': True},
+    }
+    server = mock.Mock()
+    server.resource_url.return_value = 'search/jql'
+    server.get.side_effect = lambda url, params: pages[params.get('nextPageToken')]
+
+    with mock.patch.object(AtlassianJira, '_connection', return_value=server), \
+            mock.patch.object(AtlassianConnectionConfig, 'JQL_ENHANCED_SEARCH', True):
+        tickets = list(AtlassianJira().iter_jql(jql='project = AGS', page_size=1))
+
+    assert [ticket['Key'] for ticket in tickets] == ['AGS-1', 'AGS-2']
+    assert server.get.call_count == 2
+
+
+def test_query_by_jql_reads_through_the_cache(jira_server):
+    jql_result_cache.invalidate()
+    jira = AtlassianJira()
+
+    first = jira.query_by_jql(jql='project = AGS')
+    second = jira.query_by_jql(jql='project  =  AGS')
+    assert first == second
+    assert jira_server.requests == [0]
+
+    jira.query_by_jql(jql='project = AGS', bypass_cache=True)
+    assert jira_server.requests == [0, 0]
+
+
+def test_jql_fields_projects_top_level_fields_of_the_spec_and_extras():
+    fields = AtlassianJira.jql_fields(extra_fields=['reporter.displayName'])
+
+    assert fields == sorted(set(fields))
+    assert {'summary', 'status', 'assignee', 'customfield_10088', 'reporter'} <= set(fields)
+    assert 'reporter.displayName' not in fields
+
+
+@pytest.mark.parametrize('assignee, expected_account, expected_email', [
+    (None, None, None),
+    ({'displayName': 'Hidden Email'}, '', ''),
+    ({'emailAddress': 'taurus@example.com'}, 'taurus', 'taurus@example.com'),
+])
+def test_query_by_jql_resp_keeps_the_baseline_user_values(assignee, expected_account, expected_email):
+    ticket = {'key': 'AGS-1', 'fields': {'assignee': assignee, 'status': {'name': 'Done'}}}
+
+    ticket_dict = AtlassianJira._query_by_jql_resp(ticket=ticket, resp_id=1)
+
+    assert ticket_dict['Assignee'] == expected_account
+    assert ticket_dict['AssigneeEmail'] == expected_email
+    assert ticket_dict['Status'] == 'Done'
+
+
+def test_query_by_jql_resp_adds_extra_field_paths():
+    ticket = {'key': 'AGS-1', 'fields': {
+        'reporter': {'displayName': 'Taurus'},
+        'fixVersions': [{'name': '1.0'}, {'name': '1.1'}],
+    }}
+
+    ticket_dict = AtlassianJira._query_by_jql_resp(
+        ticket=ticket, resp_id=1, extra_fields=('reporter.displayName', 'fixVersions.name')
+    )
+
+    assert ticket_dict['reporter.displayName'] == 'Taurus'
+    assert ticket_dict['fixVersions.name'] == ['1.0', '1.1']
+
+
+@pytest.mark.parametrize('extra_field', ['Status', 'Key', 'URL'])
+def test_extra_fields_may_not_overwrite_built_in_ticket_keys(jira_server, extra_field):
+    with pytest.raises(ValueError, match=extra_field):
+        AtlassianJira.jql_fields(extra_fields=[extra_field])
+    with pytest.raises(ValueError):
+        AtlassianJira().query_by_jql(jql='project = AGS', extra_fields=[extra_field], bypass_cache=True)
+
+    assert jira_server.requests == []
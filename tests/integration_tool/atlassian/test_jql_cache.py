@@ -0,0 +1,200 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from integration_tool.atlassian import jql_cache
+from integration_tool.atlassian.jql_cache import JqlResultCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with mock.patch.object(jql_cache.time, 'monotonic', clock):
+        yield clock
+
+
+def wait_for_refreshes(cache: JqlResultCache):
+    """ The refresh pool has a single worker, so a no-op queued behind the refresh runs after it. """
+    cache._executor.submit(lambda: None).result(timeout=5)
+
+
+@pytest.fixture
+def cache(clock):
+    cache = JqlResultCache(max_size=2, ttl=60, stale_ttl=300, refresh_workers=1)
+    yield cache
+    cache._executor.shutdown(wait=True)
+
+
+def test_make_key_normalizes_whitespace_and_field_order():
+    assert JqlResultCache.make_key('project = AGS\n  AND status = Done', fields=['b', 'a'], max_results=10) == \
+        JqlResultCache.make_key('project = AGS AND status = Done', fields=['a', 'b', 'a'], max_results=10)
+    assert JqlResultCache.make_key('project = AGS', max_results=10) != \
+        JqlResultCache.make_key('project = AGS', max_results=20)
+
+
+def test_fresh_entry_is_served_from_cache(cache, clock):
+    loader = mock.Mock(return_value=['AGS-1'])
+
+    assert cache.get_or_load('key', loader) == ['AGS-1']
+    clock.now += 59
+    assert cache.get_or_load('key', loader) == ['AGS-1']
+
+    assert loader.call_count == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_stale_entry_is_served_while_one_background_refresh_runs(cache, clock):
+    cache.get_or_load('key', lambda: ['old'])
+    clock.now += 61
+
+    refresh_started = threading.Event()
+    release_refresh = threading.Event()
+    refresh_calls = []
+
+    def refresh():
+        refresh_calls.append(1)
+        refresh_started.set()
+        release_refresh.wait(5)
+        return ['new']
+
+    assert cache.get_or_load('key', refresh) == ['old']
+    assert refresh_started.wait(5)
+    assert cache.get_or_load('key', refresh) == ['old']  # refresh in flight, not started twice
+
+    release_refresh.set()
+    wait_for_refreshes(cache)
+
+    assert refresh_calls == [1]
+    assert cache.get_or_load('key', refresh) == ['new']
+    assert cache.stats()['stale_hits'] == 2
+    assert cache.stats()['refreshes'] == 1
+
+
+def test_failed_refresh_keeps_the_stale_entry(cache, clock):
+    cache.get_or_load('key', lambda: ['old'])
+    clock.now += 61
+
+    assert cache.get_or_load('key', mock.Mock(side_effect=RuntimeError('jira down'))) == ['old']
+    wait_for_refreshes(cache)
+
+    assert cache.stats()['refresh_errors'] == 1
+    assert cache.get_or_load('key', lambda: ['new']) == ['old']  # still stale, retried in the background
+    wait_for_refreshes(cache)
+    assert cache.get_or_load('key', mock.Mock(side_effect=AssertionError('not called'))) == ['new']
+
+
+def test_entry_past_the_stale_window_is_loaded_synchronously(cache, clock):
+    cache.get_or_load('key', lambda: ['old'])
+    clock.now += 361
+
+    assert cache.get_or_load('key', lambda: ['new']) == ['new']
+    assert cache.stats()['misses'] == 2
+
+
+def test_bypass_always_loads_and_refreshes_the_entry(cache):
+    cache.get_or_load('key', lambda: ['old'])
+
+    assert cache.get_or_load('key', lambda: ['new'], bypass=True) == ['new']
+    assert cache.get_or_load('key', mock.Mock(side_effect=AssertionError('not called'))) == ['new']
+    assert cache.stats()['bypasses'] == 1
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.get_or_load('a', lambda: 'a')
+    cache.get_or_load('b', lambda: 'b')
+    cache.get_or_load('a', lambda: 'a')
+    cache.get_or_load('c', lambda: 'c')
+
+    loader = mock.Mock(return_value='b again')
+    assert cache.get_or_load('b', loader) == 'b again'
+    assert cache.stats()['evictions'] == 2
+
+
+def test_callers_get_copies_of_the_cached_tickets(cache):
+    loaded = cache.get_or_load('k', lambda: [{'Key': 'AGS-1'}])
+    loaded[0]['Key'] = 'changed'
+
+    hit = cache.get_or_load('k', lambda: pytest.fail('should be cached'))
+    hit[0]['Key'] = 'changed again'
+
+    assert cache.get_or_load('k', lambda: pytest.fail('should be cached')) == [{'Key': 'AGS-1'}]
+
+
+def test_concurrent_misses_run_one_load_per_key(cache):
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(timeout=5)
+        return ['value']
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('k', loader))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()['coalesced'] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == [1]
+    assert results == [['value']] * 4
+
+
+def test_waiting_caller_loads_itself_when_the_leader_fails(cache):
+    started, release = threading.Event(), threading.Event()
+
+    def failing_loader():
+        started.set()
+        release.wait(timeout=5)
+        raise RuntimeError('jira down')
+
+    errors = []
+
+    def lead():
+        try:
+            cache.get_or_load('k', failing_loader)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(timeout=5)
+
+    results = []
+    follower = threading.Thread(target=lambda: results.append(cache.get_or_load('k', lambda: ['value'])))
+    follower.start()
+    while cache.stats()['coalesced'] < 1:
+        time.sleep(0.01)
+    release.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert len(errors) == 1
+    assert results == [['value']]
+
+
+def test_reset_after_fork_keeps_entries_with_a_new_refresh_pool(cache, clock):
+    cache.get_or_load('k', lambda: ['v1'])
+    parent_executor = cache._executor
+
+    cache.reset_after_fork()
+    parent_executor.shutdown(wait=True)
+    clock.now += 61  # stale, refreshed on the new pool
+
+    assert cache.get_or_load('k', lambda: ['v2']) == ['v1']
+    wait_for_refreshes(cache)
+    assert cache.get_or_load('k', lambda: pytest.fail('should be cached')) == ['v2']
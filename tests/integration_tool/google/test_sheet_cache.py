@@ -0,0 +1,109 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from integration_tool.google import sheet_cache
+from integration_tool.google.sheet_cache import SheetSnapshotCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with mock.patch.object(sheet_cache.time, 'monotonic', clock):
+        yield clock
+
+
+@pytest.fixture
+def cache(clock):
+    return SheetSnapshotCache(max_entries=2, check_interval=30)
+
+
+def test_revision_is_checked_at_most_once_per_interval(cache, clock):
+    fetch_revision = mock.Mock(side_effect=['rev-1', 'rev-2'])
+
+    assert cache.revision('sheet', fetch_revision) == 'rev-1'
+    clock.now += 29
+    assert cache.revision('sheet', fetch_revision) == 'rev-1'
+    clock.now += 2
+    assert cache.revision('sheet', fetch_revision) == 'rev-2'
+    assert cache.stats()['revision_checks'] == 2
+
+
+def test_bypass_checks_the_revision_right_away(cache):
+    fetch_revision = mock.Mock(side_effect=['rev-1', 'rev-2'])
+
+    cache.revision('sheet', fetch_revision)
+    assert cache.revision('sheet', fetch_revision, bypass=True) == 'rev-2'
+
+
+def test_snapshot_is_served_until_the_revision_changes(cache):
+    key = ('sheet', None, None, None, None)
+    loader = mock.Mock(side_effect=[['v1'], ['v2']])
+
+    assert cache.get(key, 'rev-1', loader) == (['v1'], False)
+    assert cache.get(key, 'rev-1', loader) == (['v1'], True)
+    assert cache.get(key, 'rev-2', loader) == (['v2'], False)
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_bypass_reloads_and_stores_the_snapshot(cache):
+    key = ('sheet', None, None, None, None)
+    cache.get(key, 'rev-1', lambda: ['old'])
+
+    assert cache.get(key, 'rev-1', lambda: ['new'], bypass=True) == (['new'], False)
+    assert cache.get(key, 'rev-1', mock.Mock(side_effect=AssertionError('not called'))) == (['new'], True)
+
+
+def test_concurrent_misses_for_one_key_load_once():
+    cache = SheetSnapshotCache(max_entries=2, check_interval=30)
+    key = ('sheet', None, None, None, None)
+    loading = threading.Event()
+    release = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        loading.set()
+        release.wait(5)
+        return ['values']
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(key, 'rev-1', loader))) for _ in range(4)]
+    threads[0].start()
+    assert loading.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert loads == [1]
+    assert sorted(from_cache for _, from_cache in results) == [False, True, True, True]
+
+
+def test_load_locks_stay_bounded_however_many_keys_are_read(cache):
+    for index in range(500):
+        cache.get(('sheet', f'tab-{index}', None, None, None), 'rev-1', lambda: [], bypass=index % 2 == 0)
+
+    assert len(cache._load_locks) == sheet_cache._LOAD_LOCK_STRIPES
+    assert cache.stats()['entries'] == 2
+
+
+def test_invalidate_drops_only_the_given_spreadsheet(cache):
+    cache.get(('sheet-a', None, None, None, None), 'rev-1', lambda: ['a'])
+    cache.get(('sheet-b', None, None, None, None), 'rev-1', lambda: ['b'])
+
+    cache.invalidate('sheet-a')
+
+    assert cache.get(('sheet-a', None, None, None, None), 'rev-1', lambda: ['a2']) == (['a2'], False)
+    assert cache.get(('sheet-b', None, None, None, None), 'rev-1', lambda: ['b2']) == (['b'], True)
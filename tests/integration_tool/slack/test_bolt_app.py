@@ -0,0 +1,45 @@
+import fcntl
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+from integration_tool.slack import bolt_app
+
+
+class FakeSocketModeApp:
+    def __init__(self):
+        self.started = threading.Event()
+
+    def start(self, defer: bool = True):
+        assert defer is False
+        self.started.set()
+
+
+@pytest.fixture
+def deferred_app():
+    app = FakeSocketModeApp()
+    with mock.patch.object(bolt_app, '_deferred_socket_mode_apps', [app]):
+        yield app
+
+
+def test_standby_worker_opens_socket_mode_once_the_owner_releases_the_lock(tmp_path, deferred_app):
+    lock_path = str(tmp_path / 'locks' / 'socket_mode.lock')
+    os.makedirs(os.path.dirname(lock_path))
+    owner_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT)
+    fcntl.flock(owner_fd, fcntl.LOCK_EX)  # Another worker owns the connection
+
+    bolt_app.elect_socket_mode_worker(lock_path=lock_path)
+    assert not deferred_app.started.wait(0.2)
+
+    os.close(owner_fd)  # The owner exits
+    assert deferred_app.started.wait(5)
+
+
+def test_election_is_skipped_without_deferred_apps(tmp_path):
+    lock_path = str(tmp_path / 'socket_mode.lock')
+    with mock.patch.object(bolt_app, '_deferred_socket_mode_apps', []):
+        bolt_app.elect_socket_mode_worker(lock_path=lock_path)
+
+    assert not os.path.exists(lock_path)
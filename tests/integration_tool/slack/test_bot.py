@@ -0,0 +1,65 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from integration_tool.slack.bot import SlackBot, normalize_channels
+
+
+@pytest.fixture
+def slack_bot():
+    bot = SlackBot(token='xoxb-test')
+    bot.client = mock.Mock()
+    return bot
+
+
+def test_normalize_channels_drops_blanks_and_duplicates_in_order():
+    assert normalize_channels(' C1 ') == ['C1']
+    assert normalize_channels(['C2', '', None, 'C1', 'C2', '  ']) == ['C2', 'C1']
+    assert normalize_channels(None) == []
+
+
+def test_chat_post_message_reports_every_channel(slack_bot):
+    def post(channel, **payload):
+        if channel == 'C-missing':
+            raise RuntimeError('channel_not_found')
+        return {'ts': f'{channel}.1'}
+
+    slack_bot.client.chat_postMessage.side_effect = post
+
+    report = slack_bot.chat_post_message(channels=['C1', 'C-missing', 'C2', 'C1'], message='hello')
+
+    assert (report['total'], report['succeeded'], report['failed']) == (3, 2, 1)
+    assert report['results'] == [
+        {'channel': 'C1', 'ok': True, 'ts': 'C1.1', 'error': None},
+        {'channel': 'C-missing', 'ok': False, 'ts': None, 'error': 'channel_not_found'},
+        {'channel': 'C2', 'ok': True, 'ts': 'C2.1', 'error': None},
+    ]
+    slack_bot.client.chat_postMessage.assert_any_call(channel='C2', text='hello')
+
+
+def test_channels_are_sent_concurrently(slack_bot):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def post(channel, **payload):
+        barrier.wait()  # only passes once all three channels are in flight together
+        return {'ts': '1'}
+
+    slack_bot.client.chat_postMessage.side_effect = post
+
+    report = slack_bot.chat_post_message(channels=['C1', 'C2', 'C3'], message='hello')
+
+    assert report['succeeded'] == 3
+
+
+def test_chat_post_thread_keeps_replies_in_order_under_the_first_message(slack_bot):
+    slack_bot.client.chat_postMessage.return_value = {'ts': '100.1'}
+
+    report = slack_bot.chat_post_thread(channels='C1', messages=[{'text': '1'}, {'text': '2'}, {'text': '3'}])
+
+    assert report['succeeded'] == 1
+    assert slack_bot.client.chat_postMessage.call_args_list == [
+        mock.call(channel='C1', text='1'),
+        mock.call(channel='C1', thread_ts='100.1', text='2'),
+        mock.call(channel='C1', thread_ts='100.1', text='3'),
+    ]
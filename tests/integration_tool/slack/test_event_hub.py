@@ -0,0 +1,230 @@
+import inspect
+import threading
+from collections import deque
+from unittest import mock
+
+import pytest
+
+from configuration.account import SlackBotConfig
+from integration_tool.registry import integrations
+from integration_tool.slack.event_hub import IdempotencyCache, SlackEventHub, SqliteIdempotencyCache
+
+
+class FakeBoltApp:
+    """ Captures what the hub registers, the way Bolt's app.action(key)(listener) does. """
+
+    def __init__(self):
+        self.listeners = {}
+
+    def __getattr__(self, kind):
+        def _decorator(key):
+            def _register(listener):
+                self.listeners[(kind, key)] = listener
+                return listener
+            return _register
+        return _decorator
+
+
+@pytest.fixture
+def bolt_app():
+    app = FakeBoltApp()
+    with mock.patch.dict(integrations._integrations, {'slack_bolt_app': mock.Mock(app=app)}):
+        yield app
+
+
+@pytest.fixture
+def hub(bolt_app):
+    with mock.patch.object(SlackBotConfig, 'LISTENER_IDEMPOTENCY_PATH', ''):
+        hub = SlackEventHub(max_workers=4, max_pending=1, default_max_concurrency=1)
+    yield hub
+    hub._executor.shutdown(wait=True)
+
+
+def action_body(action_ts: str) -> dict:
+    return {'trigger_id': f'trigger-{action_ts}', 'actions': [{'action_id': 'sprint_ticket', 'action_ts': action_ts}]}
+
+
+def test_unknown_listener_kind_is_rejected(hub):
+    with pytest.raises(ValueError):
+        hub.register('reaction', 'thumbsup', lambda body: None)
+
+
+def test_listener_is_registered_once_per_name(hub, bolt_app):
+    first, second = mock.Mock(), mock.Mock()
+
+    assert hub.register('action', 'sprint_ticket', first, name='btn') is first
+    assert hub.register('action', 'sprint_ticket', second, name='btn') is first
+    assert list(hub.stats()['listeners']) == ['btn']
+
+
+def test_handler_errors_are_counted_and_timed(hub, bolt_app):
+    done = threading.Event()
+
+    def handler(body):
+        done.set()
+        raise RuntimeError('jira down')
+
+    hub.register('action', 'sprint_ticket', handler)
+    bolt_app.listeners[('action', 'sprint_ticket')](ack=mock.Mock(), body=action_body('1.1'))
+    assert done.wait(5)
+    # Drain the pool so the handler's bookkeeping has finished on whichever worker ran it
+    hub._executor.shutdown(wait=True)
+
+    stats = hub.stats()['listeners']['action:sprint_ticket']
+    assert (stats['dispatched'], stats['errors']) == (1, 1)
+    assert stats['avg_ms'] is not None and stats['last_dispatched_at'] is not None
+
+
+@pytest.mark.parametrize('receiver_mode, register, started', [
+    ('socket_mode', True, True),
+    ('socket_mode', False, False),
+    ('http', True, False),
+])
+def test_start_opens_socket_mode_only_for_registered_listeners(hub, bolt_app, receiver_mode, register, started):
+    if register:
+        hub.register('action', 'sprint_ticket', lambda body: None)
+
+    hub.start(receiver_mode=receiver_mode)
+
+    assert integrations.slack_bolt_app.start.called is started
+
+
+def test_start_failure_keeps_the_process_serving(hub, bolt_app):
+    hub.register('action', 'sprint_ticket', lambda body: None)
+    integrations.slack_bolt_app.start.side_effect = ValueError('App token is required for Socket Mode')
+
+    hub.start(receiver_mode='socket_mode')  # logged, not raised
+
+
+def test_listener_signature_adds_ack_and_body_to_the_handler_args(hub, bolt_app):
+    def handler(ack, say, body):
+        pass
+
+    hub.register('action', 'sprint_ticket', handler)
+    listener = bolt_app.listeners[('action', 'sprint_ticket')]
+
+    assert list(inspect.signature(listener).parameters) == ['ack', 'say', 'body']
+    assert not hasattr(listener, '__wrapped__')
+
+
+def test_delivery_is_acked_before_the_handler_runs_on_the_pool(hub, bolt_app):
+    release = threading.Event()
+    handled = threading.Event()
+    handler_threads = []
+
+    def handler(ack, body):
+        ack()  # already acked by the hub, a no-op
+        release.wait(5)
+        handler_threads.append(threading.current_thread().name)
+        handled.set()
+
+    hub.register('action', 'sprint_ticket', handler)
+    ack = mock.Mock()
+
+    bolt_app.listeners[('action', 'sprint_ticket')](ack=ack, body=action_body('1.1'))
+
+    ack.assert_called_once_with()  # returned while the handler is still blocked
+    release.set()
+    assert handled.wait(5)
+    assert ack.call_count == 1
+    assert handler_threads[0].startswith('slack-listener')
+    assert hub.stats()['listeners']['action:sprint_ticket']['ack_avg_ms'] is not None
+
+
+def test_retried_delivery_is_acked_but_not_handled_again(hub, bolt_app):
+    handled = []
+    done = threading.Event()
+
+    def handler(body):
+        handled.append(body['actions'][0]['action_ts'])
+        done.set()
+
+    hub.register('action', 'sprint_ticket', handler)
+    listener = bolt_app.listeners[('action', 'sprint_ticket')]
+    retry_ack = mock.Mock()
+
+    listener(ack=mock.Mock(), body=action_body('1.1'))
+    assert done.wait(5)
+    listener(ack=retry_ack, body=action_body('1.1'))
+
+    retry_ack.assert_called_once_with()
+    assert handled == ['1.1']
+    assert hub.stats()['listeners']['action:sprint_ticket']['duplicates'] == 1
+
+
+def test_deliveries_over_max_concurrency_queue_then_get_rejected(hub, bolt_app):
+    release = threading.Event()
+    handled = []
+    all_done = threading.Event()
+
+    def handler(body):
+        release.wait(5)
+        handled.append(body['actions'][0]['action_ts'])
+        if len(handled) == 2:
+            all_done.set()
+
+    hub.register('action', 'sprint_ticket', handler)
+    listener = bolt_app.listeners[('action', 'sprint_ticket')]
+
+    for action_ts in ('1.1', '1.2', '1.3'):  # running, queued (max_pending=1), rejected
+        listener(ack=mock.Mock(), body=action_body(action_ts))
+    release.set()
+
+    assert all_done.wait(5)
+    assert handled == ['1.1', '1.2']
+    assert hub.stats()['listeners']['action:sprint_ticket']['rejected'] == 1
+
+
+def test_forked_worker_starts_with_empty_listener_queues(hub, bolt_app):
+    release = threading.Event()
+    hub.register('action', 'sprint_ticket', lambda body: release.wait(5))
+    listener = bolt_app.listeners[('action', 'sprint_ticket')]
+    for action_ts in ('1.1', '1.2'):  # running, queued
+        listener(ack=mock.Mock(), body=action_body(action_ts))
+    parent_executor = hub._executor
+
+    hub.reset_after_fork()
+    stats = hub.stats()
+    release.set()  # In a real fork the parent's handler threads don't exist in the child
+    parent_executor.shutdown(wait=True)
+
+    assert hub._executor is not parent_executor
+    assert stats['queue_depth'] == 0
+    assert hub._listeners['action:sprint_ticket']['queue'] == deque()
+    handled = threading.Event()
+    hub.register('action', 'other', lambda body: handled.set())
+    bolt_app.listeners[('action', 'other')](ack=mock.Mock(), body=action_body('2.1'))
+    assert handled.wait(5)
+
+
+def test_idempotency_cache_forgets_keys_after_the_ttl():
+    cache = IdempotencyCache(ttl=60, max_keys=10)
+
+    with mock.patch('integration_tool.slack.event_hub.time.monotonic', return_value=1000.0):
+        assert cache.seen('event:1') is False
+        assert cache.seen('event:1') is True
+    with mock.patch('integration_tool.slack.event_hub.time.monotonic', return_value=1061.0):
+        assert cache.seen('event:1') is False
+
+
+def test_sqlite_idempotency_is_shared_between_processes(tmp_path):
+    db_path = str(tmp_path / 'slack' / 'idempotency.sqlite3')
+    worker_1 = SqliteIdempotencyCache(db_path=db_path, ttl=60)
+    worker_2 = SqliteIdempotencyCache(db_path=db_path, ttl=60)
+
+    with mock.patch('integration_tool.slack.event_hub.time.time', return_value=1000.0):
+        assert worker_1.seen('event:1') is False
+        assert worker_2.seen('event:1') is True
+        assert worker_2.seen('event:2') is False
+    with mock.patch('integration_tool.slack.event_hub.time.time', return_value=1061.0):
+        assert worker_2.seen('event:1') is False  # expired, claimed again
+        assert worker_1.seen('event:1') is True
+
+
+def test_sqlite_idempotency_lets_deliveries_through_when_the_file_is_unusable(tmp_path):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    cache = SqliteIdempotencyCache(db_path=str(blocker / 'idempotency.sqlite3'))
+
+    assert cache.seen('event:1') is False
+    assert cache.seen('event:1') is False
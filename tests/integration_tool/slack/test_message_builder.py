@@ -0,0 +1,54 @@
+from integration_tool.slack.message_builder import SLACK_MAX_SECTION_TEXT, SlackDigestBuilder
+
+
+def section_texts(message: dict) -> list:
+    return [block['text']['text'] for block in message['blocks']]
+
+
+def test_short_digest_is_one_message_with_the_title_first():
+    messages = SlackDigestBuilder(title='*Tickets (2)*').build(['one', 'two'])
+
+    assert len(messages) == 1
+    assert messages[0]['text'] == '*Tickets (2)*'
+    assert section_texts(messages[0]) == ['*Tickets (2)*', 'one\n\ntwo']
+
+
+def test_entries_are_packed_into_sections_under_the_section_limit():
+    entries = ['x' * 1000 for _ in range(7)]
+
+    messages = SlackDigestBuilder(title='title').build(entries)
+
+    sections = [text for message in messages for text in section_texts(message)][1:]
+    assert all(len(text) <= SLACK_MAX_SECTION_TEXT for text in sections)
+    assert '\n\n'.join(sections).count('x') == 7000
+
+
+def test_digest_is_split_by_character_budget_and_keeps_every_entry_once():
+    entries = [f'entry-{index:03d} ' + 'y' * 200 for index in range(100)]
+
+    messages = SlackDigestBuilder(title='title', max_chars=2000).build(entries)
+
+    assert len(messages) > 1
+    assert [message['text'] for message in messages[:2]] == ['title', 'title (2)']
+    for message in messages:
+        assert sum(len(text) for text in section_texts(message)) <= 2000 + len('\n\n') * len(message['blocks'])
+
+    joined = '\n\n'.join(text for message in messages for text in section_texts(message))
+    assert [joined.count(f'entry-{index:03d} ') for index in range(100)] == [1] * 100
+
+
+def test_digest_is_split_by_block_budget():
+    entries = ['z' * 2500 for _ in range(10)]  # one entry per section
+
+    messages = SlackDigestBuilder(title='title', max_blocks=4, max_chars=40000).build(entries)
+
+    assert all(len(message['blocks']) <= 4 for message in messages)
+    assert sum(len(message['blocks']) for message in messages) == 11  # title + 10 entries
+
+
+def test_oversized_entry_is_truncated_to_one_section():
+    messages = SlackDigestBuilder(title='title').build(['w' * (SLACK_MAX_SECTION_TEXT + 500)])
+
+    text = section_texts(messages[-1])[-1]
+    assert len(text) == SLACK_MAX_SECTION_TEXT
+    assert text.endswith('…')
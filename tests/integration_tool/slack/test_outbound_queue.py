@@ -0,0 +1,158 @@
+from unittest import mock
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from integration_tool.slack import outbound_queue
+from integration_tool.slack.outbound_queue import SlackOutboundQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def slack_error(status_code: int, headers: dict = None) -> SlackApiError:
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    return SlackApiError(message=f'HTTP {status_code}', response=response)
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with mock.patch.object(outbound_queue.time, 'time', clock):
+        yield clock
+
+
+@pytest.fixture
+def client():
+    client = mock.Mock()
+    client.chat_postMessage.return_value = {'ts': '100.1'}
+    return client
+
+
+@pytest.fixture
+def queue(tmp_path, client, clock):
+    # Workers are not started, the tests drive claim / deliver themselves
+    return SlackOutboundQueue(client=client, db_path=str(tmp_path / 'queue.sqlite3'), workers=0, max_attempts=3,
+                              backoff_base=2, backoff_max=60, lease_timeout=120)
+
+
+def deliver_next(queue: SlackOutboundQueue):
+    row = queue._claim_next()
+    assert row is not None
+    queue._deliver(row)
+
+
+def channel_state(queue: SlackOutboundQueue, delivery_id: str) -> dict:
+    return queue.get_delivery(delivery_id)['channels'][0]
+
+
+def test_enqueue_rejects_an_empty_channel_list(queue):
+    with pytest.raises(ValueError):
+        queue.enqueue(channels=[], payloads=[{'text': 'hello'}])
+
+
+def test_delivery_is_sent_and_reported(queue, client):
+    delivery_id = queue.enqueue(channels=['C1', 'C2'], payloads=[{'text': 'hello'}])
+    assert queue.get_delivery(delivery_id)['status'] == 'pending'
+
+    deliver_next(queue)
+    deliver_next(queue)
+
+    delivery = queue.get_delivery(delivery_id)
+    assert delivery['status'] == 'sent'
+    assert [channel['sent'] for channel in delivery['channels']] == [1, 1]
+    assert client.chat_postMessage.call_count == 2
+    assert queue.get_delivery('unknown') is None
+
+
+def test_claimed_row_is_leased_until_the_lease_expires(queue, clock):
+    queue.enqueue(channels=['C1'], payloads=[{'text': 'hello'}])
+
+    assert queue._claim_next() is not None
+    assert queue._claim_next() is None  # leased by the first claim
+
+    clock.now += 121  # the claiming worker died without updating the row
+    row = queue._claim_next()
+    assert row is not None
+    assert row['attempts'] == 1
+
+
+def test_retry_resumes_the_series_from_sent_count(queue, client, clock):
+    delivery_id = queue.enqueue(channels=['C1'], payloads=[{'text': '1'}, {'text': '2'}, {'text': '3'}],
+                                thread_replies=True)
+    client.chat_postMessage.side_effect = [{'ts': '100.1'}, slack_error(503)]
+
+    deliver_next(queue)
+    state = channel_state(queue, delivery_id)
+    assert (state['status'], state['sent'], state['thread_ts']) == ('pending', 1, '100.1')
+
+    client.chat_postMessage.reset_mock(side_effect=True)
+    client.chat_postMessage.return_value = {'ts': '100.9'}
+    clock.now += 2  # first backoff is backoff_base seconds
+    deliver_next(queue)
+
+    assert client.chat_postMessage.call_args_list == [
+        mock.call(channel='C1', text='2', thread_ts='100.1'),
+        mock.call(channel='C1', text='3', thread_ts='100.1'),
+    ]
+    assert channel_state(queue, delivery_id)['status'] == 'sent'
+
+
+def test_rate_limit_waits_for_retry_after(queue, client, clock):
+    delivery_id = queue.enqueue(channels=['C1'], payloads=[{'text': 'hello'}])
+    client.chat_postMessage.side_effect = slack_error(429, {'Retry-After': '30'})
+
+    deliver_next(queue)
+
+    assert channel_state(queue, delivery_id)['status'] == 'pending'
+    clock.now += 29
+    assert queue._claim_next() is None
+    clock.now += 1
+    assert queue._claim_next() is not None
+
+
+@pytest.mark.parametrize('headers, delay', [
+    ({'retry-after': '30'}, 30),
+    ({'RETRY-AFTER': '30'}, 30),
+    ({'Retry-After': 'soon'}, 2),
+    ({}, 2),
+])
+def test_rate_limit_delay_reads_the_header_case_insensitively(queue, client, clock, headers, delay):
+    queue.enqueue(channels=['C1'], payloads=[{'text': 'hello'}])
+    client.chat_postMessage.side_effect = slack_error(429, headers)
+
+    deliver_next(queue)
+
+    clock.now += delay - 1
+    assert queue._claim_next() is None
+    clock.now += 1
+    assert queue._claim_next() is not None
+
+
+def test_non_retryable_slack_error_fails_right_away(queue, client):
+    delivery_id = queue.enqueue(channels=['C1'], payloads=[{'text': 'hello'}])
+    client.chat_postMessage.side_effect = slack_error(404)
+
+    deliver_next(queue)
+
+    state = channel_state(queue, delivery_id)
+    assert state['status'] == 'failed'
+    assert 'HTTP 404' in state['last_error']
+    assert queue.get_delivery(delivery_id)['status'] == 'failed'
+
+
+def test_server_errors_fail_after_max_attempts(queue, client, clock):
+    delivery_id = queue.enqueue(channels=['C1'], payloads=[{'text': 'hello'}])
+    client.chat_postMessage.side_effect = slack_error(500)
+
+    for _ in range(3):
+        deliver_next(queue)
+        clock.now += 60
+
+    assert channel_state(queue, delivery_id)['status'] == 'failed'
+    assert channel_state(queue, delivery_id)['attempts'] == 3
@@ -0,0 +1,62 @@
+from unittest import mock
+
+import pytest
+
+from integration_tool import registry as registry_module
+from integration_tool.registry import IntegrationRegistry
+
+
+def test_integration_is_built_once_on_first_use():
+    factory = mock.Mock(side_effect=lambda: mock.Mock(name='client'))
+    registry = IntegrationRegistry()
+    registry.register('jira', factory)
+
+    assert registry.stats()['jira']['initialized'] is False
+    first = registry.jira.query_by_jql  # attribute access goes to the built client
+    assert registry.jira.query_by_jql is first
+
+    assert factory.call_count == 1
+    assert registry.stats()['jira']['initialized'] is True
+
+
+def test_reset_after_fork_rebuilds_only_the_resettable_integrations():
+    registry = IntegrationRegistry()
+    jira_factory = mock.Mock(side_effect=lambda: mock.Mock())
+    bolt_factory = mock.Mock(side_effect=lambda: mock.Mock())
+    registry.register('jira', jira_factory)
+    registry.register('slack_bolt_app', bolt_factory, reset_on_fork=False)
+    jira_before, bolt_before = registry.jira.get(), registry.slack_bolt_app.get()
+
+    registry.reset_after_fork()
+
+    assert registry.jira.get() is not jira_before
+    assert registry.slack_bolt_app.get() is bolt_before
+    assert (jira_factory.call_count, bolt_factory.call_count) == (2, 1)
+
+
+def test_init_time_is_recorded_per_integration_and_in_total():
+    registry = IntegrationRegistry()
+    registry.register('jira', mock.Mock())
+    registry.register('slack_bot', mock.Mock())
+
+    with mock.patch.object(registry_module.time, 'perf_counter', side_effect=[10.0, 10.25]):
+        registry.jira.get()
+
+    assert registry.stats() == {
+        'jira': {'initialized': True, 'init_ms': 250.0},
+        'slack_bot': {'initialized': False, 'init_ms': None},
+    }
+    assert registry.total_init_ms() == 250.0
+
+
+def test_failed_factory_leaves_the_integration_uninitialized():
+    registry = IntegrationRegistry()
+    factory = mock.Mock(side_effect=[ValueError('no token'), mock.Mock()])
+    registry.register('slack_bot', factory)
+
+    with pytest.raises(ValueError):
+        registry.slack_bot.get()
+    assert registry.stats()['slack_bot']['initialized'] is False
+
+    registry.slack_bot.get()
+    assert registry.stats()['slack_bot']['initialized'] is True
@@ -0,0 +1,79 @@
+from unittest import mock
+
+import pytest
+
+import blueprint
+from integration_tool.registry import IntegrationRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = IntegrationRegistry()
+    registry.register('jira', mock.Mock())
+    registry.register('google_sheet', mock.Mock())
+    with mock.patch.object(blueprint, 'integrations', registry), \
+            mock.patch.object(blueprint, '_startup_report', []), \
+            mock.patch.object(blueprint, '_module_cache', {}):
+        yield registry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_integrations_built_during_import_count_as_the_module_init_cost():
+    clock = Clock()
+    registry = IntegrationRegistry()
+    registry.register('jira', lambda: setattr(clock, 'now', clock.now + 0.3) or mock.Mock())
+
+    def import_module(module_path):
+        clock.now += 0.2
+        registry.jira.get()  # a feature module touching its client at import time
+        return mock.Mock(name=module_path)
+
+    with mock.patch.object(blueprint, 'integrations', registry), \
+            mock.patch.object(blueprint, '_startup_report', []), \
+            mock.patch.object(blueprint, '_module_cache', {}), \
+            mock.patch('time.perf_counter', clock), \
+            mock.patch.object(blueprint.importlib, 'import_module', side_effect=import_module):
+        blueprint._import_module('feature.demo.eager')
+        report = list(blueprint._startup_report)
+
+    assert report == [{'module': 'feature.demo.eager', 'import_ms': 200.0, 'init_ms': 300.0}]
+
+
+def test_startup_report_lists_slowest_modules_and_pending_integrations(registry):
+    blueprint._startup_report.extend([
+        {'module': 'feature.fast', 'import_ms': 1.0, 'init_ms': 0.0},
+        {'module': 'feature.slow', 'import_ms': 5.0, 'init_ms': 40.0},
+    ])
+    registry.jira.get()
+
+    with mock.patch.object(blueprint.logger, 'info') as info:
+        blueprint._log_startup_report()
+
+    report = info.call_args.args[0]
+    assert report.startswith('Startup report, 2 feature modules in 46.0ms')
+    assert report.index('feature.slow') < report.index('feature.fast')
+    assert report.endswith('Lazy integrations not initialized yet: google_sheet')
+
+
+def test_slack_listeners_from_routes_json_are_added_to_the_hub():
+    module = mock.Mock(spec=['_handle_btn'])
+    listeners = [
+        {'type': 'action', 'id': 'sprint_ticket', 'handler': '_handle_btn', 'max_concurrency': 2},
+        {'type': 'action', 'id': 'missing', 'handler': '_not_defined'},
+    ]
+
+    with mock.patch.object(blueprint, 'slack_event_hub') as hub, mock.patch.object(blueprint.logger, 'error') as error:
+        blueprint._register_slack_listeners(module, 'feature.slack_btn.btn_create_jira', listeners)
+
+    hub.register.assert_called_once_with(
+        kind='action', key='sprint_ticket', handler=module._handle_btn,
+        name='feature.slack_btn.btn_create_jira:_handle_btn', max_concurrency=2
+    )
+    assert 'Invalid Slack listener configuration' in error.call_args.args[0]
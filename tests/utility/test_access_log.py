@@ -0,0 +1,94 @@
+from unittest import mock
+
+import pytest
+from flask import Blueprint, Flask
+
+from utility import access_log
+from utility.access_log import AccessLogger, _truncate_body
+
+
+@pytest.fixture
+def log():
+    with mock.patch.object(access_log, 'logger') as log:
+        yield log
+
+
+def make_client(access_logger: AccessLogger):
+    route = Blueprint('echo_route', __name__)
+
+    @route.route('/echo', methods=['POST'])
+    def echo():
+        return {'echo': 'x' * 50}
+
+    @route.route('/broken', methods=['GET'])
+    def broken():
+        return {'error': 'nope'}, 500
+
+    app = Flask(__name__)
+    app.register_blueprint(route)
+    access_logger.init_app(app)
+    return app.test_client()
+
+
+def make_access_logger(**kwargs) -> AccessLogger:
+    settings = dict(enabled=True, sample_rate=1.0, log_body=False, log_body_on_error=True, body_max_chars=10,
+                    header_allowlist=['Content-Type'], max_workers=1, max_pending=10)
+    settings.update(kwargs)
+    return AccessLogger(**settings)
+
+
+def drain(access_logger: AccessLogger):
+    """ The formatter pool has a single worker, so a no-op queued behind the writes runs after them. """
+    access_logger._executor.submit(lambda: None).result(timeout=5)
+
+
+def test_sampled_request_logs_one_summary_line(log):
+    access_logger = make_access_logger()
+    make_client(access_logger).post('/echo', json={'a': 1})
+    drain(access_logger)
+
+    [line] = [call.args[0] for call in log.info.call_args_list]
+    assert line.startswith('POST http://localhost/echo 200 OK')
+
+
+def test_unsampled_request_is_not_logged(log):
+    access_logger = make_access_logger(sample_rate=0.0)
+    make_client(access_logger).post('/echo', json={'a': 1})
+    drain(access_logger)
+
+    log.info.assert_not_called()
+
+
+def test_errors_are_always_logged_with_capped_bodies(log):
+    access_logger = make_access_logger(sample_rate=0.0)
+    make_client(access_logger).get('/broken')
+    drain(access_logger)
+
+    [line] = [call.args[0] for call in log.info.call_args_list]
+    assert '500 INTERNAL SERVER ERROR' in line
+    assert '{"error":"...<truncated' in line
+
+
+def test_route_settings_override_the_defaults(log):
+    access_logger = make_access_logger(sample_rate=0.0)
+    access_logger.configure_route('echo_route', {'sample_rate': 1.0, 'log_body': True})
+    make_client(access_logger).post('/echo', json={'a': 1})
+    drain(access_logger)
+
+    [line] = [call.args[0] for call in log.info.call_args_list]
+    assert '{"a": 1}' in line
+    assert 'Content-Type' in line
+
+
+def test_entries_past_max_pending_are_dropped(log):
+    access_logger = make_access_logger(max_pending=0)
+    make_client(access_logger).post('/echo', json={'a': 1})
+
+    assert access_logger.stats() == {'enabled': True, 'pending': 0, 'dropped': 1}
+    log.info.assert_not_called()
+
+
+def test_truncate_body_marks_the_cut():
+    assert _truncate_body(b'', 5) == 'None'
+    assert _truncate_body(b'hello', 5) == 'hello'
+    assert _truncate_body(b'hello world', 5) == 'hello...<truncated 6 bytes>'
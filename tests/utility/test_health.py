@@ -0,0 +1,89 @@
+import threading
+import time
+
+from utility.health import ReadinessChecker
+
+
+def test_probes_run_concurrently_with_a_timeout_each():
+    checker = ReadinessChecker(timeout=0.2, cache_ttl=30, max_workers=4)
+    checker.register('db', lambda: None)
+    checker.register('jira', lambda: time.sleep(1))
+    checker.register('google', lambda: None, critical=False)
+
+    result = checker.check()
+
+    assert result['ready'] is False
+    assert result['probes']['db']['ok'] is True
+    assert result['probes']['jira']['error'] == 'Timed out after 0.2s'
+
+
+def test_non_critical_failure_keeps_the_service_ready():
+    checker = ReadinessChecker(timeout=1, cache_ttl=30)
+    checker.register('google', lambda: 1 / 0, critical=False)
+
+    result = checker.check()
+
+    assert result['ready'] is True
+    assert result['probes']['google']['error'].startswith('ZeroDivisionError')
+
+
+def test_fresh_result_is_served_from_cache():
+    calls = []
+    checker = ReadinessChecker(timeout=1, cache_ttl=30)
+    checker.register('db', lambda: calls.append(1))
+
+    assert checker.check()['cached'] is False
+    assert checker.check()['cached'] is True
+    assert calls == [1]
+
+
+def test_stale_result_is_served_while_one_refresh_runs():
+    refresh_started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def probe():
+        calls.append(1)
+        if len(calls) > 1:
+            refresh_started.set()
+            release.wait(5)
+
+    checker = ReadinessChecker(timeout=5, cache_ttl=0)
+    checker.register('db', probe)
+    checker.check()
+
+    refresher = threading.Thread(target=checker.check)
+    refresher.start()
+    assert refresh_started.wait(5)
+
+    started = time.perf_counter()
+    result = checker.check()
+    assert time.perf_counter() - started < 0.5  # not queued behind the running refresh
+    assert (result['cached'], result['stale']) == (True, True)
+
+    release.set()
+    refresher.join(5)
+    assert len(calls) == 2
+
+
+def test_hung_probe_is_not_submitted_again_while_it_still_runs():
+    release = threading.Event()
+    calls = []
+
+    def hung_probe():
+        calls.append(1)
+        release.wait(5)
+
+    checker = ReadinessChecker(timeout=0.05, cache_ttl=0, max_workers=4)
+    checker.register('jira', hung_probe)
+
+    for _ in range(3):
+        assert checker.check()['probes']['jira']['error'] == 'Timed out after 0.05s'
+    assert calls == [1]
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while checker.check()['probes']['jira']['ok'] is not True and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert checker.check()['probes']['jira']['ok'] is True
+    assert len(calls) > 1
@@ -0,0 +1,71 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from utility import job
+from utility.job import JobManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JobManager(max_workers=1, max_pending=1, result_ttl=60, db_path=str(tmp_path / 'jobs.sqlite3'))
+    yield manager
+    manager._executor.shutdown(wait=True)
+
+
+def wait_for(manager: JobManager, job_id: str, status: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        record = manager.get(job_id)
+        if record['status'] == status:
+            return record
+        time.sleep(0.01)
+    pytest.fail(f'job {job_id} never reached {status}')
+
+
+def test_job_result_is_visible_to_every_worker_sharing_the_store(manager, tmp_path):
+    submitted = manager.submit(lambda: {'answer': 42}, name='demo')
+    other_worker = JobManager(db_path=manager.db_path)
+
+    assert submitted['status'] == 'queued'
+    record = wait_for(other_worker, submitted['job_id'], 'succeeded')
+    assert record['result'] == {'answer': 42}
+    assert record['queue_time_ms'] is not None and record['run_time_ms'] is not None
+    other_worker._executor.shutdown()
+
+
+def test_failed_job_records_the_error(manager):
+    submitted = manager.submit(lambda: 1 / 0, name='demo')
+
+    record = wait_for(manager, submitted['job_id'], 'failed')
+    assert 'division by zero' in record['error']
+
+
+def test_full_queue_rejects_new_jobs(manager):
+    release = threading.Event()
+    running = manager.submit(lambda: release.wait(timeout=5), name='running')
+    queued = manager.submit(lambda: None, name='queued')
+
+    assert manager.submit(lambda: None, name='rejected') is None
+    release.set()
+    wait_for(manager, queued['job_id'], 'succeeded')
+    assert manager.get(running['job_id'])['status'] == 'succeeded'
+
+
+def test_finished_jobs_expire_after_the_result_ttl(manager):
+    submitted = manager.submit(lambda: 'done', name='demo')
+    finished_at = wait_for(manager, submitted['job_id'], 'succeeded')['finished_at']
+
+    with mock.patch.object(job.time, 'time', return_value=finished_at + 61):
+        assert manager.get(submitted['job_id']) is None
+        manager.submit(lambda: None, name='purge')
+
+    with manager._connect() as connection:
+        job_ids = [row['job_id'] for row in connection.execute("SELECT job_id FROM async_job")]
+    assert submitted['job_id'] not in job_ids
+
+
+def test_unknown_job_is_none(manager):
+    assert manager.get('missing') is None
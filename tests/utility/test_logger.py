@@ -0,0 +1,78 @@
+import logging
+import queue
+import time
+from logging.handlers import QueueListener
+
+from utility.logger import BoundedQueueHandler, JsonLinesFormatter, Logger
+
+
+def make_record(msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord('AGSHub', logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_queue_handler_drops_and_counts_records_when_full():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(make_record('first'))
+    handler.handle(make_record('second'))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_queue_handler_merges_arguments_on_the_calling_thread():
+    handler = BoundedQueueHandler(queue.Queue())
+    payload = ['before']
+
+    handler.handle(make_record('value: %s', payload))
+    payload.append('after')
+
+    record = handler.queue.get_nowait()
+    assert record.msg == "value: ['before']"
+    assert record.args is None
+
+
+def test_json_lines_formatter_keeps_the_correlation_id_as_a_field():
+    record = make_record('hello %s', 'world')
+    record.correlation_id = 'cid-1'
+
+    line = JsonLinesFormatter().format(record)
+
+    assert '"message": "hello world"' in line
+    assert '"correlation_id": "cid-1"' in line
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_listener_restarts_on_a_fresh_queue_after_fork():
+    # A bare pipeline, the module logger defers to pytest's handlers and has no listener
+    pipeline = object.__new__(Logger)
+    pipeline._queue_size = 10
+    pipeline._queue_handler = BoundedQueueHandler(queue.Queue(maxsize=10))
+    output = CollectingHandler()
+    pipeline._listener = QueueListener(pipeline._queue_handler.queue, output)
+    pipeline.start_listener()
+    inherited_queue = pipeline._queue_handler.queue
+    pipeline._listener.stop()  # Only the forking thread survives in the child
+
+    pipeline._restart_listener_after_fork()
+    try:
+        assert pipeline._queue_handler.queue is not inherited_queue
+        assert pipeline._listener.queue is pipeline._queue_handler.queue
+        assert pipeline._listener._thread.is_alive()
+
+        pipeline._queue_handler.handle(make_record('logged from the child'))
+        deadline = time.monotonic() + 5
+        while not output.messages and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert output.messages == ['logged from the child']
+        assert pipeline.pipeline_stats()['dropped'] == 0
+    finally:
+        pipeline.stop_listener()
@@ -0,0 +1,85 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Blueprint, Flask
+
+from utility.metrics import MetricsRegistry, record_upstream, render_stats
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(buckets=(0.01, 0.1, 1.0))
+
+
+def test_request_histogram_is_cumulative_with_an_inf_bucket(registry):
+    for duration_ms in (5, 50, 500, 5000):
+        registry.observe_request(blueprint='demo', route='/x', method='GET', status=200, duration_ms=duration_ms)
+
+    lines = registry.render().splitlines()
+    labels = 'blueprint="demo",route="/x",method="GET"'
+    assert f'ags_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 1' in lines
+    assert f'ags_http_request_duration_seconds_bucket{{{labels},le="0.1"}} 2' in lines
+    assert f'ags_http_request_duration_seconds_bucket{{{labels},le="1.0"}} 3' in lines
+    assert f'ags_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in lines
+    assert f'ags_http_request_duration_seconds_sum{{{labels}}} 5.555000' in lines
+    assert f'ags_http_request_duration_seconds_count{{{labels}}} 4' in lines
+    assert f'ags_http_requests_total{{{labels},status="200"}} 4' in lines
+
+
+def test_label_values_are_escaped(registry):
+    registry.observe_upstream('say "hi"\\\n', duration_ms=1)
+
+    assert 'ags_upstream_duration_seconds_count{upstream="say \\"hi\\"\\\\\\n"} 1' in registry.render()
+
+
+def test_every_family_has_help_and_type_lines(registry):
+    body = registry.render()
+
+    for family, kind in (('ags_http_requests_total', 'counter'), ('ags_http_request_duration_seconds', 'histogram'),
+                         ('ags_upstream_duration_seconds', 'histogram')):
+        assert f'# HELP {family} ' in body
+        assert f'# TYPE {family} {kind}' in body
+    assert body.endswith('\n')
+
+
+def test_render_stats_keeps_only_numeric_values():
+    body = render_stats('ags_cache', {'hits': 3, 'ratio': 0.5, 'enabled': True, 'name': 'jql'}, 'Cache')
+
+    assert body.splitlines() == [
+        '# HELP ags_cache_hits Cache: hits.', '# TYPE ags_cache_hits untyped', 'ags_cache_hits 3',
+        '# HELP ags_cache_ratio Cache: ratio.', '# TYPE ags_cache_ratio untyped', 'ags_cache_ratio 0.5',
+    ]
+    assert render_stats('ags_cache', {'name': 'jql'}, 'Cache') == ''
+
+
+def test_server_timing_sums_upstream_calls_of_the_request(registry):
+    route = Blueprint('demo_route', __name__)
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    @route.route('/work')
+    def work():
+        record_upstream('jira', 10, registry=registry)
+        record_upstream('jira', 5, registry=registry)
+        # Calls made on a worker thread count when it runs in a copy of the request context
+        executor.submit(contextvars.copy_context().run, record_upstream, 'slack', 2, registry).result()
+        return 'ok'
+
+    app = Flask(__name__)
+    app.register_blueprint(route)
+    registry.init_app(app)
+
+    response = app.test_client().get('/work')
+    executor.shutdown()
+
+    parts = response.headers['Server-Timing'].split(', ')
+    assert parts[:2] == ['jira;dur=15.0;desc="2 calls"', 'slack;dur=2.0;desc="1 calls"']
+    assert parts[2].startswith('total;dur=')
+    assert 'ags_http_requests_total{blueprint="demo_route",route="/work",method="GET",status="200"} 1' \
+        in registry.render()
+
+
+def test_upstream_call_outside_a_request_only_feeds_the_histogram(registry):
+    record_upstream('db', 3, registry=registry)
+
+    assert 'ags_upstream_duration_seconds_count{upstream="db"} 1' in registry.render()
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from utility import tracing
+from utility.tracing import Tracer
+
+
+def trace_call(tracer: Tracer, name: str, *children: str):
+    handle = tracer.start_span(name, correlation_id='cid-1')
+    for child in children:
+        tracer.end_span(tracer.start_span(child, correlation_id='cid-1'))
+    tracer.end_span(handle)
+
+
+def test_nested_spans_are_recorded_under_their_root():
+    tracer = Tracer(enabled=True, sample_rate=1.0, buffer_size=10)
+    trace_call(tracer, 'root', 'child')
+
+    child, root = tracer.recent_spans()[::-1]
+    assert root['name'] == 'root' and root['parent_id'] is None and root['depth'] == 0
+    assert child['parent_id'] == root['span_id'] and child['depth'] == 1
+    assert root['duration_ms'] >= child['duration_ms'] >= 0
+
+
+def test_unsampled_root_drops_the_whole_trace():
+    tracer = Tracer(enabled=True, sample_rate=0.5, buffer_size=10)
+    with mock.patch.object(tracing.random, 'random', return_value=0.7):
+        trace_call(tracer, 'dropped', 'child', 'child')
+    with mock.patch.object(tracing.random, 'random', return_value=0.2):
+        trace_call(tracer, 'kept', 'child')
+
+    assert [span['name'] for span in tracer.recent_spans()] == ['kept', 'child']
+
+
+def test_sampling_decision_is_made_once_per_trace():
+    tracer = Tracer(enabled=True, sample_rate=0.5, buffer_size=10)
+    with mock.patch.object(tracing.random, 'random', return_value=0.2) as random:
+        trace_call(tracer, 'root', 'a', 'b')
+
+    assert random.call_count == 1
+    assert len(tracer.recent_spans()) == 3
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False, sample_rate=1.0, buffer_size=10)
+    assert tracer.start_span('root') is None
+    trace_call(tracer, 'root', 'child')
+
+    assert tracer.recent_spans() == []
+
+
+def test_failed_span_records_the_error():
+    tracer = Tracer(enabled=True, sample_rate=1.0, buffer_size=10)
+    tracer.end_span(tracer.start_span('root'), error=ValueError('bad input'))
+
+    assert tracer.recent_spans()[0]['error'] == 'ValueError: bad input'
+
+
+def test_ring_buffer_keeps_the_most_recent_spans():
+    tracer = Tracer(enabled=True, sample_rate=1.0, buffer_size=3)
+    for index in range(5):
+        trace_call(tracer, f'call-{index}')
+
+    assert [span['name'] for span in tracer.recent_spans()] == ['call-4', 'call-3', 'call-2']
+    assert [span['name'] for span in tracer.recent_spans(limit=1)] == ['call-4']
+
+
+def test_recent_spans_filters_by_correlation_id():
+    tracer = Tracer(enabled=True, sample_rate=1.0, buffer_size=10)
+    tracer.end_span(tracer.start_span('mine', correlation_id='cid-1'))
+    tracer.end_span(tracer.start_span('other', correlation_id='cid-2'))
+
+    assert [span['name'] for span in tracer.recent_spans(correlation_id='cid-2')] == ['other']
@@ -1,2 +1,6 @@
 from utility.logger import logger, log_class,  log_func, set_correlation_id, get_correlation_id
-from utility.spec import response_spec, log_response_spec
+from utility.spec import is_true, response_spec, stream_response_spec, log_response_spec
+from utility.job import job_manager
+from utility.access_log import access_logger
+from utility.health import get_build_info, readiness_checker
+from utility.metrics import metrics, record_upstream, render_stats, upstream_timer
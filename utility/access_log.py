@@ -0,0 +1,146 @@
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from flask import Flask, Response, g, request
+
+from configuration.base import AccessLogConfig
+from utility.logger import logger
+from utility.spec import log_response_spec
+
+
+def _truncate_body(data: Optional[bytes], max_chars: int) -> str:
+    if not data:
+        return "None"
+
+    text = data[:max_chars].decode('utf-8', errors='replace')
+    if len(data) > max_chars:
+        text += f"...<truncated {len(data) - max_chars} bytes>"
+    return text
+
+
+class AccessLogger:
+    """
+    Sampled access log for the Flask app.
+
+    Every request gets a sampling decision from its route settings (routes.json "access_log",
+    falling back to AccessLogConfig). Sampled requests log one summary line; bodies are only
+    logged when the route enables it or the response is an error. The request thread only
+    captures raw values; decoding, truncation and formatting run on a small executor.
+    """
+
+    def __init__(self, enabled: bool = AccessLogConfig.ENABLED, sample_rate: float = AccessLogConfig.SAMPLE_RATE,
+                 log_body: bool = AccessLogConfig.LOG_BODY, log_body_on_error: bool = AccessLogConfig.LOG_BODY_ON_ERROR,
+                 body_max_chars: int = AccessLogConfig.BODY_MAX_CHARS,
+                 header_allowlist: list = AccessLogConfig.HEADER_ALLOWLIST,
+                 max_workers: int = AccessLogConfig.FORMAT_WORKERS, max_pending: int = AccessLogConfig.MAX_PENDING):
+        self.enabled = enabled
+        self._defaults = {'sample_rate': sample_rate, 'log_body': log_body}
+        self._log_body_on_error = log_body_on_error
+        self._body_max_chars = body_max_chars
+        self._header_allowlist = header_allowlist
+        self._route_settings: Dict[str, Dict[str, Any]] = {}
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='access-log')
+        self._max_pending = max_pending
+        self._pending = 0
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def configure_route(self, blueprint_name: str, settings: Optional[dict]) -> None:
+        """ Override sample_rate / log_body for one blueprint. """
+        if settings:
+            self._route_settings[blueprint_name] = {**self._defaults, **settings}
+
+    def init_app(self, app: Flask) -> None:
+        app.after_request(self._after_request)
+
+    def _settings(self) -> Dict[str, Any]:
+        return self._route_settings.get(request.blueprint, self._defaults)
+
+    def _after_request(self, response: Response) -> Response:
+        if not self.enabled:
+            return response
+
+        try:
+            self._capture(response)
+        except Exception as e:
+            logger.error(f"Access log capture failed: {e}")
+        return response
+
+    def _capture(self, response: Response) -> None:
+        settings = self._settings()
+        is_error = response.status_code >= 400
+        if not is_error and random.random() >= settings['sample_rate']:
+            return
+
+        start_time = getattr(g, 'request_start_time', None)
+        entry = {
+            'method': request.method,
+            'url': request.url,
+            'correlation_id': getattr(g, 'correlation_id', 'N/A'),
+            'elapsed': round((time.perf_counter() - start_time) * 1000, 1) if start_time else 0,
+            'status': response.status,
+        }
+
+        if settings['log_body'] or (is_error and self._log_body_on_error):
+            # Raw bytes only, capped one past the limit so the formatter can mark truncation
+            limit = self._body_max_chars
+            entry['headers'] = {name: request.headers[name] for name in self._header_allowlist
+                                if name in request.headers}
+            entry['request_body'] = (request.get_data(cache=True), limit)
+            if response.is_streamed or response.direct_passthrough:
+                entry['response_body'] = "<streamed>"  # Reading it here would buffer the whole stream
+            else:
+                entry['response_body'] = (response.get_data(), limit)
+
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self._dropped += 1
+                return
+            self._pending += 1
+        # Run in a copy of the request context so the log records keep the correlation ID
+        self._executor.submit(contextvars.copy_context().run, self._write, entry)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        try:
+            if 'headers' not in entry:
+                logger.info(f"{entry['method']} {entry['url']} {entry['status']} {entry['elapsed']}ms")
+                return
+
+            bodies = {}
+            for key in ('request_body', 'response_body'):
+                value = entry[key]
+                bodies[key] = value if isinstance(value, str) else _truncate_body(*value)
+
+            logger.info(log_response_spec(
+                method=entry['method'],
+                url=entry['url'],
+                correlation_id=entry['correlation_id'],
+                headers=entry['headers'],
+                request_body=bodies['request_body'],
+                elapsed=entry['elapsed'],
+                status=entry['status'],
+                response_body=bodies['response_body']
+            ))
+        except Exception as e:
+            logger.error(f"Access log write failed: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def reset_after_fork(self) -> None:
+        """ Entries queued in the parent are not this worker's; start a new pool, lock and counters. """
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='access-log')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._dropped = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {'enabled': self.enabled, 'pending': self._pending, 'dropped': self._dropped}
+
+
+access_logger = AccessLogger()
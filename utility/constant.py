@@ -6,6 +6,7 @@ class ResponseResult(MultiValueEnum):
     _init_ = 'code message'
     SUCCESS = "AGS_000", "SUCCESS"
     REQUIRED_KEY_MISSING = "AGS_001", "REQUIRED_KEY_MISSING"
+    INVALID_PARAMETER = "AGS_002", "INVALID_PARAMETER"
 
     UNEXPECTED_ERROR = "AGS_900", "UNEXPECTED_ERROR"
     HTTP_ERROR = "AGS_901", "HTTP_ERROR"
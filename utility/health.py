@@ -0,0 +1,162 @@
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from configuration.base import HealthConfig
+from utility.logger import logger
+
+_build_info = None
+
+
+def _get_git_commit_id() -> str:
+    try:
+        # Add timeout to prevent hanging
+        commit_id = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            stderr=subprocess.STDOUT,
+            timeout=3  # 3 seconds timeout
+        ).strip().decode('utf-8')
+        return commit_id
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        error_msg = getattr(e, 'output', None) or str(e)
+        if hasattr(error_msg, 'decode'):
+            error_msg = error_msg.decode('utf-8')
+        logger.error(f"Failed to get Git commit ID: {error_msg}")
+        return "unknown"
+
+
+def get_build_info() -> Dict[str, Any]:
+    """
+    Build metadata, resolved once per process.
+
+    GIT_COMMIT_ID (set at image build time) wins over asking git, so containers without a
+    .git directory still report their commit.
+    """
+    global _build_info
+
+    if _build_info is None:
+        _build_info = {
+            'git_commit_id': os.getenv('GIT_COMMIT_ID') or _get_git_commit_id(),
+            'started_at': time.time(),
+        }
+    return _build_info
+
+
+class ReadinessChecker:
+    """
+    Runs registered dependency probes concurrently, each with its own timeout.
+
+    A full check result is reused for `cache_ttl` seconds. Once it expires, one caller re-runs
+    the probes while concurrent callers keep getting the previous (stale) result, so a burst of
+    /readyz calls costs the upstreams at most one round of probes and never queues behind it.
+    A probe still running from an earlier round (e.g. past its timeout) is waited on again
+    instead of being submitted a second time, so a hung upstream holds at most one worker.
+    """
+
+    def __init__(self, timeout: float = HealthConfig.PROBE_TIMEOUT, cache_ttl: float = HealthConfig.CACHE_TTL,
+                 max_workers: int = HealthConfig.PROBE_WORKERS):
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self._probes: Dict[str, Dict[str, Any]] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='readiness-probe')
+        self._lock = threading.Lock()
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._first_result = threading.Event()
+
+    def reset_after_fork(self):
+        """ Probe runs in flight belong to the parent; the forked worker probes again on its next check. """
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='readiness-probe')
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._result = None
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._first_result = threading.Event()
+
+    def register(self, name: str, probe: Callable[[], Any], timeout: Optional[float] = None, critical: bool = True):
+        """ `probe` raises (or hangs past its timeout) when the dependency is not usable. """
+        self._probes[name] = {'probe': probe, 'timeout': timeout or self.timeout, 'critical': critical}
+
+    def check(self) -> Dict[str, Any]:
+        with self._lock:
+            result = self._result
+            fresh = result is not None and time.monotonic() - self._checked_at < self.cache_ttl
+            refresh = not fresh and not self._refreshing
+            if refresh:
+                self._refreshing = True
+
+        if fresh:
+            return {**result, 'cached': True, 'stale': False}
+
+        if not refresh:
+            if result is None:
+                # Nothing to serve yet, wait for the first round started by another caller
+                self._first_result.wait(timeout=self._max_timeout())
+                with self._lock:
+                    result = self._result
+                if result is None:
+                    return {'ready': False, 'checked_at': time.time(), 'probes': {}, 'cached': False,
+                            'stale': False}
+            return {**result, 'cached': True, 'stale': not fresh}
+
+        result = None
+        try:
+            result = self._run_probes()
+        finally:
+            # The probes run unlocked, the lock only guards swapping the new result in
+            with self._lock:
+                self._refreshing = False
+                if result is not None:
+                    self._result = result
+                    self._checked_at = time.monotonic()
+        self._first_result.set()
+        return {**result, 'cached': False, 'stale': False}
+
+    def _max_timeout(self) -> float:
+        return max([spec['timeout'] for spec in self._probes.values()] + [self.timeout])
+
+    def _run_probes(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        futures = {}
+        for name, spec in self._probes.items():
+            future = self._in_flight.get(name)
+            if future is None or future.done():
+                future = self._in_flight[name] = self._executor.submit(self._timed, spec['probe'])
+            futures[name] = future
+
+        probes = {}
+        for name, future in futures.items():
+            spec = self._probes[name]
+            remaining = spec['timeout'] - (time.perf_counter() - started)
+            try:
+                latency_ms = future.result(timeout=max(remaining, 0))
+                probes[name] = {'ok': True, 'latency_ms': latency_ms, 'error': None, 'critical': spec['critical']}
+            except TimeoutError:
+                # The probe thread keeps running, the next round waits on it rather than starting another
+                probes[name] = {'ok': False, 'latency_ms': None, 'error': f"Timed out after {spec['timeout']}s",
+                                'critical': spec['critical']}
+            except Exception as e:
+                probes[name] = {'ok': False, 'latency_ms': None, 'error': f"{type(e).__name__}: {e}",
+                                'critical': spec['critical']}
+
+        ready = all(probe['ok'] for probe in probes.values() if probe['critical'])
+        if not ready:
+            failed = [name for name, probe in probes.items() if not probe['ok']]
+            logger.warning(f"Readiness check failed: {failed}")
+        return {'ready': ready, 'checked_at': time.time(), 'probes': probes}
+
+    @staticmethod
+    def _timed(probe: Callable[[], Any]) -> float:
+        started = time.perf_counter()
+        probe()
+        return round((time.perf_counter() - started) * 1000, 1)
+
+
+readiness_checker = ReadinessChecker()
@@ -0,0 +1,221 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from flask import Blueprint, copy_current_request_context, current_app, g, request
+
+from configuration.base import JobConfig
+from utility.constant import ResponseResult
+from utility.logger import logger
+from utility.spec import response_spec
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS async_job (
+    job_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    queue_time_ms REAL,
+    run_time_ms REAL,
+    result TEXT,
+    error TEXT,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_async_job_expires ON async_job (expires_at);
+"""
+
+_JOB_FIELDS = ('job_id', 'name', 'status', 'submitted_at', 'started_at', 'finished_at',
+               'queue_time_ms', 'run_time_ms', 'result', 'error')
+
+
+class JobManager:
+    """
+    Run long requests in the background on a bounded executor.
+
+    Jobs run in the worker that accepted them, but their state lives in a SQLite file so
+    the status lookup works from any worker. Finished jobs are kept for `result_ttl` seconds
+    and record both how long they waited in the queue and how long they ran.
+    """
+
+    def __init__(self, max_workers: int = JobConfig.MAX_WORKERS, max_pending: int = JobConfig.MAX_PENDING,
+                 result_ttl: float = JobConfig.RESULT_TTL, db_path: str = JobConfig.STORE_PATH):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.db_path = db_path
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='async-job')
+        self._lock = threading.Lock()
+        self._db_ready = False
+        self._active = 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._db_ready:
+            self._init_db()
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _init_db(self):
+        # Created on first use, so importing the app doesn't touch the filesystem
+        with self._lock:
+            if self._db_ready:
+                return
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(_SCHEMA)
+            finally:
+                connection.close()
+            self._db_ready = True
+
+    def _save(self, job_id: str, **fields):
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'], default=str)
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as connection:
+            connection.execute(f"UPDATE async_job SET {assignments} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def submit(self, func: Callable[[], Any], name: str) -> Optional[Dict[str, Any]]:
+        """ Queue func, return the job record or None when the queue is full. """
+        with self._lock:
+            if self._active >= self.max_workers + self.max_pending:
+                return None
+            self._active += 1
+
+        job = {
+            'job_id': str(uuid.uuid4()),
+            'name': name,
+            'status': JOB_QUEUED,
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'queue_time_ms': None,
+            'run_time_ms': None,
+            'result': None,
+            'error': None,
+        }
+        try:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM async_job WHERE expires_at < ?", (job['submitted_at'],))
+                connection.execute(
+                    "INSERT INTO async_job (job_id, name, status, submitted_at) VALUES (?, ?, ?, ?)",
+                    (job['job_id'], name, JOB_QUEUED, job['submitted_at'])
+                )
+            self._executor.submit(self._run, job['job_id'], job['submitted_at'], name, func)
+        except Exception:
+            with self._lock:
+                self._active -= 1
+            raise
+        return job
+
+    def _run(self, job_id: str, submitted_at: float, name: str, func: Callable[[], Any]):
+        try:
+            started = time.time()
+            self._save(job_id, status=JOB_RUNNING, started_at=started,
+                       queue_time_ms=round((started - submitted_at) * 1000, 3))
+
+            try:
+                result, error, status = func(), None, JOB_SUCCEEDED
+            except Exception as e:
+                logger.error(f"Async job {job_id} ({name}) failed: {e}", exc_info=True)
+                result, error, status = None, str(e), JOB_FAILED
+
+            finished = time.time()
+            self._save(job_id, status=status, result=result, error=error, finished_at=finished,
+                       run_time_ms=round((finished - started) * 1000, 3), expires_at=finished + self.result_ttl)
+        except sqlite3.Error as e:
+            logger.error(f"Async job {job_id} ({name}) state could not be saved: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """ The job record as stored by whichever worker runs it, None when unknown or expired. """
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {', '.join(_JOB_FIELDS)} FROM async_job "
+                "WHERE job_id = ? AND (expires_at IS NULL OR expires_at >= ?)",
+                (job_id, time.time())
+            ).fetchone()
+
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def reset_after_fork(self):
+        """ Jobs accepted by the parent run there; a forked worker starts with an empty pool. """
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='async-job')
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def enable_async(self, blueprint: Blueprint):
+        """
+        Let callers run any route of the blueprint as a job, by sending
+        `Prefer: respond-async` or `?async=true`. Must be called before the blueprint is registered.
+        """
+        blueprint.before_request(self._dispatch_async)
+
+    def _dispatch_async(self):
+        prefer = request.headers.get('Prefer', '')
+        if 'respond-async' not in prefer and request.args.get('async', '').lower() != 'true':
+            return None
+
+        # Read the body now, the worker runs after this request has been torn down.
+        request.get_data(cache=True)
+        view = current_app.view_functions[request.endpoint]
+        view_args = request.view_args or {}
+        correlation_id = getattr(g, 'correlation_id', None)
+
+        @copy_current_request_context
+        def _run_view():
+            logger.uuid_var.set(correlation_id)
+            g.correlation_id = correlation_id
+            response = current_app.make_response(view(**view_args))
+            body = response.get_json(silent=True)
+            return {
+                'status_code': response.status_code,
+                'body': body if body is not None else response.get_data(as_text=True),
+            }
+
+        job = self.submit(_run_view, name=request.endpoint)
+        if job is None:
+            response, _ = response_spec(
+                result=ResponseResult.UNEXPECTED_ERROR.code,
+                message="Too many pending jobs",
+                result_obj="Async job queue is full, retry later"
+            )
+            return response, 503
+
+        response, _ = response_spec(
+            result=ResponseResult.SUCCESS.code,
+            message=ResponseResult.SUCCESS.message,
+            result_obj={'job_id': job['job_id'], 'status': job['status'], 'status_url': f"/api/jobs/{job['job_id']}"}
+        )
+        response.headers['Location'] = f"/api/jobs/{job['job_id']}"
+        return response, 202
+
+
+job_manager = JobManager()
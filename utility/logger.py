@@ -1,14 +1,81 @@
+import atexit
 import contextvars
+import json
 import logging
+import os
+import queue
+import threading
+import time
 import uuid
-from datetime import datetime, timezone, timedelta
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from configuration.base import LogConfig
+from utility.tracing import tracer
+
+
+LOG_UTC_OFFSET_SECONDS = 8 * 60 * 60
+
+
+def _utc8_converter(timestamp):
+    """ Shift to UTC+8 with plain arithmetic instead of building a datetime per record. """
+    return time.gmtime(timestamp + LOG_UTC_OFFSET_SECONDS)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """ One JSON object per line, with the correlation ID as its own field. """
+
+    converter = staticmethod(_utc8_converter)
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'correlation_id': getattr(record, 'correlation_id', 'NA'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Records are put without waiting; when the queue is full the record is dropped and
+    counted. Formatting is left to the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def prepare(self, record):
+        # Only merge the message arguments here so later mutation of them can't change the record.
+        # The exception traceback is kept for the listener to format.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
 
 class Logger:
     DEFAULT_FORMAT = "%(asctime)s | %(levelname)s | %(correlation_id)s | %(message)s"
-    DEFAULT_LEVEL = logging.DEBUG
+    DEFAULT_LEVEL = logging.getLevelName(LogConfig.LEVEL)
+    FUNC_LOG_LEVEL = logging.getLevelName(LogConfig.FUNC_LEVEL)
 
     _instance = None
 
@@ -18,7 +85,9 @@ class Logger:
             cls._instance._initialized = False
         return cls._instance
 
-    def __init__(self, level: int = DEFAULT_LEVEL, log_format: str = DEFAULT_FORMAT):
+    def __init__(self, level: int = DEFAULT_LEVEL, log_format: str = DEFAULT_FORMAT,
+                 use_queue: bool = LogConfig.ASYNC, queue_size: int = LogConfig.QUEUE_SIZE,
+                 structured: bool = LogConfig.FORMAT == 'json'):
         # Avoid to do initialize
         if getattr(self, '_initialized', False):
             return
@@ -28,6 +97,11 @@ class Logger:
         self._logger = logging.getLogger("AGSHub")
         self._level = level
         self._log_format = log_format
+        self._use_queue = use_queue
+        self._queue_size = queue_size
+        self._structured = structured
+        self._queue_handler = None
+        self._listener = None
         self._setup_logger()
 
     def _setup_logger(self) -> None:
@@ -38,22 +112,70 @@ class Logger:
         context_filter = self._create_context_filter()
 
         handlers = [self._create_console_handler()]
-        for handler in handlers:
-            handler.addFilter(context_filter)
-            self._logger.addHandler(handler)
+        if not self._use_queue:
+            for handler in handlers:
+                handler.addFilter(context_filter)
+                self._logger.addHandler(handler)
+            return
+
+        # The filter has to run on the calling thread, it reads the correlation ID contextvar
+        self._queue_handler = BoundedQueueHandler(queue.Queue(maxsize=self._queue_size))
+        self._queue_handler.addFilter(context_filter)
+        self._logger.addHandler(self._queue_handler)
+        self._listener = QueueListener(self._queue_handler.queue, *handlers, respect_handler_level=True)
+        self.start_listener()
+        atexit.register(self.stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_listener_after_fork)
 
     def _create_console_handler(self):
         console_handler = logging.StreamHandler()
-        formatter = logging.Formatter(self._log_format)
-
-        def converter(timestamp):
-            conv_datetime = datetime.fromtimestamp(timestamp, tz=timezone(timedelta(hours=8)))
-            return conv_datetime.timetuple()
+        if self._structured:
+            formatter = JsonLinesFormatter()
+        else:
+            formatter = logging.Formatter(self._log_format)
+            formatter.converter = _utc8_converter
 
-        formatter.converter = converter
         console_handler.setFormatter(formatter)
         return console_handler
 
+    def start_listener(self) -> None:
+        """ Start (or restart, e.g. in a forked worker) the background log writer thread. """
+        if self._listener is None:
+            return
+        if self._listener._thread is not None and self._listener._thread.is_alive():
+            return
+
+        self._listener._thread = None
+        self._listener.start()
+
+    def _restart_listener_after_fork(self) -> None:
+        """
+        The listener thread does not survive fork (e.g. pre-forked server workers), start a new
+        one on a fresh queue, the inherited one may hold records or a lock owned by the parent.
+        """
+        fresh_queue = queue.Queue(maxsize=self._queue_size)
+        self._queue_handler.queue = fresh_queue
+        self._listener.queue = fresh_queue
+        self._listener._thread = None
+        self._listener.start()
+
+    def stop_listener(self) -> None:
+        """ Flush queued records and stop the background log writer thread. """
+        if self._listener is None or self._listener._thread is None:
+            return
+        self._listener.stop()
+
+    def pipeline_stats(self) -> dict:
+        if self._queue_handler is None:
+            return {'async': False}
+        return {
+            'async': True,
+            'queued': self._queue_handler.queue.qsize(),
+            'queue_size': self._queue_size,
+            'dropped': self._queue_handler.dropped,
+        }
+
     def _create_context_filter(self):
         class ContextFilter(logging.Filter):
             def __init__(self, uuid_var):
@@ -77,23 +199,38 @@ class Logger:
         return self.uuid_var.get()
 
     def log_func(self, func):
-        """Decorator for logging function calls"""
+        """
+        Decorator for logging function calls.
+
+        The start / end lines are only formatted when FUNC_LOG_LEVEL is enabled, and a span is
+        recorded for sampled traces, so decorated hot paths stay cheap when both are off.
+        """
+        func_name = func.__name__
+        span_name = getattr(func, '__qualname__', func_name)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            try:
-                if self.uuid_var.get() is None:
-                    self.set_correlation_id()
+            correlation_id = self.uuid_var.get()
+            if correlation_id is None:
+                correlation_id = self.set_correlation_id()
 
-                func_name = func.__name__
-                self._logger.info(f"○ Func start: {func_name}")
+            log_calls = self._logger.isEnabledFor(self.FUNC_LOG_LEVEL)
+            span = tracer.start_span(span_name, correlation_id)
+            try:
+                if log_calls:
+                    self._logger.log(self.FUNC_LOG_LEVEL, "○ Func start: %s", func_name)
 
                 result = func(*args, **kwargs)
-                self._logger.info(f"● Func end: {func_name}")
-                return result
             except Exception as e:
-                self._logger.error(f"✘ Func ERROR: '{func.__name__}': {e}", exc_info=True)
+                tracer.end_span(span, error=e)
+                self._logger.error("✘ Func ERROR: '%s': %s", func_name, e, exc_info=True)
                 raise
 
+            tracer.end_span(span)
+            if log_calls:
+                self._logger.log(self.FUNC_LOG_LEVEL, "● Func end: %s", func_name)
+            return result
+
         return wrapper
 
     def log_class(self, cls):
@@ -0,0 +1,199 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from flask import Flask, Response, g, request
+
+# Upper bounds in seconds, Prometheus style
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class _RequestTimings:
+    """ Per request upstream time, shared with worker threads started from a copied context. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.upstreams: Dict[str, List[float]] = {}  # upstream -> [total ms, calls]
+
+    def add(self, upstream: str, duration_ms: float):
+        with self._lock:
+            entry = self.upstreams.setdefault(upstream, [0.0, 0])
+            entry[0] += duration_ms
+            entry[1] += 1
+
+    def server_timing(self, total_ms: float) -> str:
+        with self._lock:
+            parts = [f'{name};dur={total:.1f};desc="{calls} calls"'
+                     for name, (total, calls) in sorted(self.upstreams.items())]
+        parts.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(parts)
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> Iterator[Tuple[str, int]]:
+        """ Cumulative (le, count) pairs ending with +Inf. """
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield repr(bound), cumulative
+        yield '+Inf', self.count
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def render_stats(prefix: str, stats: Dict[str, Any], description: str) -> str:
+    """ Render the numeric values of a component's stats() dict as `<prefix>_<key>` samples. """
+    lines = []
+    for key, value in sorted(stats.items()):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        lines.append(f'# HELP {prefix}_{key} {description}: {key}.')
+        lines.append(f'# TYPE {prefix}_{key} untyped')
+        lines.append(f'{prefix}_{key} {value}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+class MetricsRegistry:
+    """
+    In-process request and upstream latency metrics, rendered in the Prometheus text format.
+
+    Requests are keyed by blueprint, route rule and method, so every blueprint registered by
+    blueprint.register_blueprints gets its own latency histogram. Upstream calls (jira, slack,
+    google, db ...) are timed with upstream_timer / record_upstream; inside a request they are
+    also summed into its Server-Timing response header.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._request_latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._request_total: Dict[Tuple[str, str, str, int], int] = {}
+        self._upstream_latency: Dict[str, _Histogram] = {}
+
+    def init_app(self, app: Flask) -> None:
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def _start_request(self):
+        g.request_start_time = time.perf_counter()
+        _request_timings.set(_RequestTimings())
+
+    def _finish_request(self, response: Response) -> Response:
+        start_time = getattr(g, 'request_start_time', None)
+        if start_time is None:
+            return response
+
+        # For streamed responses this is the time until the body starts streaming
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        self.observe_request(blueprint=request.blueprint or 'app', route=route, method=request.method,
+                             status=response.status_code, duration_ms=duration_ms)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            response.headers['Server-Timing'] = timings.server_timing(duration_ms)
+        return response
+
+    def observe_request(self, blueprint: str, route: str, method: str, status: int, duration_ms: float):
+        key = (blueprint, route, method)
+        with self._lock:
+            histogram = self._request_latency.get(key)
+            if histogram is None:
+                histogram = self._request_latency[key] = _Histogram(self._buckets)
+            histogram.observe(duration_ms / 1000)
+            total_key = key + (status,)
+            self._request_total[total_key] = self._request_total.get(total_key, 0) + 1
+
+    def observe_upstream(self, upstream: str, duration_ms: float):
+        with self._lock:
+            histogram = self._upstream_latency.get(upstream)
+            if histogram is None:
+                histogram = self._upstream_latency[upstream] = _Histogram(self._buckets)
+            histogram.observe(duration_ms / 1000)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append('# HELP ags_http_requests_total HTTP requests by route and status.')
+            lines.append('# TYPE ags_http_requests_total counter')
+            for (blueprint, route, method, status), count in sorted(self._request_total.items()):
+                labels = _labels(blueprint=blueprint, route=route, method=method, status=status)
+                lines.append(f'ags_http_requests_total{{{labels}}} {count}')
+
+            lines.append('# HELP ags_http_request_duration_seconds HTTP request latency by route.')
+            lines.append('# TYPE ags_http_request_duration_seconds histogram')
+            for (blueprint, route, method), histogram in sorted(self._request_latency.items()):
+                labels = _labels(blueprint=blueprint, route=route, method=method)
+                lines.extend(self._render_histogram('ags_http_request_duration_seconds', labels, histogram))
+
+            lines.append('# HELP ags_upstream_duration_seconds Latency of calls to upstream services.')
+            lines.append('# TYPE ags_upstream_duration_seconds histogram')
+            for upstream, histogram in sorted(self._upstream_latency.items()):
+                lines.extend(self._render_histogram('ags_upstream_duration_seconds', _labels(upstream=upstream),
+                                                    histogram))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histogram(name: str, labels: str, histogram: _Histogram) -> Iterator[str]:
+        for le, count in histogram.samples():
+            yield f'{name}_bucket{{{labels},le="{le}"}} {count}'
+        yield f'{name}_sum{{{labels}}} {histogram.sum:.6f}'
+        yield f'{name}_count{{{labels}}} {histogram.count}'
+
+    def reset_after_fork(self):
+        """ A forked worker starts with a fresh lock and reports only its own requests. """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._request_latency.clear()
+            self._request_total.clear()
+            self._upstream_latency.clear()
+
+
+metrics = MetricsRegistry()
+
+
+def record_upstream(upstream: str, duration_ms: float, registry: Optional[MetricsRegistry] = None) -> None:
+    """ Record one upstream call, and add it to the current request's Server-Timing if any. """
+    (registry or metrics).observe_upstream(upstream, duration_ms)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(upstream, duration_ms)
+
+
+@contextmanager
+def upstream_timer(upstream: str):
+    """ Time the enclosed block as one call to `upstream`. """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_upstream(upstream, (time.perf_counter() - started) * 1000)
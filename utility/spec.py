@@ -1,10 +1,21 @@
 import json
 import textwrap
-import time
 from datetime import datetime
-from typing import Any, Tuple, Union
+from typing import Any, Iterable, Iterator, Tuple, Union
 
-from flask import g, jsonify
+from flask import Response, jsonify, stream_with_context
+
+from utility.logger import logger
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def is_true(value: Any) -> bool:
+    """ Request flag check: JSON `true` or the string "true" in any case. """
+    return value is True or str(value).lower() == 'true'
 
 
 def response_spec(result: str, message: str, result_obj: Union[dict, str]) -> Tuple[Any, int]:
@@ -29,27 +40,69 @@ def response_spec(result: str, message: str, result_obj: Union[dict, str]) -> Tu
     return jsonify(response_data), 200
 
 
-def log_response_spec(request: Any, request_body: Any, response: Any, response_body: Any
-                      ) -> str:
+def stream_response_spec(result: str, message: str, result_iter: Iterable[Any],
+                         stream_format: str = 'ndjson') -> Tuple[Response, int]:
+    """
+    Generate a standardized API response whose ResultObject is streamed item by item.
+
+    Args:
+        result: Result code
+        message: Result message
+        result_iter: Iterable of JSON serializable items, consumed lazily
+        stream_format: 'ndjson' (one item per line) or 'json' (chunked response_spec body)
+
+    Returns:
+        Tuple of (streamed response, status code)
+    """
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
+    def _ndjson() -> Iterator[str]:
+        try:
+            for item in result_iter:
+                yield _dumps(item) + "\n"
+        except Exception as e:
+            logger.error(f"Stream interrupted: {e}")
+            yield _dumps({'Error': str(e)}) + "\n"
+
+    def _chunked_json() -> Iterator[str]:
+        yield f'{{"Result": {_dumps(result)}, "Message": {_dumps(message)}, "ResultObject": ['
+        error = None
+        try:
+            for index, item in enumerate(result_iter):
+                yield ("," if index else "") + _dumps(item)
+        except Exception as e:
+            logger.error(f"Stream interrupted: {e}")
+            error = str(e)
+        yield "]" + (f', "Error": {_dumps(error)}' if error else "") + "}"
+
+    generator = _ndjson() if stream_format == 'ndjson' else _chunked_json()
+    return Response(stream_with_context(generator), mimetype=STREAM_FORMATS[stream_format]), 200
+
+
+def log_response_spec(method: str, url: str, correlation_id: str, headers: dict, request_body: str,
+                      elapsed: float, status: str, response_body: str) -> str:
     """
     Generate a standardized log message for request/response cycle.
 
+    Takes plain values captured on the request thread, so it can be rendered anywhere.
+
     Args:
-        request: Flask request object
+        method: Request method
+        url: Request URL
+        correlation_id: Correlation ID of the request
+        headers: Request headers to log
         request_body: Request body content
-        response: Flask response object
+        elapsed: Elapsed time in milliseconds
+        status: Response status
         response_body: Response body content
 
     Returns:
         Formatted log message string
     """
     current_time = datetime.now().strftime('%Y/%m/%d %H:%M:%S')
-    start_time = getattr(g, 'request_start_time', None)
-    elapsed_time = round(time.time() - start_time) if start_time else 0
-    correlation_id = getattr(g, 'correlation_id', 'N/A')
-    status = response.status if response else 'NA'
     try:
-        headers_json = json.dumps(dict(request.headers), indent=4, ensure_ascii=False)
+        headers_json = json.dumps(headers, indent=4, ensure_ascii=False)
     except Exception:
         headers_json = "Could not serialize headers"
 
@@ -60,13 +113,13 @@ def log_response_spec(request: Any, request_body: Any, response: Any, response_b
 --------------------------------
 
  * datetime: {current_time}
- * request: [{request.method}] {request.url}
+ * request: [{method}] {url}
  * correlation-id: {correlation_id}
  * headers: {headers_json}
  * body: {request_body}
- * elapsed: {elapsed_time}s
+ * elapsed: {elapsed}ms
  * status: {status}
- * response: {response_body if response else 'No response'}
+ * response: {response_body}
 --------------------------------
 """).strip()
 
@@ -0,0 +1,102 @@
+import contextvars
+import itertools
+import random
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from configuration.base import LogConfig
+
+# Marks a trace whose root was not sampled, so nested calls skip it with a single lookup.
+_NOT_SAMPLED = object()
+
+
+class Span:
+    __slots__ = ('name', 'span_id', 'parent_id', 'correlation_id', 'depth', 'started_at', '_start', 'duration_ms',
+                 'error')
+
+    def __init__(self, name: str, span_id: int, parent: Optional['Span'], correlation_id: Optional[str]):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent.span_id if parent else None
+        self.depth = parent.depth + 1 if parent else 0
+        self.correlation_id = correlation_id
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+        self.error = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'correlation_id': self.correlation_id,
+            'depth': self.depth,
+            'started_at': self.started_at,
+            'duration_ms': self.duration_ms,
+            'error': self.error,
+        }
+
+
+class Tracer:
+    """
+    Sampled in-process span tracer.
+
+    The sampling decision is made once per root span and inherited by nested spans, so a
+    trace is either recorded completely or not at all. Finished spans go into a bounded ring
+    buffer that keeps the most recent `buffer_size` spans.
+    """
+
+    def __init__(self, enabled: bool = LogConfig.TRACE_ENABLED, sample_rate: float = LogConfig.TRACE_SAMPLE_RATE,
+                 buffer_size: int = LogConfig.TRACE_BUFFER_SIZE):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self._current = contextvars.ContextVar('current_span', default=None)
+        self._ids = itertools.count(1)
+        self._spans = deque(maxlen=buffer_size)
+
+    def start_span(self, name: str, correlation_id: Optional[str] = None):
+        """ Return a handle for end_span, or None when not tracing. """
+        if not self.enabled:
+            return None
+
+        parent = self._current.get()
+        if parent is _NOT_SAMPLED:
+            return None
+        if parent is None and random.random() >= self.sample_rate:
+            return None, self._current.set(_NOT_SAMPLED)
+
+        span = Span(name=name, span_id=next(self._ids), parent=parent, correlation_id=correlation_id)
+        return span, self._current.set(span)
+
+    def end_span(self, handle, error: Optional[BaseException] = None):
+        if handle is None:
+            return
+
+        span, token = handle
+        self._current.reset(token)
+        if span is None:
+            return
+
+        span.duration_ms = round((time.perf_counter() - span._start) * 1000, 3)
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self._spans.append(span)
+
+    def recent_spans(self, limit: int = 200, correlation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """ Most recent finished spans first, optionally for one correlation ID. """
+        spans = list(self._spans)
+        if correlation_id:
+            spans = [span for span in spans if span.correlation_id == correlation_id]
+        return [span.to_dict() for span in reversed(spans[-limit:])]
+
+    def clear(self):
+        self._spans.clear()
+
+    def reset_after_fork(self):
+        """ A forked worker only reports its own spans. """
+        self.clear()
+
+
+tracer = Tracer()